@@ -6,6 +6,7 @@ from alembic import context
 from app.accounts.models import *
 from app.categories.models import *
 from app.database import Base
+from app.reports.models import *
 from app.transactions.models import *
 from app.users.models import *
 
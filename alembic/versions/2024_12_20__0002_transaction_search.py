@@ -0,0 +1,27 @@
+"""Transaction search
+
+Revision ID: 9c4e7d2a1b35
+Revises: 2f0b48ffdc66
+Create Date: 2024-12-20 10:12:31.504218
+
+"""
+
+from alembic import op
+from utils.database.search import get_text_search_ddl
+
+revision = "9c4e7d2a1b35"
+down_revision = "2f0b48ffdc66"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create, _ = get_text_search_ddl(op.get_bind().dialect.name, "transactions", "description")
+    for statement in create:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    _, drop = get_text_search_ddl(op.get_bind().dialect.name, "transactions", "description")
+    for statement in drop:
+        op.execute(statement)
@@ -0,0 +1,64 @@
+"""Transaction indexes
+
+Revision ID: 5b1f3a8e6c27
+Revises: 9c4e7d2a1b35
+Create Date: 2024-12-21 09:41:08.322706
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "5b1f3a8e6c27"
+down_revision = "9c4e7d2a1b35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTE: Built concurrently on PostgreSQL so writes are not blocked meanwhile, which cannot run inside
+    #       the migration transaction
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_transactions_id", table_name="transactions", postgresql_concurrently=True)
+        op.create_index(
+            "ix_transactions_user_id_date_id",
+            "transactions",
+            ["user_id", sa.text("date DESC"), "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_transactions_account_id_date",
+            "transactions",
+            ["account_id", "date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_transactions_category_id", "transactions", ["category_id"], postgresql_concurrently=True
+        )
+        if op.get_bind().dialect.name == "postgresql":
+            op.create_index(
+                "ix_transactions_date_brin",
+                "transactions",
+                ["date"],
+                postgresql_using="brin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if op.get_bind().dialect.name == "postgresql":
+            op.drop_index(
+                "ix_transactions_date_brin", table_name="transactions", postgresql_concurrently=True
+            )
+        op.drop_index("ix_transactions_category_id", table_name="transactions", postgresql_concurrently=True)
+        op.drop_index(
+            "ix_transactions_account_id_date", table_name="transactions", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_transactions_user_id_date_id", table_name="transactions", postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_transactions_id", "transactions", ["id"], unique=False, postgresql_concurrently=True
+        )
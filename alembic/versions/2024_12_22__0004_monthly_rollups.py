@@ -0,0 +1,69 @@
+"""Monthly rollups
+
+Revision ID: e3a9c60d4f18
+Revises: 5b1f3a8e6c27
+Create Date: 2024-12-22 16:27:54.918340
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+from utils.database.expressions import MonthStart
+
+revision = "e3a9c60d4f18"
+down_revision = "5b1f3a8e6c27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    monthly_rollups = op.create_table(
+        "monthly_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "transaction_type",
+            # NOTE: The type already exists, it was created along with `transactions`
+            postgresql.ENUM("Income", "Expense", "Transfer", name="transaction_type", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "month", "account_id", "category_id", "transaction_type"),
+    )
+
+    # NOTE: Backfill, the same aggregation as `MonthlyRollupRepository.rebuild`
+    transactions = sa.table(
+        "transactions",
+        sa.column("user_id"),
+        sa.column("date", sa.Date()),
+        sa.column("account_id"),
+        sa.column("category_id"),
+        sa.column("transaction_type"),
+        sa.column("amount"),
+    )
+    month = MonthStart(transactions.c.date)
+    keys = (
+        transactions.c.user_id,
+        month,
+        transactions.c.account_id,
+        transactions.c.category_id,
+        transactions.c.transaction_type,
+    )
+    totals = sa.select(*keys, sa.func.sum(transactions.c.amount), sa.func.count()).group_by(*keys)
+    op.execute(
+        monthly_rollups.insert().from_select(
+            ["user_id", "month", "account_id", "category_id", "transaction_type", "total", "count"], totals
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_rollups")
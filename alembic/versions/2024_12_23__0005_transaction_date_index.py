@@ -0,0 +1,41 @@
+"""Transaction date index
+
+Revision ID: 7d2c5e91a3f6
+Revises: e3a9c60d4f18
+Create Date: 2024-12-23 10:12:47.503118
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "7d2c5e91a3f6"
+down_revision = "e3a9c60d4f18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTE: No list filters by `user_id` alone, the unfiltered `-date` sort needs `date` leading
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_date_id",
+            "transactions",
+            [sa.text("date DESC"), "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_transactions_user_id_date_id", table_name="transactions", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_id_date_id",
+            "transactions",
+            ["user_id", sa.text("date DESC"), "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_transactions_date_id", table_name="transactions", postgresql_concurrently=True)
@@ -1,16 +1,17 @@
 from typing import Optional
 
 from fastapi import Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_database
+from app.database import get_async_database
 from utils.pagination import LimitOffsetPagination, LimitOffsetSchema
 
+from .filters import AccountProjectionManager
 from .repository import AccountRepository
 from .services import AccountService
 
 
-def get_account_repository(session: Session = Depends(get_database)) -> AccountRepository:
+def get_account_repository(session: AsyncSession = Depends(get_async_database)) -> AccountRepository:
     return AccountRepository(session=session)
 
 
@@ -18,6 +19,12 @@ def get_account_service(repository: AccountRepository = Depends(get_account_repo
     return AccountService(repository=repository)
 
 
+def get_account_projection_manager(
+    fields: Optional[list[str]] = Query(None, description="Comma separated fields to return, e.g. `id,name`"),
+) -> AccountProjectionManager:
+    return AccountProjectionManager(fields=fields)
+
+
 # TODO: This one might be "global" for project due its (possible) immutability across domains nature
 def get_pagination(pagination: LimitOffsetSchema = Depends()) -> LimitOffsetPagination:
     return LimitOffsetPagination(pagination)
@@ -0,0 +1,8 @@
+from utils.filters import BaseProjectionManager
+
+from .models import Account
+
+
+class AccountProjectionManager(BaseProjectionManager):
+    model = Account
+    always_loaded = ("updated_at",)
@@ -0,0 +1,68 @@
+"""
+Account balance reconciliation.
+
+Balances are maintained incrementally by the transaction writes (see `app.transactions.services`), this
+job verifies them against `initial_balance + SUM(transactions.amount)`. Accounts are checked in chunks
+by ID, each in its own short database transaction, and mismatches are optionally repaired:
+
+    python -m app.accounts.jobs --chunk-size 500 --repair
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import async_session_maker
+from utils.database.routing import use_primary
+
+from .repository import AccountRepository, BalanceMismatch
+
+
+async def reconcile_balances(
+    session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+    *,
+    chunk_size: int = 500,
+    repair: bool = False,
+) -> list[BalanceMismatch]:
+    """Check every account balance, repairing the mismatching ones when `repair`. Returns the mismatches."""
+    mismatches: list[BalanceMismatch] = []
+    after_id: Optional[int] = 0
+    while after_id is not None:
+        async with session_maker() as session:
+            # NOTE: Replicas lag behind, balances and transactions are compared on the primary
+            use_primary(session)
+            repository = AccountRepository(session=session)
+            chunk, after_id = await repository.list_balance_mismatches(
+                after_id=after_id, chunk_size=chunk_size
+            )
+            if repair and chunk:
+                await repository.repair_balances([mismatch.account_id for mismatch in chunk])
+            await session.commit()
+        mismatches.extend(chunk)
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=500, help="Accounts checked per database transaction"
+    )
+    parser.add_argument("--repair", action="store_true", help="Recompute the mismatching balances")
+    args = parser.parse_args()
+
+    mismatches = asyncio.run(reconcile_balances(chunk_size=args.chunk_size, repair=args.repair))
+    for mismatch in mismatches:
+        sys.stdout.write(
+            f"Account {mismatch.account_id}: balance {mismatch.current_balance}, "
+            f"expected {mismatch.expected_balance}{' (repaired)' if args.repair else ''}\n"
+        )
+    sys.stdout.write(f"{len(mismatches)} mismatching account(s)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,114 @@
-from utils.database.repository import BaseRepository
+import math
+from typing import Any, NamedTuple, Optional, Type
+
+from sqlalchemy import Insert, Update, bindparam, func, insert, select, update
+
+from app.settings import settings
+from app.transactions.models import Transaction
+from utils.cache import LRUCache
+from utils.database.async_repository import AsyncBaseRepository
+from utils.database.caching import AsyncEntityCacheMixin
 
 from .models import Account
 
 
-class AccountRepository(BaseRepository[Account]):
+class BalanceMismatch(NamedTuple):
+    """An account whose stored balance differs from `initial_balance + SUM(transactions.amount)`."""
+
+    account_id: int
+    current_balance: float
+    expected_balance: float
+
+
+class AccountRepository(AsyncEntityCacheMixin, AsyncBaseRepository[Account]):
     model = Account
+    # NOTE: Account details are polled constantly, they are served from memory until written or expired
+    cache = LRUCache(maxsize=settings.ENTITY_CACHE_MAXSIZE, ttl=settings.ENTITY_CACHE_TTL)
+
+    def fast_create_queryset(self, *, model: Type[Account], entity: dict[str, Any]) -> Insert:
+        # NOTE: `current_balance` is only written by transactions, accounts open at their initial balance
+        entity = {**entity, "current_balance": entity["initial_balance"]}
+        return insert(model).values(**entity).returning(model)
+
+    def update_queryset(self, *, id: int, entity: dict[str, Any]) -> Update:
+        """
+        Update the account, shifting the current balance by the change of `initial_balance` (computed
+        against the stored value within the same `UPDATE`) instead of overwriting it.
+        """
+        entity = {field: value for field, value in entity.items() if field != "current_balance"}
+        if "initial_balance" in entity:
+            shift = entity["initial_balance"] - Account.initial_balance
+            entity["current_balance"] = Account.current_balance + shift
+        return update(Account).filter_by(id=id).values(**entity).returning(Account)
+
+    async def apply_balance_deltas(self, deltas: dict[int, float]) -> None:
+        """
+        Add every delta to the current balance of its account, `{account_id: delta}`, in a single
+        `executemany` of relative updates (`current_balance = current_balance + :delta`), so concurrent
+        writes add up instead of overwriting each other.
+        """
+        params = [
+            {"account_key": account_id, "delta": delta}
+            for account_id, delta in sorted(deltas.items())
+            if delta != 0
+        ]
+        if not params:
+            return
+        # NOTE: Rows are locked in account order, two writes touching the same accounts cannot deadlock
+        table = Account.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("account_key"))
+            .values(current_balance=table.c.current_balance + bindparam("delta"))
+        )
+        await self.session.execute(statement, params)
+        self.invalidate_cache([param["account_key"] for param in params])
+
+    async def list_balance_mismatches(
+        self, *, after_id: int = 0, chunk_size: int = 500
+    ) -> tuple[list[BalanceMismatch], Optional[int]]:
+        """
+        Check the balances of the first `chunk_size` accounts with ID greater than `after_id`.
+
+        Returns
+        -------
+            The mismatching accounts, along with the last ID checked (to resume from) or `None` when no
+            account is left.
+        """
+        accounts = (
+            select(Account.id).where(Account.id > after_id).order_by(Account.id).limit(chunk_size).subquery()
+        )
+        totals = (
+            select(Transaction.account_id, func.sum(Transaction.amount).label("total"))
+            .where(Transaction.account_id.in_(select(accounts.c.id)))
+            .group_by(Transaction.account_id)
+            .subquery()
+        )
+        query = (
+            select(
+                Account.id,
+                Account.current_balance,
+                Account.initial_balance + func.coalesce(totals.c.total, 0),
+            )
+            .join(accounts, accounts.c.id == Account.id)
+            .outerjoin(totals, totals.c.account_id == Account.id)
+            .order_by(Account.id)
+        )
+        rows = (await self.session.execute(query)).all()
+        mismatches = [BalanceMismatch(*row) for row in rows if not math.isclose(row[1], row[2], abs_tol=1e-6)]
+        return mismatches, rows[-1][0] if rows else None
+
+    async def repair_balances(self, ids: list[int]) -> None:
+        """Recompute the current balance of the accounts `ids` out of their transactions."""
+        if not ids:
+            return
+        total = (
+            select(func.coalesce(func.sum(Transaction.amount), 0))
+            .where(Transaction.account_id == Account.id)
+            .scalar_subquery()
+        )
+        statement = (
+            update(Account).where(Account.id.in_(ids)).values(current_balance=Account.initial_balance + total)
+        )
+        await self.session.execute(statement, execution_options={"synchronize_session": False})
+        self.invalidate_cache(ids)
@@ -1,15 +1,19 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
 from app.auth.security import get_authenticated_user
-from app.database import get_database
+from app.database import get_async_database, get_database
+from utils.cache import cache_response, coalesce_requests
 from utils.crypt import get_bcrypt_context
 from utils.exceptions.client import NotFoundException, UnauthorizedException
 from utils.pagination import LimitOffsetPagination
+from utils.responses import ConditionalRequest, StreamingListResponse, get_streaming_media_type
 
-from .dependencies import get_account_service, get_pagination
+from .dependencies import get_account_projection_manager, get_account_service, get_pagination
 from .docs import (
     create_account_docs,
     destroy_account_docs,
@@ -17,6 +21,7 @@ from .docs import (
     retrieve_account_docs,
     update_account_docs,
 )
+from .filters import AccountProjectionManager
 from .models import Account as AccountModel
 from .schemas import AccountSchema
 from .services import AccountService
@@ -24,34 +29,65 @@ from .services import AccountService
 router = APIRouter(prefix="/account", tags=["account"])
 
 AccountServiceAnnotation = Annotated[AccountService, Depends(get_account_service)]
+AccountProjectionAnnotation = Annotated[AccountProjectionManager, Depends(get_account_projection_manager)]
 
 
 @router.get("/{id}", **retrieve_account_docs)
-async def retrieve_account(id: int, service: AccountServiceAnnotation):
-    return service.retrieve_by_id(id=id)
+@coalesce_requests
+async def retrieve_account(
+    id: int,
+    response: Response,
+    service: AccountServiceAnnotation,
+    projection_manager: AccountProjectionAnnotation,
+    conditional: ConditionalRequest = Depends(),
+):
+    instance = await service.retrieve_by_id(id=id, projection_manager=projection_manager)
+    not_modified = conditional.evaluate(
+        response, parts=(instance.id, instance.updated_at), last_modified=instance.updated_at
+    )
+    if not_modified:
+        return not_modified
+    return projection_manager.project_entity(instance)
 
 
 @router.get("/", **list_account_docs)
+@cache_response(tags=(AccountModel.__tablename__,))
+@coalesce_requests
 async def list_account(
+    response: Response,
     service: AccountServiceAnnotation,
+    projection_manager: AccountProjectionAnnotation,
     pagination_manager: LimitOffsetPagination = Depends(get_pagination),
+    streaming_media_type: Optional[str] = Depends(get_streaming_media_type),
+    session: AsyncSession = Depends(get_async_database),
+    conditional: ConditionalRequest = Depends(),
 ):
-    return service.list(pagination_manager=pagination_manager)
+    if streaming_media_type:
+        # NOTE: The session is released once the whole stream is sent, not on dependency teardown
+        return StreamingListResponse(
+            projection_manager.project_stream(service.stream(projection_manager=projection_manager)),
+            media_type=streaming_media_type,
+            background=BackgroundTask(session.close),
+        )
+    last_modified, count = await service.list_validators()
+    not_modified = conditional.evaluate(response, parts=(last_modified, count), last_modified=last_modified)
+    if not_modified:
+        return not_modified
+    results = await service.list(pagination_manager=pagination_manager, projection_manager=projection_manager)
+    return projection_manager.project_results(results)
 
 
 @router.post("/", **create_account_docs)
 async def create_account(payload: AccountSchema, service: AccountServiceAnnotation):
-    data = payload.model_dump()
-    service.create(entity=data)
-    return data
+    return await service.create(entity=payload.model_dump())
 
 
 @router.put("/{id}", **update_account_docs)
 async def update_account(id: int, payload: AccountSchema, service: AccountServiceAnnotation):
     data = payload.model_dump(exclude_unset=True)
-    return service.update(id=id, entity=data)
+    return await service.update(id=id, entity=data)
 
 
 @router.delete("/{id}", **destroy_account_docs)
 async def destroy_account(id: int, service: AccountServiceAnnotation):
-    return service.destroy(id=id)
+    return await service.destroy(id=id)
@@ -1,8 +1,8 @@
-from utils.services import BaseService
+from utils.services import AsyncBaseService
 
 from .models import Account
 from .repository import AccountRepository
 
 
-class AccountService(BaseService[Account, AccountRepository]):
+class AccountService(AsyncBaseService[Account, AccountRepository]):
     pass
@@ -1,8 +1,9 @@
 from datetime import UTC, datetime, timedelta
 from typing import Any, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
 from jose import JWTError, jwt
 
 from app.settings import settings
@@ -37,3 +38,15 @@ def get_authenticated_user(token: str = Depends(oauth_bearer)) -> dict[str, str
         return {"username": username, "id": user_id}
     except JWTError as exc:
         raise ForbiddenException(detail="Could not validate credentials") from exc
+
+
+def get_request_user_id(request: Request) -> Optional[int]:
+    """Id of the user authenticated by the bearer token of `request`, `None` when missing or invalid."""
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload: dict[str, Any] = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("id")
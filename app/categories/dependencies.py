@@ -1,16 +1,17 @@
 from typing import Optional
 
 from fastapi import Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_database
+from app.database import get_async_database
 from utils.pagination import LimitOffsetPagination, LimitOffsetSchema
 
+from .filters import CategoryProjectionManager
 from .repository import CategoryRepository
 from .services import CategoryService
 
 
-def get_category_repository(session: Session = Depends(get_database)) -> CategoryRepository:
+def get_category_repository(session: AsyncSession = Depends(get_async_database)) -> CategoryRepository:
     return CategoryRepository(session=session)
 
 
@@ -20,6 +21,12 @@ def get_category_service(
     return CategoryService(repository=repository)
 
 
+def get_category_projection_manager(
+    fields: Optional[list[str]] = Query(None, description="Comma separated fields to return, e.g. `id,name`"),
+) -> CategoryProjectionManager:
+    return CategoryProjectionManager(fields=fields)
+
+
 # TODO: This one might be "global" for project due its (possible) immutability across domains nature
 def get_pagination(pagination: LimitOffsetSchema = Depends()) -> LimitOffsetPagination:
     return LimitOffsetPagination(pagination)
@@ -0,0 +1,8 @@
+from utils.filters import BaseProjectionManager
+
+from .models import Category
+
+
+class CategoryProjectionManager(BaseProjectionManager):
+    model = Category
+    always_loaded = ("updated_at",)
@@ -1,7 +1,7 @@
-from utils.database.repository import BaseRepository
+from utils.database.async_repository import AsyncBaseRepository
 
 from .models import Category
 
 
-class CategoryRepository(BaseRepository[Category]):
+class CategoryRepository(AsyncBaseRepository[Category]):
     model = Category
@@ -1,15 +1,18 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
 from app.auth.security import get_authenticated_user
-from app.database import get_database
+from app.database import get_async_database, get_database
 from utils.crypt import get_bcrypt_context
 from utils.exceptions.client import NotFoundException, UnauthorizedException
 from utils.pagination import LimitOffsetPagination
+from utils.responses import ConditionalRequest, StreamingListResponse, get_streaming_media_type
 
-from .dependencies import get_category_service, get_pagination
+from .dependencies import get_category_projection_manager, get_category_service, get_pagination
 from .docs import (
     create_category_docs,
     destroy_category_docs,
@@ -17,6 +20,7 @@ from .docs import (
     retrieve_category_docs,
     update_category_docs,
 )
+from .filters import CategoryProjectionManager
 from .models import Category as CategoryModel
 from .schemas import CategorySchema
 from .services import CategoryService
@@ -24,34 +28,62 @@ from .services import CategoryService
 router = APIRouter(prefix="/category", tags=["category"])
 
 CategoryServiceAnnotation = Annotated[CategoryService, Depends(get_category_service)]
+CategoryProjectionAnnotation = Annotated[CategoryProjectionManager, Depends(get_category_projection_manager)]
 
 
 @router.get("/{id}", **retrieve_category_docs)
-async def retrieve_category(id: int, service: CategoryServiceAnnotation):
-    return service.retrieve_by_id(id=id)
+async def retrieve_category(
+    id: int,
+    response: Response,
+    service: CategoryServiceAnnotation,
+    projection_manager: CategoryProjectionAnnotation,
+    conditional: ConditionalRequest = Depends(),
+):
+    instance = await service.retrieve_by_id(id=id, projection_manager=projection_manager)
+    not_modified = conditional.evaluate(
+        response, parts=(instance.id, instance.updated_at), last_modified=instance.updated_at
+    )
+    if not_modified:
+        return not_modified
+    return projection_manager.project_entity(instance)
 
 
 @router.get("/", **list_category_docs)
 async def list_category(
+    response: Response,
     service: CategoryServiceAnnotation,
+    projection_manager: CategoryProjectionAnnotation,
     pagination_manager: LimitOffsetPagination = Depends(get_pagination),
+    streaming_media_type: Optional[str] = Depends(get_streaming_media_type),
+    session: AsyncSession = Depends(get_async_database),
+    conditional: ConditionalRequest = Depends(),
 ):
-    return service.list(pagination_manager=pagination_manager)
+    if streaming_media_type:
+        # NOTE: The session is released once the whole stream is sent, not on dependency teardown
+        return StreamingListResponse(
+            projection_manager.project_stream(service.stream(projection_manager=projection_manager)),
+            media_type=streaming_media_type,
+            background=BackgroundTask(session.close),
+        )
+    # NOTE: Validated against the in-memory catalog, a match costs neither a query nor serializing a body
+    not_modified = conditional.evaluate(response, parts=((await service.get_snapshot()).etag,))
+    if not_modified:
+        return not_modified
+    results = await service.list(pagination_manager=pagination_manager, projection_manager=projection_manager)
+    return projection_manager.project_results(results)
 
 
 @router.post("/", **create_category_docs)
 async def create_category(payload: CategorySchema, service: CategoryServiceAnnotation):
-    data = payload.model_dump()
-    service.create(entity=data)
-    return data
+    return await service.create(entity=payload.model_dump())
 
 
 @router.put("/{id}", **update_category_docs)
 async def update_category(id: int, payload: CategorySchema, service: CategoryServiceAnnotation):
     data = payload.model_dump(exclude_unset=True)
-    return service.update(id=id, entity=data)
+    return await service.update(id=id, entity=data)
 
 
 @router.delete("/{id}", **destroy_category_docs)
 async def destroy_category(id: int, service: CategoryServiceAnnotation):
-    return service.destroy(id=id)
+    return await service.destroy(id=id)
@@ -1,8 +1,120 @@
-from utils.services import BaseService
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from utils.cache import Catalog, CatalogSnapshot
+from utils.database.async_repository import (
+    AsyncFilterManagerProtocol,
+    AsyncPaginationManagerProtocol,
+    AsyncProjectionManagerProtocol,
+)
+from utils.pagination import BaseOffsetPagination
+from utils.services import AsyncBaseService
 
 from .models import Category
 from .repository import CategoryRepository
 
+# NOTE: Categories are a small and rarely written catalog, every worker keeps them in memory
+category_catalog = Catalog(Category, unique=("id", "name"), grouped=("type",))
+
+
+class CategoryService(AsyncBaseService[Category, CategoryRepository]):
+    """
+    Reads are served from `category_catalog`, writes go to the database and bump the catalog version.
+
+    Only requests embedding relationships, filtering through a filter manager or paginating by other
+    means than limit/offset reach the database.
+    """
+
+    catalog = category_catalog
+
+    async def get_snapshot(self) -> CatalogSnapshot:
+        return await self.catalog.get_snapshot(self.repository.session)
+
+    async def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> Any:
+        if include:
+            return await super().retrieve_by_id(id=id, projection_manager=projection_manager, include=include)
+        return await self.catalog.get(self.repository.session, id=id)
+
+    async def get(self, **filters: Any) -> Any:
+        return await self.catalog.get(self.repository.session, **filters)
+
+    async def list(
+        self,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        pagination_manager: Optional[AsyncPaginationManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> list[Any]:
+        if filter_manager is not None or include or not self.is_paginated_in_memory(pagination_manager):
+            return await super().list(
+                filter_manager=filter_manager,
+                pagination_manager=pagination_manager,
+                projection_manager=projection_manager,
+                include=include,
+                **filters,
+            )
+        entries = (await self.get_snapshot()).filter(**filters)
+        if isinstance(pagination_manager, BaseOffsetPagination):
+            return pagination_manager.paginate_sequence(entries)
+        return list(entries)
+
+    def stream(
+        self,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> AsyncIterator[Any]:
+        if filter_manager is not None or include:
+            return super().stream(
+                filter_manager=filter_manager,
+                projection_manager=projection_manager,
+                include=include,
+                **filters,
+            )
+        return self.stream_catalog(**filters)
+
+    async def stream_catalog(self, **filters: Any) -> AsyncIterator[Any]:
+        for entry in (await self.get_snapshot()).filter(**filters):
+            yield entry
+
+    @staticmethod
+    def is_paginated_in_memory(pagination_manager: Optional[AsyncPaginationManagerProtocol]) -> bool:
+        return pagination_manager is None or isinstance(pagination_manager, BaseOffsetPagination)
+
+    async def create(self, *, entity: dict[str, Any]) -> Category:
+        instance = await super().create(entity=entity)
+        self.catalog.invalidate()
+        return instance
+
+    async def update(self, *, id: int, entity: dict[str, Any]) -> Category:
+        instance = await super().update(id=id, entity=entity)
+        self.catalog.invalidate()
+        return instance
+
+    async def destroy(self, *, id: int) -> None:
+        await super().destroy(id=id)
+        self.catalog.invalidate()
+
+    async def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = await super().bulk_create(entities=entities)
+        self.catalog.invalidate()
+        return rows
+
+    async def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = await super().bulk_update(entities=entities)
+        self.catalog.invalidate()
+        return rows
 
-class CategoryService(BaseService[Category, CategoryRepository]):
-    pass
+    async def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        deleted = await super().bulk_destroy(ids=ids)
+        self.catalog.invalidate()
+        return deleted
@@ -1,12 +1,16 @@
 from .base import APIBaseModel, Base
-from .core import engine, session_maker
-from .dependencies import apply_session, get_database
+from .core import async_engine, async_session_maker, engine, get_pool_metrics, session_maker
+from .dependencies import apply_session, get_async_database, get_database
 
 __all__ = [
     "APIBaseModel",
     "apply_session",
+    "async_engine",
+    "async_session_maker",
     "Base",
     "engine",
+    "get_async_database",
     "get_database",
+    "get_pool_metrics",
     "session_maker",
 ]
@@ -1,16 +1,19 @@
+from typing import Any, Optional, Sequence
+
 from sqlalchemy import Engine, create_engine
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.settings import settings
+from utils.database.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, PoolMetrics
+from utils.database.routing import RoutingSession, set_read_only_transactions
 
 
 def get_engine() -> Engine:
     return create_engine(
         settings.get_database_url(),
-        pool_pre_ping=True,
-        # pool_size=settings.pool_size,
-        # max_overflow=settings.max_overflow
+        poolclass=InstrumentedQueuePool,
+        **settings.get_engine_options(),
     )
 
 
@@ -22,40 +25,67 @@ def get_session_maker(engine: Engine) -> sessionmaker[Session]:
     )
 
 
-engine = get_engine()
-session_maker = get_session_maker(engine)
+def get_async_engine(url: Optional[str] = None) -> AsyncEngine:
+    return create_async_engine(
+        url or settings.get_async_database_url(),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **settings.get_engine_options(),
+    )
 
 
-__all__ = [
-    "engine",
-    "session_maker",
-]
+def get_async_replica_engines() -> list[AsyncEngine]:
+    replica_engines = []
+    for url in settings.get_async_replica_urls():
+        replica_engine = get_async_engine(url)
+        set_read_only_transactions(replica_engine.sync_engine)
+        replica_engines.append(replica_engine)
+    return replica_engines
+
+
+def get_async_session_maker(
+    async_engine: AsyncEngine, replica_engines: Sequence[AsyncEngine] = ()
+) -> async_sessionmaker[AsyncSession]:
+    # NOTE: Instances are serialized after the commit; expiring them would trigger lazy IO outside greenlets
+    return async_sessionmaker(
+        autoflush=False,
+        expire_on_commit=False,
+        bind=async_engine,
+        sync_session_class=RoutingSession,
+        replicas=[replica_engine.sync_engine for replica_engine in replica_engines],
+    )
 
 
-# def get_async_engine(settings):
-#     return create_async_engine(
-#         settings.get_database_url(),
-#         # pool_pre_ping=True,
-#         # pool_size=settings.pool_size,
-#         # max_overflow=settings.max_overflow
-#     )
+engine = get_engine()
+session_maker = get_session_maker(engine)
 
+async_engine = get_async_engine()
+async_replica_engines = get_async_replica_engines()
+async_session_maker = get_async_session_maker(async_engine, async_replica_engines)
 
-# def get_async_session_maker(async_engine):
-#     return async_sessionmaker(
-#         autocommit=False,
-#         autoflush=False,
-#         bind=async_engine,
-#     )
+pool_metrics: dict[str, tuple[Engine, PoolMetrics]] = {
+    "sync": (engine, PoolMetrics()),
+    "primary": (async_engine.sync_engine, PoolMetrics()),
+}
+pool_metrics.update(
+    {
+        f"replica_{index}": (replica_engine.sync_engine, PoolMetrics())
+        for index, replica_engine in enumerate(async_replica_engines)
+    }
+)
+for instrumented_engine, metrics in pool_metrics.values():
+    metrics.attach(instrumented_engine)
 
 
-# async_engine = get_async_engine(settings)
-# async_session_maker = get_async_session_maker(async_engine)
+def get_pool_metrics() -> dict[str, Any]:
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in pool_metrics.items()}
 
 
-# def get_async_database():
-#     try:
-#         db = async_session_maker()
-#         yield db
-#     finally:
-#         db.close()
+__all__ = [
+    "async_engine",
+    "async_replica_engines",
+    "async_session_maker",
+    "engine",
+    "get_pool_metrics",
+    "pool_metrics",
+    "session_maker",
+]
@@ -1,10 +1,19 @@
 """Fastapi dependencies to interact with database."""
-from typing import Callable, Generator, Type, TypeVar
 
-from fastapi import Depends
+from typing import AsyncGenerator, Callable, Generator, Type, TypeVar
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .core import session_maker
+from app.settings import settings
+from utils.database.routing import use_primary
+
+from .core import async_replica_engines, async_session_maker, session_maker
+
+# NOTE: Set after a write so the client keeps reading from the primary while replicas catch up
+READ_YOUR_WRITES_COOKIE = "read_primary"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
 
 T = TypeVar("T")
 
@@ -17,6 +26,23 @@ def get_database() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_database(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_maker() as db:
+        if async_replica_engines:
+            if request.method not in READ_METHODS:
+                use_primary(db)
+                response.set_cookie(
+                    READ_YOUR_WRITES_COOKIE,
+                    "1",
+                    max_age=settings.DATABASE.read_your_writes_seconds,
+                    httponly=True,
+                    samesite="lax",
+                )
+            elif request.cookies.get(READ_YOUR_WRITES_COOKIE):
+                use_primary(db)
+        yield db
+
+
 def apply_session(target: Type[T]) -> Callable[[Session], T]:
     def _apply_session(session: Session = Depends(get_database)) -> T:
         return target(session=session)
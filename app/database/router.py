@@ -0,0 +1,42 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.auth.security import get_authenticated_user
+from app.reports.filters import ReportFilterManager, ReportFilterSchema
+from app.transactions.filters import TransactionFilterManager, TransactionFilterSchema
+from utils.cache import get_response_cache_stats, get_single_flight_stats
+from utils.database.caching import get_entity_cache_stats
+from utils.database.indexes import advise_indexes
+
+from .core import get_pool_metrics
+
+# NOTE: Internal operational endpoints, hidden from the public schema
+router = APIRouter(prefix="/internal/database", tags=["internal"], include_in_schema=False)
+
+
+@router.get("/pool/", dependencies=[Depends(get_authenticated_user)])
+async def retrieve_pool_metrics() -> dict[str, Any]:
+    return get_pool_metrics()
+
+
+@router.get("/cache/", dependencies=[Depends(get_authenticated_user)])
+async def retrieve_cache_stats() -> dict[str, Any]:
+    return {
+        "entities": get_entity_cache_stats(),
+        "responses": get_response_cache_stats(),
+        "coalescing": get_single_flight_stats(),
+    }
+
+
+# NOTE: Every filter manager along with its filter schema, checked by the index advisor
+FILTER_DECLARATIONS = [
+    (ReportFilterManager, ReportFilterSchema),
+    (TransactionFilterManager, TransactionFilterSchema),
+]
+
+
+@router.get("/indexes/", dependencies=[Depends(get_authenticated_user)])
+async def retrieve_index_advice() -> dict[str, Any]:
+    advice = [item for manager, schema in FILTER_DECLARATIONS for item in advise_indexes(manager, schema)]
+    return {"unsupported": [{**item._asdict(), "message": str(item)} for item in advice]}
@@ -2,19 +2,51 @@ from fastapi import FastAPI
 
 from app.accounts.router import router as accounts_router
 from app.auth.router import router as auth_router
+from app.auth.security import get_request_user_id
 from app.categories.router import router as categories_router
+from app.database.dependencies import READ_YOUR_WRITES_COOKIE
+from app.database.router import router as database_router
+from app.reports.router import router as reports_router
 from app.settings import settings
 from app.transactions.router import router as transactions_router
 from app.users.router import router as users_router
-from utils.middleware import SQLAlchemyExceptionHandlerMiddleware
+from utils.cache import ResponseCache, SingleFlight
+from utils.middleware import (
+    RequestCoalescingMiddleware,
+    ResponseCacheMiddleware,
+    SQLAlchemyExceptionHandlerMiddleware,
+)
 
 app = FastAPI(debug=settings.DEBUG)
 
+response_cache = ResponseCache(
+    maxbytes=settings.RESPONSE_CACHE_MAXBYTES,
+    max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    replica_lag=settings.DATABASE.read_your_writes_seconds if settings.DATABASE.replica_urls else 0.0,
+)
+single_flight = SingleFlight()
 
 app.add_middleware(SQLAlchemyExceptionHandlerMiddleware, debug=settings.DEBUG)
+# NOTE: Added last runs first, cache hits are answered before coalescing the misses
+app.add_middleware(
+    RequestCoalescingMiddleware,
+    single_flight=single_flight,
+    max_body_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    get_user_key=get_request_user_id,
+    primary_cookie=READ_YOUR_WRITES_COOKIE,
+)
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    get_user_key=get_request_user_id,
+    primary_cookie=READ_YOUR_WRITES_COOKIE,
+)
 
 app.include_router(auth_router)
 app.include_router(accounts_router)
 app.include_router(categories_router)
+app.include_router(database_router)
+app.include_router(reports_router)
 app.include_router(transactions_router)
 app.include_router(users_router)
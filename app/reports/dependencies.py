@@ -0,0 +1,51 @@
+from typing import Optional
+
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_database
+from app.settings import settings
+from utils.datetime import get_now_utc_datetime
+from utils.exceptions.client import BadRequestException
+
+from .filters import ReportFilterManager, ReportFilterSchema
+from .repository import GROUP_BY_FIELDS, MonthlyRollupRepository
+from .services import ReportService
+
+# NOTE: Months reported when no range is given, the current one included
+DEFAULT_REPORT_MONTHS = 12
+
+
+def get_monthly_rollup_repository(
+    session: AsyncSession = Depends(get_async_database),
+) -> MonthlyRollupRepository:
+    return MonthlyRollupRepository(session=session)
+
+
+def get_report_service(
+    repository: MonthlyRollupRepository = Depends(get_monthly_rollup_repository),
+) -> ReportService:
+    return ReportService(repository=repository)
+
+
+def get_report_filter_manager(filters: ReportFilterSchema = Depends()) -> ReportFilterManager:
+    if filters.month__gte is None and filters.month__lte is None:
+        # NOTE: The current month is the one of `TIME_ZONE`, not of the server clock
+        today = get_now_utc_datetime(settings.TIME_ZONE).date()
+        months = today.year * 12 + today.month - DEFAULT_REPORT_MONTHS
+        filters.month__gte = today.replace(year=months // 12, month=months % 12 + 1, day=1)
+    return ReportFilterManager(filters=filters)
+
+
+def get_report_group_by(
+    group_by: Optional[list[str]] = Query(
+        None, description=f"Comma separated fields to break totals down by: {', '.join(GROUP_BY_FIELDS)}"
+    ),
+) -> list[str]:
+    names = list(
+        dict.fromkeys(name.strip() for item in group_by or () for name in item.split(",") if name.strip())
+    )
+    for name in names:
+        if name not in GROUP_BY_FIELDS:
+            raise BadRequestException(detail=f"Reports cannot be grouped by `{name}`")
+    return names
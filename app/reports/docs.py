@@ -0,0 +1,8 @@
+from utils.docs import FastAPIRouteParameters
+
+
+class ReportDocs(FastAPIRouteParameters):
+    status_code: int = 200
+
+
+report_docs = ReportDocs().model_dump()
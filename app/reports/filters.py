@@ -0,0 +1,21 @@
+from typing import Optional
+
+from fastapi import Query
+
+from utils.filters import BaseFilterManager, CommaSeparated, FilterSchema
+
+from .models import MonthlyRollup
+from .schemas import Month
+
+
+class ReportFilterSchema(FilterSchema, extra="forbid"):
+    user_id__eq: Optional[int] = Query(None)
+    month__gte: Optional[Month] = Query(None, description="First month, e.g. `2024-01`")
+    month__lte: Optional[Month] = Query(None, description="Last month, e.g. `2024-12`")
+    account_id__in: Optional[CommaSeparated[int]] = Query(None, description="Comma separated ids")
+    category_id__in: Optional[CommaSeparated[int]] = Query(None, description="Comma separated ids")
+    transaction_type__in: Optional[CommaSeparated[str]] = Query(None, description="Comma separated types")
+
+
+class ReportFilterManager(BaseFilterManager):
+    model = MonthlyRollup
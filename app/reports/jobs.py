@@ -0,0 +1,45 @@
+"""
+Monthly rollups rebuild.
+
+Rollups are maintained incrementally by the transaction writes (see `app.transactions.services`), this
+job recomputes them out of `transactions`, e.g. to backfill them or after writes that bypassed the
+service:
+
+    python -m app.reports.jobs [--user-id 1]
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import async_session_maker
+
+from .repository import MonthlyRollupRepository
+
+
+async def rebuild_rollups(
+    session_maker: async_sessionmaker[AsyncSession] = async_session_maker, *, user_id: Optional[int] = None
+) -> int:
+    """Rebuild the rollups of every user, or of `user_id` only, in a single database transaction."""
+    async with session_maker() as session:
+        written = await MonthlyRollupRepository(session=session).rebuild(user_id=user_id)
+        await session.commit()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--user-id", type=int, default=None, help="Rebuild the rollups of this user only")
+    args = parser.parse_args()
+
+    written = asyncio.run(rebuild_rollups(user_id=args.user_id))
+    sys.stdout.write(f"{written} rollup(s) written\n")
+
+
+if __name__ == "__main__":
+    main()
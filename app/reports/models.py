@@ -0,0 +1,27 @@
+from datetime import date
+
+from sqlalchemy import Enum, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class MonthlyRollup(Base):
+    """
+    Totals and counts of the transactions of a user by month, account, category and type.
+
+    Maintained incrementally by the transaction writes (see `app.transactions.services`) and rebuilt
+    from scratch by `app.reports.jobs`, reports never scan `transactions`.
+    """
+
+    __tablename__ = "monthly_rollups"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    month: Mapped[date] = mapped_column(primary_key=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), primary_key=True)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), primary_key=True)
+    transaction_type: Mapped[str] = mapped_column(
+        Enum("Income", "Expense", "Transfer", name="transaction_type"), primary_key=True
+    )
+    total: Mapped[float] = mapped_column(nullable=False, default=0)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
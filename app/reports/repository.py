@@ -0,0 +1,116 @@
+from datetime import date
+from typing import Any, NamedTuple, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.transactions.models import Transaction
+from utils.database.async_repository import AsyncBaseRepository, AsyncFilterManagerProtocol
+from utils.database.expressions import MonthStart
+
+from .models import MonthlyRollup
+
+# NOTE: Columns a report can be broken down by, on top of the month
+GROUP_BY_FIELDS = ("account_id", "category_id", "transaction_type")
+
+# NOTE: `INSERT ... ON CONFLICT` constructs by dialect, the ones rollup upserts are supported on
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class RollupKey(NamedTuple):
+    user_id: int
+    month: date
+    account_id: int
+    category_id: int
+    transaction_type: str
+
+
+class MonthlyRollupRepository(AsyncBaseRepository[MonthlyRollup]):
+    model = MonthlyRollup
+
+    async def apply_rollup_deltas(self, deltas: dict[RollupKey, tuple[float, int]]) -> None:
+        """
+        Add every `(total, count)` delta to its rollup, `{key: (total, count)}`, in a single `executemany`
+        of upserts (`INSERT ... ON CONFLICT DO UPDATE SET total = total + excluded.total, ...`), so
+        concurrent writes add up instead of overwriting each other.
+        """
+        params = [
+            {**key._asdict(), "total": total, "count": count}
+            for key, (total, count) in sorted(deltas.items())
+            if total != 0 or count != 0
+        ]
+        if not params:
+            return
+        table = MonthlyRollup.__table__
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise ValueError(f"Rollup upserts are not supported on `{dialect}`.")
+        statement = UPSERT_INSERTS[dialect](table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(table.primary_key),
+            set_={
+                "total": table.c.total + statement.excluded.total,
+                "count": table.c.count + statement.excluded.count,
+            },
+        )
+        await self.session.execute(statement, params)
+
+    async def report(
+        self, *, filter_manager: AsyncFilterManagerProtocol, group_by: Sequence[str] = ()
+    ) -> list[dict[str, Any]]:
+        """Totals and counts by month and the `group_by` fields (see `GROUP_BY_FIELDS`), oldest first."""
+        columns = [MonthlyRollup.month, *(getattr(MonthlyRollup, field) for field in group_by)]
+        query = (
+            select(
+                *columns,
+                func.sum(MonthlyRollup.total).label("total"),
+                func.sum(MonthlyRollup.count).label("count"),
+            )
+            .group_by(*columns)
+            # NOTE: Groups whose transactions were all deleted or moved keep rows with a zero count
+            .having(func.sum(MonthlyRollup.count) > 0)
+            .order_by(*columns)
+        )
+        result = await self.session.execute(filter_manager.filter_queryset(query))
+        return [dict(row) for row in result.mappings()]
+
+    async def rebuild(self, *, user_id: Optional[int] = None) -> int:
+        """
+        Recompute the rollups (of `user_id` only, if given) out of `transactions`.
+
+        On PostgreSQL `transactions` is locked against writes (`SHARE` mode, reads go on) until the
+        database transaction ends, so no delta is applied meanwhile.
+
+        Returns
+        -------
+            Number of rollups written.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            await self.session.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+
+        clear = delete(MonthlyRollup)
+        month = MonthStart(Transaction.date)
+        totals = select(
+            Transaction.user_id,
+            month,
+            Transaction.account_id,
+            Transaction.category_id,
+            Transaction.transaction_type,
+            func.sum(Transaction.amount),
+            func.count(),
+        ).group_by(
+            Transaction.user_id,
+            month,
+            Transaction.account_id,
+            Transaction.category_id,
+            Transaction.transaction_type,
+        )
+        if user_id is not None:
+            clear = clear.where(MonthlyRollup.user_id == user_id)
+            totals = totals.where(Transaction.user_id == user_id)
+
+        await self.session.execute(clear)
+        result = await self.session.execute(
+            insert(MonthlyRollup).from_select([*RollupKey._fields, "total", "count"], totals)
+        )
+        return result.rowcount  # type: ignore[attr-defined,no-any-return]
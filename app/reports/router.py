@@ -0,0 +1,27 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.settings import settings
+from utils.cache import cache_response, coalesce_requests
+
+from .dependencies import get_report_filter_manager, get_report_group_by, get_report_service
+from .docs import report_docs
+from .filters import ReportFilterManager
+from .models import MonthlyRollup
+from .services import ReportService
+
+router = APIRouter(prefix="/report", tags=["report"])
+
+
+# NOTE: Served from the monthly rollups, whatever the history size it never scans `transactions`
+@router.get("/", **report_docs)
+@cache_response(tags=(MonthlyRollup.__tablename__,))
+@coalesce_requests
+async def retrieve_report(
+    service: Annotated[ReportService, Depends(get_report_service)],
+    filter_manager: ReportFilterManager = Depends(get_report_filter_manager),
+    group_by: list[str] = Depends(get_report_group_by),
+):
+    data = await service.report(filter_manager=filter_manager, group_by=group_by)
+    return {"time_zone": settings.TIME_ZONE, "group_by": group_by, "data": data}
@@ -0,0 +1,19 @@
+from datetime import date
+from typing import Annotated, Any
+
+from pydantic import AfterValidator, BeforeValidator
+
+
+def parse_month(value: Any) -> Any:
+    """Parses `"2024-12"` into `2024-12-01`, leaving any other value (e.g. a full date) untouched."""
+    if isinstance(value, str) and len(value) == 7:
+        return f"{value}-01"
+    return value
+
+
+# NOTE: A month as its first day, given either as `YYYY-MM` or as any date within it
+Month = Annotated[
+    date,
+    BeforeValidator(parse_month, json_schema_input_type=str),
+    AfterValidator(lambda value: value.replace(day=1)),
+]
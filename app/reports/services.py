@@ -0,0 +1,14 @@
+from typing import Any, Sequence
+
+from utils.database.async_repository import AsyncFilterManagerProtocol
+from utils.services import AsyncBaseService
+
+from .models import MonthlyRollup
+from .repository import MonthlyRollupRepository
+
+
+class ReportService(AsyncBaseService[MonthlyRollup, MonthlyRollupRepository]):
+    async def report(
+        self, *, filter_manager: AsyncFilterManagerProtocol, group_by: Sequence[str] = ()
+    ) -> list[dict[str, Any]]:
+        return await self.repository.report(filter_manager=filter_manager, group_by=group_by)
@@ -22,6 +22,15 @@ class Settings(BaseSettings, DatabaseSettingsMixin):
 
     TIME_ZONE: str = "UTC"
 
+    # Read-through cache of single entities (per worker process)
+    ENTITY_CACHE_MAXSIZE: int = 1024
+    ENTITY_CACHE_TTL: float = 30.0
+
+    # Cache of rendered list responses (per worker process), bounded by the bytes stored
+    RESPONSE_CACHE_MAXBYTES: int = 16 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    RESPONSE_CACHE_TTL: float = 30.0
+
     model_config = SettingsConfigDict(
         # Configuration for BaseSettings.
         case_sensitive=False,
@@ -1,33 +1,72 @@
 from typing import Optional
 
-from fastapi import Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import Depends, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_database
-from utils.pagination import LimitOffsetPagination, LimitOffsetSchema
+from app.accounts.dependencies import get_account_repository
+from app.accounts.repository import AccountRepository
+from app.database import get_async_database
+from app.reports.dependencies import get_monthly_rollup_repository
+from app.reports.repository import MonthlyRollupRepository
+from utils.exceptions.client import BadRequestException
+from utils.pagination import KeysetPagination, KeysetSchema
 
-from .filters import TransactionFilterManager, TransactionFilterSchema
+from .filters import TransactionFilterManager, TransactionFilterSchema, TransactionProjectionManager
 from .repository import TransactionRepository
+from .schemas import ImportFormat
 from .services import TransactionService
 
 
-def get_transaction_repository(session: Session = Depends(get_database)) -> TransactionRepository:
+def get_transaction_repository(session: AsyncSession = Depends(get_async_database)) -> TransactionRepository:
     return TransactionRepository(session=session)
 
 
 def get_transaction_service(
     repository: TransactionRepository = Depends(get_transaction_repository),
+    account_repository: AccountRepository = Depends(get_account_repository),
+    rollup_repository: MonthlyRollupRepository = Depends(get_monthly_rollup_repository),
 ) -> TransactionService:
-    return TransactionService(repository=repository)
+    return TransactionService(
+        repository=repository, account_repository=account_repository, rollup_repository=rollup_repository
+    )
 
 
 def get_transaction_filter_manager(
     filters: TransactionFilterSchema = Depends(),
     ordering: Optional[list[str]] = Query(None),
+    q: Optional[str] = Query(None, description="Text searched in the description, by relevance"),
 ) -> TransactionFilterManager:
-    return TransactionFilterManager(filters=filters, ordering=ordering)
+    return TransactionFilterManager(filters=filters, ordering=ordering, search=q)
+
+
+def get_transaction_projection_manager(
+    fields: Optional[list[str]] = Query(None, description="Comma separated fields to return, e.g. `id,name`"),
+) -> TransactionProjectionManager:
+    return TransactionProjectionManager(fields=fields)
 
 
 # TODO: This one might be "global" for project due its (possible) immutability across domains nature
-def get_pagination(pagination: LimitOffsetSchema = Depends()) -> LimitOffsetPagination:
-    return LimitOffsetPagination(pagination)
+def get_pagination(
+    pagination: KeysetSchema = Depends(),
+    ordering: Optional[list[str]] = Query(None),
+    filter_manager: TransactionFilterManager = Depends(get_transaction_filter_manager),
+) -> KeysetPagination:
+    # NOTE: Results searched with `q` are paginated by relevance, the order they are listed in
+    return KeysetPagination(pagination, ordering=ordering, leading_keys=filter_manager.get_search_keys())
+
+
+IMPORT_FORMAT_EXTENSIONS = {".csv": ImportFormat.csv, ".ofx": ImportFormat.ofx, ".qfx": ImportFormat.ofx}
+
+
+def get_import_format(
+    file: UploadFile,
+    format: Optional[ImportFormat] = Query(
+        None, description="Format of the file, by its extension if omitted"
+    ),
+) -> ImportFormat:
+    if format:
+        return format
+    extension = "." + (file.filename or "").rsplit(".", 1)[-1].lower()
+    if extension not in IMPORT_FORMAT_EXTENSIONS:
+        raise BadRequestException(detail="Unknown file format, set `format` to one of `csv` or `ofx`")
+    return IMPORT_FORMAT_EXTENSIONS[extension]
@@ -17,12 +17,42 @@ class UpdateTransactionDocs(FastAPIRouteParameters):
     status_code: int = 200
 
 
+class PartialUpdateTransactionDocs(FastAPIRouteParameters):
+    status_code: int = 200
+
+
 class DestroyTransactionDocs(FastAPIRouteParameters):
     status_code: int = 204
 
 
+class BatchCreateTransactionDocs(FastAPIRouteParameters):
+    status_code: int = 201
+
+
+class BatchUpdateTransactionDocs(FastAPIRouteParameters):
+    status_code: int = 200
+
+
+class BatchDestroyTransactionDocs(FastAPIRouteParameters):
+    status_code: int = 204
+
+
+class ImportTransactionDocs(FastAPIRouteParameters):
+    status_code: int = 200
+    description: str = (
+        "Create the transactions of a CSV (the columns of a transaction, e.g. a CSV export) or OFX "
+        "statement. The file is streamed and loaded in batches, each committed on its own, and the "
+        "rejected rows are reported by line. OFX rows take their account, user and category from the form."
+    )
+
+
 retrieve_transaction_docs = RetrieveTransactionDocs().model_dump()
 list_transaction_docs = ListTransactionDocs().model_dump()
 create_transaction_docs = CreateTransactionDocs().model_dump()
 update_transaction_docs = UpdateTransactionDocs().model_dump()
+partial_update_transaction_docs = PartialUpdateTransactionDocs().model_dump()
 destroy_transaction_docs = DestroyTransactionDocs().model_dump()
+batch_create_transaction_docs = BatchCreateTransactionDocs().model_dump()
+batch_update_transaction_docs = BatchUpdateTransactionDocs().model_dump()
+batch_destroy_transaction_docs = BatchDestroyTransactionDocs().model_dump()
+import_transaction_docs = ImportTransactionDocs().model_dump()
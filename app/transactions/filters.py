@@ -1,8 +1,15 @@
+from datetime import date
 from typing import Annotated, Optional
 
 from fastapi import Query
 
-from utils.filters import BaseFilterManager, FilterSchema
+from utils.filters import (
+    BaseFilterManager,
+    BaseProjectionManager,
+    CommaSeparated,
+    CommaSeparatedRange,
+    FilterSchema,
+)
 
 from .models import Transaction
 
@@ -16,7 +23,23 @@ class TransactionFilterSchema(FilterSchema, extra="forbid"):
     date__eq: Optional[int] = Query(None)
     description__contains: Annotated[str | None, Query(None)]
     description__icontains: Optional[str] = Query(None)
+    description__startswith: Optional[str] = Query(None)
+    description__isnull: Optional[bool] = Query(None)
+    description__search: Optional[str] = Query(None)
+    date__range: Optional[CommaSeparatedRange[date]] = Query(None, description="e.g. `2024-01-01,2024-01-31`")
+    account_id__in: Optional[CommaSeparated[int]] = Query(None, description="Comma separated ids")
+    account_id__not_in: Optional[CommaSeparated[int]] = Query(None, description="Comma separated ids")
+    category_id__in: Optional[CommaSeparated[int]] = Query(None, description="Comma separated ids")
+    category_id__not_in: Optional[CommaSeparated[int]] = Query(None, description="Comma separated ids")
+    transaction_type__in: Optional[CommaSeparated[str]] = Query(None, description="Comma separated types")
 
 
 class TransactionFilterManager(BaseFilterManager):
     model = Transaction
+    search_fields = ("description",)
+    ordering_fields = ("-date", "date")
+
+
+class TransactionProjectionManager(BaseProjectionManager):
+    model = Transaction
+    always_loaded = ("updated_at",)
@@ -1,10 +1,13 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Date, Enum, ForeignKey
+from sqlalchemy import Date, Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.settings import settings
+from utils.database.search import install_text_search
+from utils.datetime import get_now_utc_datetime
 
 if TYPE_CHECKING:
     from app.accounts.models import Account  # noqa: F401
@@ -15,7 +18,7 @@ if TYPE_CHECKING:
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
@@ -24,7 +27,10 @@ class Transaction(Base):
         Enum("Income", "Expense", "Transfer", name="transaction_type"), nullable=False
     )
     description: Mapped[Optional[str]] = mapped_column(nullable=True)
-    date: Mapped[datetime] = mapped_column(Date, nullable=False, default=datetime.utcnow)
+    # NOTE: The calendar date of `TIME_ZONE`, the one reports bucket transactions by
+    date: Mapped[datetime] = mapped_column(
+        Date, nullable=False, default=lambda: get_now_utc_datetime(settings.TIME_ZONE).date()
+    )
 
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -32,3 +38,16 @@ class Transaction(Base):
     account: Mapped["Account"] = relationship(back_populates="transactions")
     user: Mapped["User"] = relationship(back_populates="transactions")
     category: Mapped["Category"] = relationship(back_populates="transactions")
+
+
+# NOTE: Indexes follow the list access patterns, `utils.database.indexes.advise_indexes` reports the
+#       declared filters and sorts left without one
+# NOTE: Serves the default `-date` list, unfiltered, paginated by `(date, id)`
+Index("ix_transactions_date_id", Transaction.date.desc(), Transaction.id)
+Index("ix_transactions_account_id_date", Transaction.account_id, Transaction.date)
+Index("ix_transactions_category_id", Transaction.category_id)
+# NOTE: A few pages per block range for `date` filters, rows are inserted mostly in date order
+Index("ix_transactions_date_brin", Transaction.date, postgresql_using="brin").ddl_if(dialect="postgresql")
+
+# NOTE: Backs the `search` lookup and `q` parameter of the transaction list
+install_text_search(Transaction.__table__, "description")  # type: ignore[arg-type]
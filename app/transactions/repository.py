@@ -1,7 +1,99 @@
-from utils.database.repository import BaseRepository
+from datetime import date, datetime
+from typing import Any, NamedTuple
+
+import asyncpg
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+
+from utils.database.async_repository import AsyncBaseRepository
 
 from .models import Transaction
 
 
-class TransactionRepository(BaseRepository[Transaction]):
+class TransactionEntry(NamedTuple):
+    """Columns of a transaction the account balances and monthly rollups are derived from."""
+
+    user_id: int
+    account_id: int
+    category_id: int
+    transaction_type: str
+    date: date
+    amount: float
+
+    @classmethod
+    def from_row(cls, row: Any) -> "TransactionEntry":
+        """Entry out of a `Transaction` instance or a row mapping."""
+        if isinstance(row, dict):
+            return cls(**{field: row[field] for field in cls._fields})
+        return cls(*(getattr(row, field) for field in cls._fields))
+
+
+class TransactionRepository(AsyncBaseRepository[Transaction]):
     model = Transaction
+    include_options = {
+        "account": joinedload(Transaction.account),
+        "category": joinedload(Transaction.category),
+    }
+    strict_loading = True
+
+    async def lock_entries(self, ids: list[int]) -> list[TransactionEntry]:
+        """
+        Entries of the transactions `ids`, locked (`SELECT ... FOR UPDATE`) until the database
+        transaction ends so they cannot change before the effects of the write are applied.
+        """
+        if not ids:
+            return []
+        query = (
+            select(*(getattr(Transaction, field) for field in TransactionEntry._fields))
+            .where(Transaction.id.in_(ids))
+            .order_by(Transaction.id)
+            .with_for_update()
+        )
+        result = await self.session.execute(query)
+        return [TransactionEntry(*row) for row in result.all()]
+
+    async def list_missing_references(self, entities: list[dict[str, Any]]) -> dict[str, set[int]]:
+        """
+        IDs referenced by the `entities` through a foreign key (`account_id`, `user_id`, `category_id`)
+        that do not exist, by column. A query per foreign key.
+        """
+        missing: dict[str, set[int]] = {}
+        for foreign_key in Transaction.__table__.foreign_keys:
+            column, referred = foreign_key.parent, foreign_key.column
+            ids = {entity[column.name] for entity in entities if entity.get(column.name) is not None}
+            if not ids:
+                continue
+            result = await self.session.execute(select(referred).where(referred.in_(ids)))
+            if unknown := ids - set(result.scalars()):
+                missing[column.name] = unknown
+        return missing
+
+    async def copy_create(self, *, entities: list[dict[str, Any]]) -> None:
+        """
+        Insert all the entities without returning them: through `COPY` on PostgreSQL (asyncpg), the
+        fastest way to load rows, or a single `executemany` otherwise.
+
+        `COPY` skips the Python side column defaults, every entity must carry all the required columns.
+        """
+        if not entities:
+            return
+        table = Transaction.__table__
+        connection = await self.session.connection()
+        if connection.dialect.driver != "asyncpg":
+            await self.session.execute(insert(table), entities)
+            return
+        now = datetime.utcnow()
+        columns = [column.name for column in table.columns if column.name != "id"]
+        records = [
+            tuple({"created_at": now, "updated_at": now, **entity}.get(column) for column in columns)
+            for entity in entities
+        ]
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+                table.name, records=records, columns=columns
+            )
+        except asyncpg.IntegrityConstraintViolationError as error:
+            # NOTE: Raised by the driver itself, SQLAlchemy does not wrap it
+            raise IntegrityError("COPY transactions", None, error) from error
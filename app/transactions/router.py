@@ -1,59 +1,185 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Form, Query, Response, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
 
+from app.accounts.models import Account as AccountModel
 from app.auth.security import get_authenticated_user
-from app.database import get_database
+from app.categories.models import Category as CategoryModel
+from app.database import get_async_database, get_database
+from utils.cache import cache_response, coalesce_requests
 from utils.crypt import get_bcrypt_context
 from utils.exceptions.client import NotFoundException, UnauthorizedException
-from utils.pagination import LimitOffsetPagination
+from utils.imports import iter_file
+from utils.pagination import KeysetPagination
+from utils.responses import ConditionalRequest, StreamingListResponse, get_streaming_media_type
 
-from .dependencies import get_pagination, get_transaction_filter_manager, get_transaction_service
+from .dependencies import (
+    get_import_format,
+    get_pagination,
+    get_transaction_filter_manager,
+    get_transaction_projection_manager,
+    get_transaction_service,
+)
 from .docs import (
+    batch_create_transaction_docs,
+    batch_destroy_transaction_docs,
+    batch_update_transaction_docs,
     create_transaction_docs,
     destroy_transaction_docs,
+    import_transaction_docs,
     list_transaction_docs,
+    partial_update_transaction_docs,
     retrieve_transaction_docs,
     update_transaction_docs,
 )
-from .filters import TransactionFilterManager, TransactionFilterSchema
+from .filters import TransactionFilterManager, TransactionFilterSchema, TransactionProjectionManager
 from .models import Transaction as TransactionModel
-from .schemas import TransactionSchema
+from .schemas import (
+    MAX_BATCH_SIZE,
+    ImportFormat,
+    TransactionBatchDestroySchema,
+    TransactionBatchUpdateSchema,
+    TransactionPartialUpdateSchema,
+    TransactionSchema,
+)
 from .services import TransactionService
 
 router = APIRouter(prefix="/transaction", tags=["transaction"])
 
 TransactionServiceAnnotation = Annotated[TransactionService, Depends(get_transaction_service)]
+TransactionProjectionAnnotation = Annotated[
+    TransactionProjectionManager, Depends(get_transaction_projection_manager)
+]
+TransactionIncludeAnnotation = Annotated[
+    Optional[list[str]],
+    Query(description="Comma separated relationships to embed, i.e. `account` and/or `category`"),
+]
+
+
+# NOTE: Batch routes are declared first so `/batch` is not captured by the `/{id}` routes
+@router.post("/batch", **batch_create_transaction_docs)
+async def batch_create_transaction(
+    payload: Annotated[list[TransactionSchema], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    service: TransactionServiceAnnotation,
+):
+    return await service.bulk_create(entities=[item.model_dump() for item in payload])
+
+
+@router.put("/batch", **batch_update_transaction_docs)
+async def batch_update_transaction(
+    payload: Annotated[list[TransactionBatchUpdateSchema], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    service: TransactionServiceAnnotation,
+):
+    return await service.bulk_update(entities=[item.model_dump() for item in payload])
+
+
+@router.delete("/batch", **batch_destroy_transaction_docs)
+async def batch_destroy_transaction(
+    payload: TransactionBatchDestroySchema, service: TransactionServiceAnnotation
+):
+    await service.bulk_destroy(ids=payload.ids)
+
+
+@router.post("/import", **import_transaction_docs)
+async def import_transaction(
+    file: UploadFile,
+    service: TransactionServiceAnnotation,
+    format: ImportFormat = Depends(get_import_format),
+    account_id: Annotated[Optional[int], Form(description="Account of the rows without one")] = None,
+    user_id: Annotated[Optional[int], Form(description="User of the rows without one")] = None,
+    category_id: Annotated[Optional[int], Form(description="Category of the rows without one")] = None,
+):
+    defaults = {"account_id": account_id, "user_id": user_id, "category_id": category_id}
+    return await service.import_file(chunks=iter_file(file), format=format, defaults=defaults)
 
 
 @router.get("/{id}", **retrieve_transaction_docs)
-async def retrieve_transaction(id: int, service: TransactionServiceAnnotation):
-    return service.retrieve_by_id(id=id)
+@coalesce_requests
+async def retrieve_transaction(
+    id: int,
+    response: Response,
+    service: TransactionServiceAnnotation,
+    projection_manager: TransactionProjectionAnnotation,
+    include: TransactionIncludeAnnotation = None,
+    conditional: ConditionalRequest = Depends(),
+):
+    instance = await service.retrieve_by_id(id=id, projection_manager=projection_manager, include=include)
+    # NOTE: Embedded relationships change on their own, their representation is only validated by the body
+    if not include:
+        not_modified = conditional.evaluate(
+            response, parts=(instance.id, instance.updated_at), last_modified=instance.updated_at
+        )
+        if not_modified:
+            return not_modified
+    return projection_manager.project_entity(instance)
 
 
+# NOTE: Tagged with the embedded tables too, `include` renders accounts and categories
 @router.get("/", **list_transaction_docs)
+@cache_response(
+    tags=(TransactionModel.__tablename__, AccountModel.__tablename__, CategoryModel.__tablename__)
+)
+@coalesce_requests
 async def list_transaction(
+    response: Response,
     service: TransactionServiceAnnotation,
+    projection_manager: TransactionProjectionAnnotation,
     filter_manager: TransactionFilterManager = Depends(get_transaction_filter_manager),
-    pagination_manager: LimitOffsetPagination = Depends(get_pagination),
+    pagination_manager: KeysetPagination = Depends(get_pagination),
+    streaming_media_type: Optional[str] = Depends(get_streaming_media_type),
+    session: AsyncSession = Depends(get_async_database),
+    include: TransactionIncludeAnnotation = None,
+    conditional: ConditionalRequest = Depends(),
 ):
-    return service.list(filter_manager=filter_manager, pagination_manager=pagination_manager)
+    if streaming_media_type:
+        # NOTE: Same representation as the JSON listing, projected fields and embedded relationships
+        results = service.stream(
+            filter_manager=filter_manager, projection_manager=projection_manager, include=include
+        )
+        # NOTE: The session is released once the whole stream is sent, not on dependency teardown
+        return StreamingListResponse(
+            projection_manager.project_stream(results),
+            media_type=streaming_media_type,
+            background=BackgroundTask(session.close),
+        )
+    if not include:
+        last_modified, count = await service.list_validators(filter_manager=filter_manager)
+        not_modified = conditional.evaluate(
+            response, parts=(last_modified, count), last_modified=last_modified
+        )
+        if not_modified:
+            return not_modified
+    results = await service.list(
+        filter_manager=filter_manager,
+        pagination_manager=pagination_manager,
+        projection_manager=projection_manager,
+        include=include,
+    )
+    return pagination_manager.get_paginated_response_data(projection_manager.project_results(results))
 
 
 @router.post("/", **create_transaction_docs)
 async def create_transaction(payload: TransactionSchema, service: TransactionServiceAnnotation):
-    data = payload.model_dump()
-    service.create(entity=data)
-    return data
+    return await service.create(entity=payload.model_dump())
 
 
 @router.put("/{id}", **update_transaction_docs)
 async def update_transaction(id: int, payload: TransactionSchema, service: TransactionServiceAnnotation):
     data = payload.model_dump(exclude_unset=True)
-    return service.update(id=id, entity=data)
+    return await service.update(id=id, entity=data)
+
+
+@router.patch("/{id}", **partial_update_transaction_docs)
+async def partial_update_transaction(
+    id: int, payload: TransactionPartialUpdateSchema, service: TransactionServiceAnnotation
+):
+    data = payload.model_dump(exclude_unset=True)
+    return await service.update(id=id, entity=data)
 
 
 @router.delete("/{id}", **destroy_transaction_docs)
 async def destroy_transaction(id: int, service: TransactionServiceAnnotation):
-    return service.destroy(id=id)
+    return await service.destroy(id=id)
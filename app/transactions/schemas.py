@@ -1,9 +1,14 @@
-from datetime import date
+import datetime as dt
 from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+MAX_BATCH_SIZE = 500
+# NOTE: Rows loaded per database transaction by imports, and rejected rows reported at most
+IMPORT_BATCH_SIZE = 5000
+MAX_IMPORT_ERRORS = 1000
+
 
 class TransactionType(str, Enum):
     income = "Income"
@@ -11,6 +16,11 @@ class TransactionType(str, Enum):
     transfer = "Transfer"
 
 
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ofx = "ofx"
+
+
 class TransactionSchema(BaseModel):
     account_id: int
     user_id: int
@@ -18,7 +28,7 @@ class TransactionSchema(BaseModel):
     amount: float = Field(description="Transaction amount must be non-negative")
     transaction_type: TransactionType
     description: Optional[str] = Field(None, description="Optional transaction description")
-    date: date
+    date: dt.date
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -44,3 +54,34 @@ class TransactionSchema(BaseModel):
             ]
         }
     )
+
+
+class TransactionPartialUpdateSchema(BaseModel):
+    """
+    Partial update (PATCH) of a transaction, only the fields present in the payload are updated.
+
+    Omitted fields default to `None` but defaults are not validated, hence an explicit `null` is still
+    rejected for the required fields.
+    """
+
+    account_id: int = None  # type: ignore[assignment]
+    user_id: int = None  # type: ignore[assignment]
+    category_id: int = None  # type: ignore[assignment]
+    amount: float = Field(None, description="Transaction amount must be non-negative")
+    transaction_type: TransactionType = None  # type: ignore[assignment]
+    description: Optional[str] = Field(None, description="Optional transaction description")
+    date: dt.date = None  # type: ignore[assignment]
+
+    model_config = ConfigDict(
+        extra="forbid", json_schema_extra={"examples": [{"amount": 75.25, "description": "Dinner"}]}
+    )
+
+
+class TransactionBatchUpdateSchema(TransactionSchema):
+    id: int
+
+
+class TransactionBatchDestroySchema(BaseModel):
+    ids: list[int] = Field(
+        min_length=1, max_length=MAX_BATCH_SIZE, description="IDs of the transactions to delete"
+    )
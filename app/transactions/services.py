@@ -1,8 +1,244 @@
-from utils.services import BaseService
+"""
+Transactions keep the current balance of their accounts and the monthly rollups up to date.
+
+Every write applies the deltas it causes, as relative updates (`current_balance + :delta`,
+`total + :delta`) in the same database transaction, so balances and reports are read as stored values
+instead of aggregating transactions. Amounts are signed: a balance is `initial_balance + SUM(amount)`,
+which `app.accounts.jobs` reconciles, while `app.reports.jobs` rebuilds the rollups.
+
+Imports stream the rows of statement files (`utils.imports`) and load them batch by batch, each batch
+in its own database transaction with the deltas of its rows.
+"""
+
+from collections import defaultdict
+from typing import Any, AsyncIterable, Iterable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.accounts.models import Account
+from app.accounts.repository import AccountRepository
+from app.reports.models import MonthlyRollup
+from app.reports.repository import MonthlyRollupRepository, RollupKey
+from utils.database.routing import use_primary
+from utils.imports import ImportParseError, batched, parse_csv, parse_ofx
+from utils.services import AsyncBaseService
 
 from .models import Transaction
-from .repository import TransactionRepository
+from .repository import TransactionEntry, TransactionRepository
+from .schemas import IMPORT_BATCH_SIZE, MAX_IMPORT_ERRORS, ImportFormat, TransactionSchema, TransactionType
+
+
+def get_balance_deltas(
+    removed: Iterable[TransactionEntry] = (), added: Iterable[TransactionEntry] = ()
+) -> dict[int, float]:
+    """Net balance change by account of removing and adding transaction entries."""
+    deltas: dict[int, float] = defaultdict(float)
+    for entry in removed:
+        deltas[entry.account_id] -= entry.amount
+    for entry in added:
+        deltas[entry.account_id] += entry.amount
+    return dict(deltas)
+
+
+def get_rollup_key(entry: TransactionEntry) -> RollupKey:
+    return RollupKey(
+        entry.user_id, entry.date.replace(day=1), entry.account_id, entry.category_id, entry.transaction_type
+    )
+
+
+def get_rollup_deltas(
+    removed: Iterable[TransactionEntry] = (), added: Iterable[TransactionEntry] = ()
+) -> dict[RollupKey, tuple[float, int]]:
+    """Net `(total, count)` change by monthly rollup of removing and adding transaction entries."""
+    deltas: dict[RollupKey, tuple[float, int]] = defaultdict(lambda: (0.0, 0))
+    for entry, sign in [*((entry, -1) for entry in removed), *((entry, 1) for entry in added)]:
+        key = get_rollup_key(entry)
+        total, count = deltas[key]
+        deltas[key] = (total + sign * entry.amount, count + sign)
+    return dict(deltas)
+
+
+def get_csv_entity(data: dict[str, str]) -> dict[str, Any]:
+    """Entity out of a CSV record with the columns of `TransactionSchema` (e.g. an export)."""
+    return {column: value for column, value in data.items() if value.strip()}
+
+
+def get_ofx_entity(data: dict[str, str]) -> dict[str, Any]:
+    """Entity out of an OFX `<STMTTRN>`, the sign of `TRNAMT` sets the type unless it is a `XFER`."""
+    entity: dict[str, Any] = {}
+    if amount := data.get("TRNAMT"):
+        entity["amount"] = amount if "." in amount else amount.replace(",", ".")
+        if data.get("TRNTYPE", "").upper() == "XFER":
+            entity["transaction_type"] = TransactionType.transfer
+        else:
+            negative = amount.lstrip().startswith("-")
+            entity["transaction_type"] = TransactionType.expense if negative else TransactionType.income
+    # NOTE: `YYYYMMDD[HHMMSS[.XXX]][[gmt offset:tz name]]`, the date is the one of the bank
+    if (posted := data.get("DTPOSTED", "")[:8]).isdigit() and len(posted) == 8:
+        entity["date"] = f"{posted[:4]}-{posted[4:6]}-{posted[6:]}"
+    descriptions = [data[element] for element in ("NAME", "MEMO") if data.get(element)]
+    if descriptions:
+        entity["description"] = " - ".join(dict.fromkeys(descriptions))
+    return entity
+
+
+IMPORT_PARSERS = {
+    ImportFormat.csv: (parse_csv, get_csv_entity),
+    ImportFormat.ofx: (parse_ofx, get_ofx_entity),
+}
+
+
+class TransactionService(AsyncBaseService[Transaction, TransactionRepository]):
+    def __init__(
+        self,
+        *,
+        repository: TransactionRepository,
+        account_repository: AccountRepository,
+        rollup_repository: MonthlyRollupRepository,
+    ):
+        super().__init__(repository=repository)
+        self.account_repository = account_repository
+        self.rollup_repository = rollup_repository
+
+    async def create(self, *, entity: dict[str, Any]) -> Transaction:
+        instance = await self.repository.create(entity=entity)
+        await self.apply_entries(added=[TransactionEntry.from_row(instance)])
+        await self.perform_commit()
+        return instance
+
+    async def update(self, *, id: int, entity: dict[str, Any]) -> Transaction:
+        # NOTE: Writes to other fields (e.g. the description) change neither balances nor rollups
+        if not any(field in entity for field in TransactionEntry._fields):
+            return await super().update(id=id, entity=entity)
+        removed = await self.repository.lock_entries([id])
+        instance = await self.repository.update(id=id, entity=entity)
+        await self.apply_entries(removed, [TransactionEntry.from_row(instance)])
+        await self.perform_commit()
+        return instance
+
+    async def destroy(self, *, id: int) -> None:
+        removed = await self.repository.lock_entries([id])
+        await self.repository.destroy(id=id)
+        await self.apply_entries(removed)
+        await self.perform_commit()
+
+    async def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = await self.repository.bulk_create(entities=entities)
+        await self.apply_entries(added=[TransactionEntry.from_row(row) for row in rows])
+        await self.perform_commit()
+        return rows
+
+    async def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        removed = await self.repository.lock_entries(
+            [entity["id"] for entity in entities if entity.get("id")]
+        )
+        rows = await self.repository.bulk_update(entities=entities)
+        # NOTE: A transaction listed twice ends up written once, its rows are deduplicated by ID
+        updated = {row["id"]: TransactionEntry.from_row(row) for row in rows}
+        await self.apply_entries(removed, updated.values())
+        await self.perform_commit()
+        return rows
+
+    async def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        removed = await self.repository.lock_entries(ids)
+        deleted = await self.repository.bulk_destroy(ids=ids)
+        await self.apply_entries(removed)
+        await self.perform_commit()
+        return deleted
+
+    async def import_file(
+        self,
+        *,
+        chunks: AsyncIterable[bytes],
+        format: ImportFormat,
+        defaults: Optional[dict[str, Any]] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> dict[str, Any]:
+        """
+        Create the transactions of a statement file streamed as `chunks`. Rows are validated against
+        `TransactionSchema`, with the `defaults` filling the fields they lack, and loaded `batch_size`
+        at a time, each batch committed on its own (`COPY` on PostgreSQL).
+
+        Invalid rows are skipped and reported by line, up to `MAX_IMPORT_ERRORS`. A file that cannot be
+        parsed any further ends the import, the batches loaded so far are kept.
+        """
+        parse, get_entity = IMPORT_PARSERS[format]
+        defaults = {field: value for field, value in (defaults or {}).items() if value is not None}
+        report: dict[str, Any] = {"created": 0, "failed": 0, "errors": []}
+
+        def reject(line: int, errors: list[dict[str, Any]]) -> None:
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_IMPORT_ERRORS:
+                report["errors"].append({"line": line, "errors": errors})
+
+        # NOTE: Referenced accounts or categories may have just been created, replicas may lag behind
+        use_primary(self.repository.session)
+        try:
+            async for rows in batched(parse(chunks), batch_size):
+                created, rejected = await self.import_batch(
+                    [(row.line, {**defaults, **get_entity(row.data)}) for row in rows]
+                )
+                report["created"] += created
+                for line, errors in rejected:
+                    reject(line, errors)
+        except ImportParseError as error:
+            reject(error.line, [{"type": "parse_error", "loc": [], "msg": str(error)}])
+        return report
+
+    async def import_batch(
+        self, rows: list[tuple[int, dict[str, Any]]]
+    ) -> tuple[int, list[tuple[int, list[dict[str, Any]]]]]:
+        """
+        Validate and create the `(line, entity)` rows in a single database transaction.
+
+        Returns
+        -------
+            Number of transactions created and the errors of the rejected rows by line.
+        """
+        rejected: list[tuple[int, list[dict[str, Any]]]] = []
+        valid: list[tuple[int, dict[str, Any]]] = []
+        for line, data in rows:
+            try:
+                valid.append((line, TransactionSchema.model_validate(data).model_dump()))
+            except ValidationError as error:
+                rejected.append(
+                    (line, error.errors(include_url=False, include_context=False, include_input=False))
+                )
+
+        missing = await self.repository.list_missing_references([entity for _, entity in valid])
+        if missing:
+            unknown = {
+                line: [
+                    {"type": "missing_reference", "loc": [field], "msg": f"No record with ID {entity[field]}"}
+                    for field, ids in missing.items()
+                    if entity[field] in ids
+                ]
+                for line, entity in valid
+            }
+            rejected.extend((line, errors) for line, errors in unknown.items() if errors)
+            valid = [(line, entity) for line, entity in valid if not unknown[line]]
+
+        entities = [entity for _, entity in valid]
+        try:
+            await self.repository.copy_create(entities=entities)
+            await self.apply_entries(added=[TransactionEntry.from_row(entity) for entity in entities])
+            await self.perform_commit()
+        except IntegrityError:
+            # NOTE: A reference deleted meanwhile, the batch is rolled back as a whole
+            await self.repository.session.rollback()
+            error = {"type": "integrity_error", "loc": [], "msg": "Batch rejected by the database"}
+            rejected.extend((line, [error]) for line, _ in valid)
+            return 0, sorted(rejected)
+        return len(entities), sorted(rejected)
 
+    async def apply_entries(
+        self, removed: Iterable[TransactionEntry] = (), added: Iterable[TransactionEntry] = ()
+    ) -> None:
+        """Apply the balance and rollup deltas of replacing the `removed` entries by the `added` ones."""
+        removed, added = list(removed), list(added)
+        await self.account_repository.apply_balance_deltas(get_balance_deltas(removed, added))
+        await self.rollup_repository.apply_rollup_deltas(get_rollup_deltas(removed, added))
 
-class TransactionService(BaseService[Transaction, TransactionRepository]):
-    pass
+    def get_cache_tags(self) -> tuple[str, ...]:
+        return (*super().get_cache_tags(), Account.__tablename__, MonthlyRollup.__tablename__)
@@ -1,21 +1,23 @@
 from typing import Optional
 
+from starlette.concurrency import run_in_threadpool
+
 from utils.crypt import get_bcrypt_context
-from utils.database.repository import BaseRepository
+from utils.database.async_repository import AsyncBaseRepository
 
 from .models import User
 
 bcrypt_context = get_bcrypt_context(schemes=["bcrypt"], deprecated="auto")
 
 
-class UserRepository(BaseRepository[User]):
+class UserRepository(AsyncBaseRepository[User]):
     model = User
 
-    def authenticate(self, username: str, password: str) -> Optional[User]:
-        user = self.retrieve(username=username)
+    async def authenticate(self, username: str, password: str) -> Optional[User]:
+        user = await self.retrieve(username=username)
 
         if not user:
             return None
-        if not bcrypt_context.verify_password(password, user.hashed_password):
+        if not await run_in_threadpool(bcrypt_context.verify_password, password, user.hashed_password):
             return None
         return user
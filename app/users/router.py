@@ -1,9 +1,10 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_database
+from app.database import get_async_database
 from utils.crypt import get_bcrypt_context
 
 from .models import User
@@ -16,11 +17,12 @@ router = APIRouter(prefix="/user", tags=["user"])
 
 
 @router.post("/", status_code=201)
-async def create_new_user(schema: CreateUserSchema, db: Session = Depends(get_database)) -> Any:
+async def create_new_user(schema: CreateUserSchema, db: AsyncSession = Depends(get_async_database)) -> Any:
     data = schema.model_dump(exclude_unset=True, exclude_none=True)
     password = data.pop("password")
-    user_model = User(hashed_password=bcrypt_context.get_password_hash(password), **data)
+    hashed_password = await run_in_threadpool(bcrypt_context.get_password_hash, password)
+    user_model = User(hashed_password=hashed_password, **data)
 
     db.add(user_model)
-    db.commit()
+    await db.commit()
     return {}  # TODO: Maybe return full user along a token(?)
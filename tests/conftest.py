@@ -1,13 +1,20 @@
-from typing import Generator
-from unittest.mock import MagicMock, Mock
+from typing import AsyncGenerator, Generator
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, StaticPool, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from utils.database.models import APIBaseModel
 
 DATABASE_URL = "sqlite:///:memory:"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
 
 
 @pytest.fixture(scope="module")
@@ -31,9 +38,40 @@ def session(engine, create_tables) -> Session:  # type: ignore
     session.close()
 
 
+@pytest.fixture
+async def async_engine() -> AsyncGenerator[AsyncEngine, None]:
+    # NOTE: `StaticPool` keeps a single connection so every session sees the same in-memory database
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(APIBaseModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def async_session(async_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    SessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_engine)
+    async with SessionLocal() as session:
+        yield session
+        await session.rollback()
+
+
 @pytest.fixture
 def mock_repository() -> Mock:
     mock = Mock()
+    mock.get_model.return_value.__tablename__ = "mock"
+    mock.retrieve_by_id.return_value = MagicMock()
+    mock.retrieve.return_value = MagicMock()
+    mock.list.return_value = [MagicMock()]
+    mock.create.return_value = MagicMock()
+    mock.update.return_value = MagicMock()
+    return mock
+
+
+@pytest.fixture
+def mock_async_repository() -> AsyncMock:
+    mock = AsyncMock()
+    mock.get_model = Mock(return_value=Mock(__tablename__="mock"))
     mock.retrieve_by_id.return_value = MagicMock()
     mock.retrieve.return_value = MagicMock()
     mock.list.return_value = [MagicMock()]
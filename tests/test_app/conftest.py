@@ -0,0 +1,83 @@
+import os
+from typing import AsyncGenerator, Awaitable, Callable
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+# NOTE: Settings require a database, the engines of `app.database` are never connected to
+for name, value in {
+    "DATABASE__ENGINE": "postgresql+psycopg2",
+    "DATABASE__NAME": "test",
+    "DATABASE__USER": "test",
+    "DATABASE__PASSWORD": "test",
+    "DATABASE__HOST": "localhost",
+    "DATABASE__PORT": "5432",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.accounts.models import Account  # noqa: E402
+from app.categories.models import Category  # noqa: E402
+from app.categories.services import category_catalog  # noqa: E402
+from app.database import get_async_database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.users.models import User  # noqa: E402
+from utils.cache.responses import response_caches  # noqa: E402
+from utils.crypt import get_bcrypt_context  # noqa: E402
+from utils.database.caching import entity_caches  # noqa: E402
+
+HASHED_PASSWORD = get_bcrypt_context().get_password_hash("jerry")
+
+
+@pytest.fixture
+def session_maker(async_engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(autoflush=False, expire_on_commit=False, bind=async_engine)
+
+
+@pytest.fixture
+async def fixtures(session_maker: async_sessionmaker[AsyncSession]) -> None:
+    """Create a user, two accounts (IDs 1 and 2, balance 100) and two categories (IDs 1 and 2)."""
+    async with session_maker() as session:
+        session.add(User(id=1, email="jerry@example.com", username="jerry", hashed_password=HASHED_PASSWORD))
+        await session.flush()
+        session.add_all(
+            [
+                Account(id=id, user_id=1, name=f"Account {id}", initial_balance=100, current_balance=100)
+                for id in (1, 2)
+            ]
+        )
+        session.add_all(
+            [Category(id=1, name="Food", type="Expense"), Category(id=2, name="Pay", type="Income")]
+        )
+        await session.commit()
+
+
+@pytest.fixture
+def get_balances(
+    session_maker: async_sessionmaker[AsyncSession],
+) -> Callable[[], Awaitable[dict[int, float]]]:
+    """Current balance of every account, by ID."""
+
+    async def get_balances() -> dict[int, float]:
+        async with session_maker() as session:
+            rows = await session.execute(select(Account.id, Account.current_balance).order_by(Account.id))
+            return dict(rows.tuples().all())
+
+    return get_balances
+
+
+@pytest.fixture
+async def client(session_maker: async_sessionmaker[AsyncSession]) -> AsyncGenerator[AsyncClient, None]:
+    async def get_test_database() -> AsyncGenerator[AsyncSession, None]:
+        async with session_maker() as session:
+            yield session
+
+    # NOTE: Caches live as long as the process, every test starts from an empty database
+    for cache in [*response_caches.values(), *entity_caches.values()]:
+        cache.clear()
+    category_catalog.invalidate()
+    app.dependency_overrides[get_async_database] = get_test_database
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_async_database)
@@ -0,0 +1,105 @@
+from datetime import date
+from typing import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.accounts.jobs import reconcile_balances
+from app.accounts.models import Account
+from app.accounts.repository import AccountRepository, BalanceMismatch
+from app.transactions.models import Transaction
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("fixtures")]
+
+
+Balances = Callable[[], Awaitable[dict[int, float]]]
+
+
+class TestAccountRepository:
+    @pytest.fixture(autouse=True)
+    async def setup_transactions(
+        self, session_maker: async_sessionmaker[AsyncSession], get_balances: Balances
+    ) -> None:
+        """Add transactions worth 15 to account 1 and -5 to account 2, without updating the balances."""
+        self.session_maker = session_maker
+        self.get_balances = get_balances
+        async with session_maker() as session:
+            session.add_all(
+                [
+                    Transaction(
+                        account_id=account_id,
+                        user_id=1,
+                        category_id=1,
+                        amount=amount,
+                        transaction_type="Income" if amount > 0 else "Expense",
+                        date=date(2024, 3, 1),
+                    )
+                    for account_id, amount in ((1, 20.0), (1, -5.0), (2, -5.0))
+                ]
+            )
+            await session.commit()
+
+    async def test_apply_balance_deltas(self) -> None:
+        async with self.session_maker() as session:
+            repository = AccountRepository(session=session)
+            await repository.apply_balance_deltas({2: -5.0, 1: 15.0, 3: 0.0})
+            await repository.apply_balance_deltas({1: 0.5})
+            await repository.apply_balance_deltas({})
+            await session.commit()
+
+        assert await self.get_balances() == {1: 115.5, 2: 95.0}
+
+    async def test_list_balance_mismatches(self) -> None:
+        async with self.session_maker() as session:
+            repository = AccountRepository(session=session)
+            mismatches, last_id = await repository.list_balance_mismatches(chunk_size=1)
+            assert mismatches == [BalanceMismatch(1, 100.0, 115.0)]
+            assert last_id == 1
+
+            mismatches, last_id = await repository.list_balance_mismatches(after_id=1, chunk_size=1)
+            assert mismatches == [BalanceMismatch(2, 100.0, 95.0)]
+            assert last_id == 2
+
+            assert await repository.list_balance_mismatches(after_id=2) == ([], None)
+
+    async def test_repair_balances(self) -> None:
+        async with self.session_maker() as session:
+            repository = AccountRepository(session=session)
+            await repository.repair_balances([1])
+            await repository.repair_balances([])
+            await session.commit()
+
+            mismatches, _ = await repository.list_balance_mismatches()
+            assert mismatches == [BalanceMismatch(2, 100.0, 95.0)]
+        assert await self.get_balances() == {1: 115.0, 2: 100.0}
+
+    async def test_reconcile_balances(self) -> None:
+        mismatches = await reconcile_balances(self.session_maker, chunk_size=1, repair=True)
+        assert [mismatch.account_id for mismatch in mismatches] == [1, 2]
+        assert await self.get_balances() == {1: 115.0, 2: 95.0}
+        assert await reconcile_balances(self.session_maker) == []
+
+
+class TestAccountRouter:
+    async def test_create(self, client: AsyncClient) -> None:
+        payload = {"user_id": 1, "name": "Savings", "initial_balance": 50.0, "current_balance": 999.0}
+        response = await client.post("/account/", json=payload)
+        assert response.status_code == 201
+        assert response.json()["current_balance"] == 50.0
+
+    async def test_update_shifts_current_balance(
+        self, client: AsyncClient, session_maker: async_sessionmaker[AsyncSession], get_balances: Balances
+    ) -> None:
+        # NOTE: Transactions moved the balance of account 1 from 100 to 80
+        async with session_maker() as session:
+            await session.execute(update(Account).where(Account.id == 1).values(current_balance=80.0))
+            await session.commit()
+
+        payload = {"user_id": 1, "name": "Checking", "initial_balance": 110.0, "current_balance": 0.0}
+        response = await client.put("/account/1", json=payload)
+        assert response.status_code == 200
+        assert response.json()["initial_balance"] == 110.0
+        assert response.json()["current_balance"] == 90.0
+        assert (await get_balances())[1] == 90.0
@@ -0,0 +1,29 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.categories.models import Category
+from app.categories.services import category_catalog
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("fixtures")]
+
+
+class TestCategoryRouter:
+    async def test_retrieve_written_elsewhere(
+        self,
+        client: AsyncClient,
+        session_maker: async_sessionmaker[AsyncSession],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(category_catalog, "min_reload_interval", 0)
+        assert (await client.get("/category/1")).json()["name"] == "Food"
+
+        # NOTE: Created by another worker, the catalog of this one was not invalidated
+        async with session_maker() as session:
+            session.add(Category(id=3, name="Rent", type="Expense"))
+            await session.commit()
+
+        response = await client.get("/category/3")
+        assert response.status_code == 200
+        assert response.json()["name"] == "Rent"
+        assert (await client.get("/category/99")).status_code == 404
@@ -0,0 +1,144 @@
+from datetime import date
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.reports.filters import ReportFilterManager, ReportFilterSchema
+from app.reports.jobs import rebuild_rollups
+from app.reports.models import MonthlyRollup
+from app.reports.repository import MonthlyRollupRepository, RollupKey
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("fixtures")]
+
+MARCH = RollupKey(1, date(2024, 3, 1), 1, 1, "Expense")
+MARCH_PAY = RollupKey(1, date(2024, 3, 1), 2, 2, "Income")
+APRIL = RollupKey(1, date(2024, 4, 1), 1, 1, "Expense")
+
+
+async def get_rollups(session_maker: async_sessionmaker[AsyncSession]) -> dict[RollupKey, tuple[float, int]]:
+    async with session_maker() as session:
+        rollups = (await session.scalars(select(MonthlyRollup))).all()
+    return {
+        RollupKey(*(getattr(rollup, field) for field in RollupKey._fields)): (rollup.total, rollup.count)
+        for rollup in rollups
+    }
+
+
+def get_filter_manager(**filters: Any) -> ReportFilterManager:
+    return ReportFilterManager(filters=ReportFilterSchema(**{"user_id__eq": 1, **filters}))
+
+
+class TestMonthlyRollupRepository:
+    @pytest.fixture(autouse=True)
+    async def setup_rollups(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self.session_maker = session_maker
+        async with session_maker() as session:
+            repository = MonthlyRollupRepository(session=session)
+            await repository.apply_rollup_deltas({MARCH: (-10.0, 1), MARCH_PAY: (50.0, 1), APRIL: (-4.0, 1)})
+            await repository.apply_rollup_deltas({MARCH: (-5.5, 1), APRIL: (4.0, -1)})
+            await session.commit()
+
+    async def test_apply_rollup_deltas(self) -> None:
+        # NOTE: Deltas accumulate on the existing rollups, April is kept with a zero count
+        assert await get_rollups(self.session_maker) == {
+            MARCH: (-15.5, 2),
+            MARCH_PAY: (50.0, 1),
+            APRIL: (0.0, 0),
+        }
+
+        async with self.session_maker() as session:
+            repository = MonthlyRollupRepository(session=session)
+            await repository.apply_rollup_deltas({MARCH._replace(month=date(2024, 5, 1)): (0.0, 0)})
+            await repository.apply_rollup_deltas({})
+            await session.commit()
+        assert len(await get_rollups(self.session_maker)) == 3
+
+    async def test_apply_rollup_deltas_unsupported_dialect(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        async with self.session_maker() as session:
+            monkeypatch.setattr(session.get_bind().dialect, "name", "mysql")
+            with pytest.raises(ValueError, match="`mysql`"):
+                await MonthlyRollupRepository(session=session).apply_rollup_deltas({MARCH: (-1.0, 1)})
+
+    async def test_report(self) -> None:
+        async with self.session_maker() as session:
+            repository = MonthlyRollupRepository(session=session)
+            report = await repository.report(filter_manager=get_filter_manager())
+
+        # NOTE: The zero-count April rollup is filtered out
+        assert report == [{"month": date(2024, 3, 1), "total": 34.5, "count": 3}]
+
+    async def test_report_group_by(self) -> None:
+        async with self.session_maker() as session:
+            repository = MonthlyRollupRepository(session=session)
+            report = await repository.report(
+                filter_manager=get_filter_manager(), group_by=["account_id", "transaction_type"]
+            )
+            filtered = await repository.report(
+                filter_manager=get_filter_manager(transaction_type__in=["Income"]), group_by=["category_id"]
+            )
+
+        assert report == [
+            {
+                "month": date(2024, 3, 1),
+                "account_id": 1,
+                "transaction_type": "Expense",
+                "total": -15.5,
+                "count": 2,
+            },
+            {
+                "month": date(2024, 3, 1),
+                "account_id": 2,
+                "transaction_type": "Income",
+                "total": 50.0,
+                "count": 1,
+            },
+        ]
+        assert filtered == [{"month": date(2024, 3, 1), "category_id": 2, "total": 50.0, "count": 1}]
+
+
+class TestReportRouter:
+    async def test_rebuild_matches_rollups(
+        self, client: AsyncClient, session_maker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        payload = {"user_id": 1, "category_id": 1, "transaction_type": "Expense", "description": "Groceries"}
+        ids = []
+        for account_id, amount, day in (
+            (1, -10.0, "2024-03-02"),
+            (1, -2.5, "2024-03-20"),
+            (1, -7.0, "2024-04-01"),
+        ):
+            response = await client.post(
+                "/transaction/", json={**payload, "account_id": account_id, "amount": amount, "date": day}
+            )
+            ids.append(response.json()["id"])
+        await client.put(
+            f"/transaction/{ids[1]}", json={**payload, "account_id": 2, "amount": -3.0, "date": "2024-04-15"}
+        )
+        await client.delete(f"/transaction/{ids[2]}")
+
+        incremental = await get_rollups(session_maker)
+        assert incremental == {
+            MARCH: (-10.0, 1),
+            APRIL: (0.0, 0),
+            RollupKey(1, date(2024, 4, 1), 2, 1, "Expense"): (-3.0, 1),
+        }
+
+        # NOTE: Rebuilding writes no zero-count rollup, otherwise it matches the incremental state
+        assert await rebuild_rollups(session_maker, user_id=1) == 2
+        assert await get_rollups(session_maker) == {
+            key: value for key, value in incremental.items() if value[1] != 0
+        }
+
+        response = await client.get("/report/", params={"month__gte": "2024-01", "group_by": "account_id"})
+        assert response.status_code == 200
+        assert response.json()["data"] == [
+            {"month": "2024-03-01", "account_id": 1, "total": -10.0, "count": 1},
+            {"month": "2024-04-01", "account_id": 2, "total": -3.0, "count": 1},
+        ]
+
+    async def test_invalid_group_by(self, client: AsyncClient) -> None:
+        response = await client.get("/report/", params={"group_by": "description"})
+        assert response.status_code == 400
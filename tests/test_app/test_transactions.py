@@ -0,0 +1,207 @@
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.accounts.repository import AccountRepository
+from app.reports.repository import MonthlyRollupRepository
+from app.transactions.models import Transaction
+from app.transactions.repository import TransactionRepository
+from app.transactions.schemas import ImportFormat, TransactionSchema
+from app.transactions.services import TransactionService
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("fixtures")]
+
+
+def transaction(**values: Any) -> dict[str, Any]:
+    return {
+        "account_id": 1,
+        "user_id": 1,
+        "category_id": 1,
+        "amount": -10.0,
+        "transaction_type": "Expense",
+        "description": "Groceries",
+        "date": "2024-03-31",
+        **values,
+    }
+
+
+async def get_report(client: AsyncClient) -> list[dict[str, Any]]:
+    response = await client.get("/report/", params={"month__gte": "2024-01", "month__lte": "2024-12"})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def entity(**values: Any) -> dict[str, Any]:
+    return TransactionSchema.model_validate(transaction(**values)).model_dump()
+
+
+def get_service(session: AsyncSession) -> TransactionService:
+    return TransactionService(
+        repository=TransactionRepository(session=session),
+        account_repository=AccountRepository(session=session),
+        rollup_repository=MonthlyRollupRepository(session=session),
+    )
+
+
+async def get_chunks(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
+IMPORT_CSV = b"""account_id,amount,transaction_type,description,date
+1,-10.0,Expense,Groceries,2024-03-31
+9,-1.0,Expense,Unknown account,2024-03-31
+1,abc,Expense,Invalid amount,2024-03-31
+2,5.0,Income,Refund,2024-04-02
+"""
+
+
+class TestTransactionService:
+    async def test_balances(
+        self, session_maker: async_sessionmaker[AsyncSession], get_balances: Callable[[], Awaitable[Any]]
+    ) -> None:
+        async with session_maker() as session:
+            instance = await get_service(session).create(entity=entity(amount=-10.0))
+        assert await get_balances() == {1: 90.0, 2: 100.0}
+
+        # NOTE: Moved to the other account with another amount, the old amount is given back
+        async with session_maker() as session:
+            await get_service(session).update(id=instance.id, entity=entity(account_id=2, amount=-25.0))
+        assert await get_balances() == {1: 100.0, 2: 75.0}
+
+        async with session_maker() as session:
+            await get_service(session).update(id=instance.id, entity={"description": "Dinner"})
+        assert await get_balances() == {1: 100.0, 2: 75.0}
+
+        async with session_maker() as session:
+            await get_service(session).destroy(id=instance.id)
+        assert await get_balances() == {1: 100.0, 2: 100.0}
+
+    async def test_bulk_balances(
+        self, session_maker: async_sessionmaker[AsyncSession], get_balances: Callable[[], Awaitable[Any]]
+    ) -> None:
+        async with session_maker() as session:
+            rows = await get_service(session).bulk_create(
+                entities=[entity(amount=-10.0), entity(account_id=2, amount=30.0)]
+            )
+        assert await get_balances() == {1: 90.0, 2: 130.0}
+
+        async with session_maker() as session:
+            await get_service(session).bulk_update(
+                entities=[{**entity(account_id=2, amount=-10.0), "id": rows[0]["id"]}]
+            )
+        assert await get_balances() == {1: 100.0, 2: 120.0}
+
+        async with session_maker() as session:
+            await get_service(session).bulk_destroy(ids=[row["id"] for row in rows])
+        assert await get_balances() == {1: 100.0, 2: 100.0}
+
+    async def test_import_file(
+        self, session_maker: async_sessionmaker[AsyncSession], get_balances: Callable[[], Awaitable[Any]]
+    ) -> None:
+        async with session_maker() as session:
+            report = await get_service(session).import_file(
+                chunks=get_chunks(IMPORT_CSV),
+                format=ImportFormat.csv,
+                defaults={"user_id": 1, "category_id": 1, "account_id": None},
+                batch_size=2,
+            )
+
+        assert report["created"] == 2
+        assert report["failed"] == 2
+        assert [error["line"] for error in report["errors"]] == [3, 4]
+        assert report["errors"][0]["errors"] == [
+            {"type": "missing_reference", "loc": ["account_id"], "msg": "No record with ID 9"}
+        ]
+        assert report["errors"][1]["errors"][0]["loc"] == ("amount",)
+        assert await get_balances() == {1: 90.0, 2: 105.0}
+
+    async def test_import_integrity_error(
+        self,
+        async_engine: AsyncEngine,
+        session_maker: async_sessionmaker[AsyncSession],
+        get_balances: Callable[[], Awaitable[Any]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # NOTE: A reference deleted after the check, only the database rejects the batch
+        async with async_engine.connect() as connection:
+            await connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+        async def list_missing_references(*args: Any, **kwargs: Any) -> dict[str, set[int]]:
+            return {}
+
+        monkeypatch.setattr(TransactionRepository, "list_missing_references", list_missing_references)
+
+        async with session_maker() as session:
+            report = await get_service(session).import_file(
+                chunks=get_chunks(IMPORT_CSV.replace(b"1,abc", b"1,-4.0")),
+                format=ImportFormat.csv,
+                defaults={"user_id": 1, "category_id": 1},
+                batch_size=2,
+            )
+            count = await session.scalar(select(func.count()).select_from(Transaction))
+
+        # NOTE: The first batch is rolled back as a whole, the second one is still loaded
+        assert report["created"] == 2
+        assert report["failed"] == 2
+        assert report["errors"] == [
+            {
+                "line": line,
+                "errors": [{"type": "integrity_error", "loc": [], "msg": "Batch rejected by the database"}],
+            }
+            for line in (2, 3)
+        ]
+        assert count == 2
+        assert await get_balances() == {1: 96.0, 2: 105.0}
+
+
+class TestTransactionRouter:
+    async def test_partial_update_date(self, client: AsyncClient) -> None:
+        id = (await client.post("/transaction/", json=transaction())).json()["id"]
+        assert await get_report(client) == [{"month": "2024-03-01", "total": -10.0, "count": 1}]
+
+        response = await client.patch(f"/transaction/{id}", json={"date": "2024-04-01"})
+        assert response.status_code == 200
+        assert response.json()["date"] == "2024-04-01"
+        assert await get_report(client) == [{"month": "2024-04-01", "total": -10.0, "count": 1}]
+
+    async def test_search_pagination(self, client: AsyncClient) -> None:
+        for description in ("coffee shop", "coffee coffee coffee", "grocery coffee", "tea"):
+            await client.post("/transaction/", json=transaction(description=description))
+
+        response = await client.get("/transaction/", params={"q": "coffee"})
+        ranked = [item["description"] for item in response.json()["data"]]
+        assert len(ranked) == 3
+        assert ranked[0] == "coffee coffee coffee"
+
+        pages: list[list[str]] = []
+        params: dict[str, Any] = {"q": "coffee", "limit": 2}
+        while True:
+            response = await client.get("/transaction/", params=params)
+            assert response.status_code == 200
+            pages.append([item["description"] for item in response.json()["data"]])
+            if not (cursor := response.json()["pagination"]["next"]):
+                break
+            params["cursor"] = cursor
+        assert pages == [ranked[:2], ranked[2:]]
+
+    async def test_stream_projection_include(self, client: AsyncClient) -> None:
+        await client.post("/transaction/", json=transaction())
+        headers = {"Accept": "application/x-ndjson"}
+
+        response = await client.get("/transaction/", params={"fields": "id,amount"}, headers=headers)
+        assert response.status_code == 200
+        assert [json.loads(line) for line in response.text.splitlines()] == [{"id": 1, "amount": -10.0}]
+
+        response = await client.get("/transaction/", params={"include": "account"}, headers=headers)
+        [line] = [json.loads(line) for line in response.text.splitlines()]
+        assert line["account"]["name"] == "Account 1"
+        assert line["account"]["current_balance"] == 90.0
+        json_response = await client.get("/transaction/", params={"include": "account"})
+        assert json_response.json()["data"][0]["account"]["name"] == "Account 1"
+
+        response = await client.get("/transaction/", params={"include": "user"}, headers=headers)
+        assert response.status_code == 400
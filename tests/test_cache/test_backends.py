@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from utils.cache import LRUCache
+
+
+class TestLRUCache:
+    def test_get_set(self) -> None:
+        cache = LRUCache(maxsize=2)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_ttl(self) -> None:
+        cache = LRUCache(ttl=10)
+        with patch("utils.cache.backends.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl=30)
+        with patch("utils.cache.backends.monotonic", return_value=115.0):
+            assert cache.get("a") is None
+            assert cache.get("b") == 2
+        assert cache.expirations == 1
+
+    def test_delete_and_clear(self) -> None:
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("a", "missing")
+        assert cache.get("a") is None
+        cache.clear()
+        assert cache.get("b") is None
+        assert cache.stats()["size"] == 0
@@ -0,0 +1,114 @@
+from typing import Optional
+
+import pytest
+from sqlalchemy import StaticPool
+from sqlalchemy.exc import MultipleResultsFound, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.cache import Catalog
+from utils.database.models import APIBaseModel
+from utils.database.routing import RoutingSession, reads_from_replica
+
+
+class CatalogModel(APIBaseModel):
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(unique=True)
+    kind: Mapped[str]
+    description: Mapped[Optional[str]]
+
+
+@pytest.mark.anyio
+class TestCatalog:
+    @pytest.fixture(autouse=True)
+    async def setup_class(self, async_session: AsyncSession) -> None:
+        self.session = async_session
+        self.session.add_all(
+            [
+                CatalogModel(id=2, name="Salary", kind="Income"),
+                CatalogModel(id=1, name="Food", kind="Expense"),
+                CatalogModel(id=3, name="Rent", kind="Expense"),
+            ]
+        )
+        await self.session.commit()
+        self.catalog = Catalog(CatalogModel, unique=("id", "name"), grouped=("kind",))
+
+    async def test_lookups(self) -> None:
+        snapshot = await self.catalog.get_snapshot(self.session)
+        assert [entry.id for entry in snapshot.entries] == [1, 2, 3]
+        assert snapshot.get(id=2).name == "Salary"
+        assert snapshot.get(name="Rent").id == 3
+        assert snapshot.get(kind="Income").id == 2
+        assert [entry.id for entry in snapshot.filter(kind="Expense")] == [1, 3]
+        assert [entry.id for entry in snapshot.filter(kind="Expense", name="Rent")] == [3]
+        assert snapshot.filter(kind="Transfer") == ()
+
+        with pytest.raises(NoResultFound):
+            snapshot.get(id=99)
+        with pytest.raises(MultipleResultsFound):
+            snapshot.get(kind="Expense")
+
+    async def test_entries_are_immutable(self) -> None:
+        entry = (await self.catalog.get_snapshot(self.session)).get(id=1)
+        with pytest.raises(AttributeError):
+            entry.name = "Changed"
+
+    async def test_loaded_once_until_invalidated(self) -> None:
+        snapshot = await self.catalog.get_snapshot(self.session)
+        assert await self.catalog.get_snapshot(self.session) is snapshot
+        assert self.catalog.loads == 1
+
+        self.catalog.invalidate()
+        assert await self.catalog.get_snapshot(self.session) is not snapshot
+        assert self.catalog.loads == 2
+
+    async def test_etag_follows_content(self) -> None:
+        snapshot = await self.catalog.get_snapshot(self.session)
+
+        self.catalog.invalidate()
+        assert (await self.catalog.get_snapshot(self.session)).etag == snapshot.etag
+
+        (await self.session.get(CatalogModel, 1)).name = "Groceries"  # type: ignore[union-attr]
+        await self.session.commit()
+        self.catalog.invalidate()
+        updated = await self.catalog.get_snapshot(self.session)
+        assert updated.etag != snapshot.etag
+        assert updated.get(name="Groceries").id == 1
+
+    async def test_max_age(self) -> None:
+        catalog = Catalog(CatalogModel, max_age=0)
+        snapshot = await catalog.get_snapshot(self.session)
+        assert await catalog.get_snapshot(self.session) is not snapshot
+
+    async def test_loaded_from_primary(self) -> None:
+        replica = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        async with replica.begin() as connection:
+            await connection.run_sync(APIBaseModel.metadata.create_all)
+
+        # NOTE: The empty replica stands for one lagging behind the writes
+        async with AsyncSession(
+            bind=self.session.bind, sync_session_class=RoutingSession, replicas=[replica.sync_engine]
+        ) as session:
+            snapshot = await self.catalog.get_snapshot(session)
+            assert [entry.id for entry in snapshot.entries] == [1, 2, 3]
+            assert not reads_from_replica(session)
+        await replica.dispose()
+
+    async def test_get_reloads_on_miss(self) -> None:
+        catalog = Catalog(CatalogModel, min_reload_interval=0)
+        await catalog.get_snapshot(self.session)
+        await self.catalog.get_snapshot(self.session)
+
+        # NOTE: Written by another process, the local version is not bumped
+        self.session.add(CatalogModel(id=4, name="Travel", kind="Expense"))
+        await self.session.commit()
+        assert (await catalog.get(self.session, id=4)).name == "Travel"
+        assert catalog.loads == 2
+        with pytest.raises(NoResultFound):
+            await catalog.get(self.session, id=99)
+        assert catalog.loads == 3
+
+        # NOTE: Snapshots younger than `min_reload_interval` are kept
+        with pytest.raises(NoResultFound):
+            await self.catalog.get(self.session, id=4)
+        assert self.catalog.loads == 1
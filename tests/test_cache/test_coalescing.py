@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from utils.cache import SingleFlight, SingleFlightError, coalesce_requests
+from utils.cache.coalescing import is_coalesced, single_flights
+
+pytestmark = pytest.mark.anyio
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_are_shared(self) -> None:
+        group = SingleFlight(name="test-shared")
+        calls = 0
+
+        async def compute() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(group.do("key", compute) for _ in range(5)))
+        assert calls == 1
+        assert [result for result, _ in results] == [1] * 5
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert group.stats() == {
+            "in_flight": 0,
+            "calls": 1,
+            "coalesced": 4,
+            "coalesced_ratio": 0.8,
+            "failures": 0,
+        }
+        assert single_flights["test-shared"] is group
+
+    async def test_sequential_calls_are_not_shared(self) -> None:
+        group = SingleFlight(name="test-sequential")
+
+        async def compute() -> str:
+            return "value"
+
+        assert await group.do("key", compute) == ("value", False)
+        assert await group.do("key", compute) == ("value", False)
+        assert await group.do("other", compute) == ("value", False)
+        assert len(group) == 0
+
+    async def test_exception_is_shared(self) -> None:
+        group = SingleFlight(name="test-exception")
+
+        async def compute() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(group.do("key", compute) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert group.failures == 1
+
+    async def test_cancelled_call(self) -> None:
+        group = SingleFlight(name="test-cancelled")
+
+        async def compute() -> None:
+            await asyncio.sleep(1)
+
+        leader = asyncio.ensure_future(group.do("key", compute))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(group.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(SingleFlightError):
+            await waiting
+
+
+def test_coalesce_requests() -> None:
+    @coalesce_requests
+    def endpoint() -> None:
+        pass  # pragma: no cover
+
+    assert is_coalesced(endpoint)
+    assert not is_coalesced(test_coalesce_requests)
@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+from utils.cache import CachedResponse, ResponseCache, cache_response, invalidate_responses
+from utils.cache.responses import get_response_cache_policy, response_caches
+
+
+def make_response(body: bytes = b"{}", tags: tuple[str, ...] = ("items",)) -> CachedResponse:
+    return CachedResponse(200, [(b"content-type", b"application/json")], body, tags)
+
+
+class TestResponseCache:
+    def test_get_set(self) -> None:
+        cache = ResponseCache(name="test-get-set")
+        assert cache.get("a") is None
+        response = make_response()
+        assert cache.set("a", response)
+        assert cache.get("a") is response
+        assert cache.bytes == response.size
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_bytes_bound(self) -> None:
+        cache = ResponseCache(name="test-bytes-bound", maxbytes=250, max_entry_bytes=150)
+        cache.set("a", make_response(b"a" * 80))
+        cache.set("b", make_response(b"b" * 80))
+        cache.get("a")
+        cache.set("c", make_response(b"c" * 80))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.bytes <= 250
+        assert cache.evictions == 1
+
+        assert not cache.set("d", make_response(b"d" * 151))
+        assert cache.rejections == 1
+
+    def test_ttl(self) -> None:
+        cache = ResponseCache(name="test-ttl", ttl=10)
+        with patch("utils.cache.responses.monotonic", return_value=100.0):
+            cache.set("a", make_response())
+            cache.set("b", make_response(), ttl=30)
+        with patch("utils.cache.responses.monotonic", return_value=115.0):
+            assert cache.get("a") is None
+            assert cache.get("b") is not None
+        assert cache.expirations == 1
+
+    def test_invalidate(self) -> None:
+        cache = ResponseCache(name="test-invalidate")
+        cache.set("a", make_response(tags=("items",)))
+        cache.set("b", make_response(tags=("items", "owners")))
+        cache.set("c", make_response(tags=("others",)))
+
+        invalidate_responses("owners")
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+        cache.invalidate("items")
+        assert len(cache) == 1
+        assert cache.invalidations == 2
+        assert cache.bytes == cache.get("c").size  # type: ignore[union-attr]
+
+    def test_stale_generation_is_not_stored(self) -> None:
+        cache = ResponseCache(name="test-generation")
+        generation = cache.get_generation(("items",))
+        cache.invalidate("items")
+        assert not cache.set("a", make_response(), generation=generation)
+        assert cache.set("a", make_response(), generation=cache.get_generation(("items",)))
+
+    def test_is_settled(self) -> None:
+        cache = ResponseCache(name="test-settled")
+        cache.invalidate("items")
+        assert cache.is_settled(("items",))
+
+        cache = ResponseCache(name="test-settled", replica_lag=5)
+        with patch("utils.cache.responses.monotonic", return_value=100.0):
+            cache.invalidate("items")
+        with patch("utils.cache.responses.monotonic", return_value=104.0):
+            assert not cache.is_settled(("owners", "items"))
+            assert cache.is_settled(("owners",))
+        with patch("utils.cache.responses.monotonic", return_value=105.0):
+            assert cache.is_settled(("owners", "items"))
+
+    def test_registry(self) -> None:
+        cache = ResponseCache(name="test-registry")
+        assert response_caches["test-registry"] is cache
+
+
+def test_cache_response() -> None:
+    @cache_response(tags=("items",), ttl=5)
+    def endpoint() -> None:
+        pass  # pragma: no cover
+
+    policy = get_response_cache_policy(endpoint)
+    assert policy is not None
+    assert policy.tags == ("items",)
+    assert policy.ttl == 5
+    assert get_response_cache_policy(test_cache_response) is None
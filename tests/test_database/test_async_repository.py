@@ -0,0 +1,278 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event, inspect, select
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from utils.database.async_repository import AsyncBaseRepository
+from utils.database.models import APIBaseModel
+from utils.exceptions.generic import ImproperlyConfigured
+from utils.filters import BaseProjectionManager
+from utils.pagination import LimitOffsetPagination, LimitOffsetSchema
+
+pytestmark = pytest.mark.anyio
+
+
+class AsyncMockModel(APIBaseModel):
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str]
+
+
+class AsyncMockProjectionManager(BaseProjectionManager):
+    model = AsyncMockModel
+
+
+class TestAsyncBaseRepository:
+    @pytest.fixture(autouse=True)
+    def setup_class(self, async_session: AsyncSession) -> None:
+        self.session = async_session
+        self.repository: AsyncBaseRepository[AsyncMockModel] = AsyncBaseRepository(session=async_session)
+        self.repository.model = AsyncMockModel
+
+    async def test_get_model(self) -> None:
+        assert self.repository.get_model() == AsyncMockModel
+
+        self.repository.model = None
+        with pytest.raises(ImproperlyConfigured):
+            self.repository.get_model()
+
+    async def test_create(self) -> None:
+        entity = {"id": 1, "name": "Test"}
+        await self.repository.create(entity=entity)
+
+        created_entity = (await self.session.scalars(select(AsyncMockModel))).first()
+        assert created_entity.id == 1  # type: ignore
+        assert created_entity.name == "Test"  # type: ignore
+
+        with pytest.raises(IntegrityError):
+            await self.repository.create(entity=entity)
+
+    async def test_create_single_statement(self) -> None:
+        statements: list[str] = []
+
+        @event.listens_for(self.session.bind.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            statements.append(statement)
+
+        assert self.repository.uses_fast_create()
+        created_entity = await self.repository.create(entity={"name": "Test"})
+        assert created_entity.id is not None
+        assert created_entity in self.session
+        assert [statement.split()[0] for statement in statements] == ["INSERT"]
+        assert "RETURNING" in statements[0]
+
+    async def test_create_with_create_queryset_override(self) -> None:
+        class UppercaseRepository(AsyncBaseRepository[AsyncMockModel]):
+            model = AsyncMockModel
+
+            def create_queryset(self, *, model: Any, entity: dict[str, Any]) -> AsyncMockModel:
+                return model(**{**entity, "name": entity["name"].upper()})
+
+        repository = UppercaseRepository(session=self.session)
+        assert not repository.uses_fast_create()
+        assert (await repository.create(entity={"id": 1, "name": "Test"})).name == "TEST"
+
+    async def test_retrieve_by_id(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+
+        retrieved_entity = await self.repository.retrieve_by_id(id=1)
+        assert retrieved_entity.id == 1
+        assert retrieved_entity.name == "Test"
+
+        with pytest.raises(NoResultFound):
+            await self.repository.retrieve_by_id(id=999)
+
+    async def test_retrieve(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+
+        retrieved_entity = await self.repository.retrieve(name="Test")
+        assert retrieved_entity.id == 1
+        assert retrieved_entity.name == "Test"
+
+    async def test_list(self) -> None:
+        for id in range(1, 6):
+            await self.repository.create(entity={"id": id, "name": f"Test {id}"})
+
+        assert len(await self.repository.list()) == 5
+        assert [entity.id for entity in await self.repository.list(name="Test 3")] == [3]
+
+    async def test_list_with_filter_manager(self) -> None:
+        filter_manager_mock = MagicMock()
+        filter_manager_mock.filter_queryset.side_effect = lambda query: query
+        filter_manager_mock.order_by_queryset.side_effect = lambda query: query
+        await self.repository.list(filter_manager=filter_manager_mock, name="Test")
+        filter_manager_mock.filter_queryset.assert_called()
+        filter_manager_mock.order_by_queryset.assert_called()
+
+    async def test_list_with_pagination_manager(self) -> None:
+        for id in range(1, 6):
+            await self.repository.create(entity={"id": id, "name": f"Test {id}"})
+
+        pagination_manager = LimitOffsetPagination(schema=LimitOffsetSchema(limit=2, offset=1))
+        results = await self.repository.list(pagination_manager=pagination_manager)
+        assert [entity.id for entity in results] == [2, 3]
+        assert pagination_manager.count == 5
+
+    async def test_projection_manager(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        self.session.expunge_all()
+
+        projection_manager = AsyncMockProjectionManager(fields=["id"])
+
+        [entity] = await self.repository.list(projection_manager=projection_manager)
+        assert inspect(entity).unloaded == {"name"}
+        self.session.expunge_all()
+
+        entity = await self.repository.retrieve_by_id(id=1, projection_manager=projection_manager)
+        assert inspect(entity).unloaded == {"name"}
+
+    async def test_list_validators(self) -> None:
+        self.repository.last_modified_field = "id"  # type: ignore[misc]
+        assert await self.repository.list_validators() == (None, 0)
+
+        for id in range(1, 6):
+            await self.repository.create(entity={"id": id, "name": f"Test {id}"})
+
+        assert await self.repository.list_validators() == (5, 5)
+        assert await self.repository.list_validators(name="Test 3") == (3, 1)
+
+        filter_manager_mock = MagicMock()
+        filter_manager_mock.filter_queryset.side_effect = lambda query: query.where(AsyncMockModel.id < 3)
+        assert await self.repository.list_validators(filter_manager=filter_manager_mock) == (2, 2)
+        filter_manager_mock.order_by_queryset.assert_not_called()
+
+    async def test_stream(self) -> None:
+        for id in range(1, 6):
+            await self.repository.create(entity={"id": id, "name": f"Test {id}"})
+
+        assert [entity.id async for entity in self.repository.stream(chunk_size=2)] == [1, 2, 3, 4, 5]
+        assert [entity.id async for entity in self.repository.stream(name="Test 3")] == [3]
+
+        filter_manager_mock = MagicMock()
+        filter_manager_mock.filter_queryset.side_effect = lambda query: query.filter_by(id=4)
+        filter_manager_mock.order_by_queryset.side_effect = lambda query: query
+        assert [entity.id async for entity in self.repository.stream(filter_manager=filter_manager_mock)] == [
+            4
+        ]
+
+    async def test_update(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+
+        updated_entity = await self.repository.update(id=1, entity={"id": 1, "name": "Test_Updated"})
+        assert updated_entity.name == "Test_Updated"
+
+        with pytest.raises(ValueError, match="ID in the entity does not match the given ID."):
+            await self.repository.update(id=1, entity={"id": 999, "name": "Test_Updated"})
+
+        with pytest.raises(NoResultFound):
+            await self.repository.retrieve(name="Test")
+
+        with pytest.raises(NoResultFound):
+            await self.repository.update(id=999, entity={"name": "Missing"})
+
+    async def test_update_single_statement(self) -> None:
+        instance = await self.repository.create(entity={"id": 1, "name": "Test"})
+        statements: list[str] = []
+
+        @event.listens_for(self.session.bind.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            statements.append(statement)
+
+        updated_entity = await self.repository.update(id=1, entity={"name": "Test_Updated"})
+        assert updated_entity is instance
+        assert instance.name == "Test_Updated"
+        assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+        assert "RETURNING" in statements[0]
+
+        # Nothing to update, the entity is read as is
+        assert (await self.repository.update(id=1, entity={"id": 1})).name == "Test_Updated"
+
+    async def test_destroy(self) -> None:
+        self.session.add(AsyncMockModel(id=4, name="Test"))
+        await self.session.commit()
+
+        await self.repository.destroy(id=4)
+
+        destroyed_entity = (await self.session.scalars(select(AsyncMockModel).filter_by(id=4))).first()
+        assert destroyed_entity is None
+
+        with pytest.raises(NoResultFound):
+            await self.repository.destroy(id=4)
+
+    async def test_destroy_single_statement(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        statements: list[str] = []
+
+        @event.listens_for(self.session.bind.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            statements.append(statement)
+
+        assert self.repository.uses_fast_destroy()
+        await self.repository.destroy(id=1)
+        assert [statement.split()[0] for statement in statements] == ["DELETE"]
+        assert "RETURNING" in statements[0]
+
+    async def test_destroy_with_perform_destroy_override(self) -> None:
+        class SoftDeleteRepository(AsyncBaseRepository[AsyncMockModel]):
+            model = AsyncMockModel
+
+            async def perform_destroy(self, instance: AsyncMockModel) -> None:
+                instance.name = "Deleted"
+
+        repository = SoftDeleteRepository(session=self.session)
+        await repository.create(entity={"id": 1, "name": "Test"})
+        assert not repository.uses_fast_destroy()
+
+        await repository.destroy(id=1)
+        assert (await repository.retrieve_by_id(id=1)).name == "Deleted"
+
+    async def test_perform_commit(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        await self.repository.perform_commit()
+        assert not self.session.in_transaction()
+
+    async def test_bulk_create(self) -> None:
+        assert await self.repository.bulk_create(entities=[]) == []
+
+        entities = [{"id": 1, "name": "First"}, {"id": 2, "name": "Second"}]
+        assert await self.repository.bulk_create(entities=entities) == entities
+        assert len(await self.repository.list()) == 2
+
+        with pytest.raises(IntegrityError):
+            await self.repository.bulk_create(entities=[{"id": 1, "name": "Duplicated"}])
+
+    async def test_bulk_update(self) -> None:
+        await self.repository.bulk_create(entities=[{"id": 1, "name": "First"}, {"id": 2, "name": "Second"}])
+
+        rows = await self.repository.bulk_update(
+            entities=[{"id": 2, "name": "Two"}, {"id": 1, "name": "One"}]
+        )
+        assert rows == [{"id": 2, "name": "Two"}, {"id": 1, "name": "One"}]
+
+        with pytest.raises(ValueError, match="Every entity must provide its ID."):
+            await self.repository.bulk_update(entities=[{"name": "Missing ID"}])
+
+        with pytest.raises(NoResultFound):
+            await self.repository.bulk_update(entities=[{"id": 999, "name": "Missing"}])
+
+    async def test_bulk_update_without_multi_rowcount(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # NOTE: Like asyncpg, the rowcount of an `executemany` is not reported so no `StaleDataError`
+        monkeypatch.setattr(self.session.bind.dialect, "supports_sane_multi_rowcount", False)
+        await self.repository.bulk_create(entities=[{"id": 1, "name": "First"}])
+
+        with pytest.raises(NoResultFound):
+            await self.repository.bulk_update(
+                entities=[{"id": 1, "name": "One"}, {"id": 999, "name": "Missing"}]
+            )
+
+    async def test_bulk_destroy(self) -> None:
+        await self.repository.bulk_create(entities=[{"id": id, "name": f"Test {id}"} for id in range(1, 4)])
+
+        assert sorted(await self.repository.bulk_destroy(ids=[1, 2])) == [1, 2]
+        assert [entity.id for entity in await self.repository.list()] == [3]
+
+        with pytest.raises(NoResultFound):
+            await self.repository.bulk_destroy(ids=[3, 999])
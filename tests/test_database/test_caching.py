@@ -0,0 +1,134 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from utils.cache import LRUCache
+from utils.database.async_repository import AsyncBaseRepository
+from utils.database.caching import AsyncEntityCacheMixin, EntityCacheMixin, entity_caches
+from utils.database.models import APIBaseModel
+from utils.database.repository import BaseRepository
+from utils.database.routing import RoutingSession, use_primary
+
+
+class CachedModel(APIBaseModel):
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+class CachedRepository(EntityCacheMixin, BaseRepository[CachedModel]):
+    model = CachedModel
+    cache = LRUCache(maxsize=10, ttl=60)
+
+
+class AsyncCachedRepository(AsyncEntityCacheMixin, AsyncBaseRepository[CachedModel]):
+    model = CachedModel
+    cache = LRUCache(maxsize=10, ttl=60)
+
+
+@pytest.mark.anyio
+class TestAsyncEntityCacheMixin:
+    @pytest.fixture(autouse=True)
+    def setup_class(self, async_session: AsyncSession) -> None:
+        self.session = async_session
+        self.repository = AsyncCachedRepository(session=async_session)
+        self.cache = AsyncCachedRepository.cache
+        self.cache.clear()
+        self.statements: list[str] = []
+
+        @event.listens_for(async_session.bind.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            self.statements.append(statement.split()[0])
+
+    async def test_read_through(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        await self.session.commit()
+        self.session.expunge_all()
+        self.statements.clear()
+
+        assert (await self.repository.retrieve_by_id(id=1)).name == "Test"
+        assert self.statements == ["SELECT"]
+        self.session.expunge_all()
+
+        entity = await self.repository.retrieve_by_id(id=1)
+        assert entity.name == "Test"
+        assert entity in self.session
+        assert self.statements == ["SELECT"]
+        assert self.cache.hits == 1
+
+    async def test_invalidated_by_writes(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        await self.repository.retrieve_by_id(id=1)
+        assert len(self.cache) == 1
+
+        await self.repository.update(id=1, entity={"name": "Updated"})
+        assert len(self.cache) == 0
+        await self.session.commit()
+        self.session.expunge_all()
+        assert (await self.repository.retrieve_by_id(id=1)).name == "Updated"
+
+        await self.repository.bulk_update(entities=[{"id": 1, "name": "Bulk"}])
+        assert len(self.cache) == 0
+        await self.repository.retrieve_by_id(id=1)
+
+        await self.repository.destroy(id=1)
+        assert len(self.cache) == 0
+        with pytest.raises(NoResultFound):
+            await self.repository.retrieve_by_id(id=1)
+
+    async def test_invalidated_after_commit(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        await self.session.commit()
+        await self.repository.update(id=1, entity={"name": "Updated"})
+
+        # NOTE: A concurrent request caching the value before the commit
+        self.cache.set(self.repository.get_cache_key(1), {"id": 1, "name": "Test"})
+        await self.session.commit()
+        assert len(self.cache) == 0
+
+    async def test_include_bypasses_cache(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        self.session.expunge_all()
+        await self.repository.retrieve_by_id(id=1, include=[])
+        assert len(self.cache) == 1
+        assert not self.repository.use_cache(["account"])
+
+    async def test_replica_reads_not_cached(self) -> None:
+        await self.repository.create(entity={"id": 1, "name": "Test"})
+        await self.session.commit()
+
+        engine = self.session.bind
+        async with AsyncSession(
+            bind=engine, sync_session_class=RoutingSession, replicas=[engine.sync_engine]
+        ) as session:
+            repository = AsyncCachedRepository(session=session)
+            assert (await repository.retrieve_by_id(id=1)).name == "Test"
+            assert len(self.cache) == 0
+
+            use_primary(session)
+            session.expunge_all()
+            await repository.retrieve_by_id(id=1)
+            assert len(self.cache) == 1
+
+    async def test_registered_for_monitoring(self) -> None:
+        assert entity_caches["AsyncCachedRepository"] is AsyncCachedRepository.cache
+        assert entity_caches["CachedRepository"] is CachedRepository.cache
+
+
+def test_sync_entity_cache(session: Session) -> None:
+    repository = CachedRepository(session=session)
+    repository.create(entity={"id": 900, "name": "Test"})
+    session.commit()
+    session.expunge_all()
+
+    assert repository.retrieve_by_id(id=900).name == "Test"
+    session.expunge_all()
+    assert repository.retrieve_by_id(id=900).name == "Test"
+    assert CachedRepository.cache.hits == 1
+
+    repository.bulk_destroy(ids=[900])
+    session.commit()
+    assert len(CachedRepository.cache) == 0
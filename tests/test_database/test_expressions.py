@@ -0,0 +1,32 @@
+from datetime import date
+
+from sqlalchemy import Column, Date, Integer, create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from utils.database.expressions import MonthStart
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class SampleModel(Base):
+    __tablename__ = "sample_dated"
+    id = Column(Integer, primary_key=True)
+    day = Column(Date)
+
+
+class TestMonthStart:
+    def test_month_start(self) -> None:
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all([SampleModel(day=date(2024, 12, 24)), SampleModel(day=date(2024, 2, 1))])
+            session.flush()
+            query = select(MonthStart(SampleModel.day)).order_by(SampleModel.id)
+            assert list(session.scalars(query)) == [date(2024, 12, 1), date(2024, 2, 1)]
+
+    def test_month_start_postgresql(self) -> None:
+        statement = select(MonthStart(SampleModel.day)).compile(dialect=postgresql.dialect())
+        assert "CAST(date_trunc('month', sample_dated.day) AS DATE)" in str(statement)
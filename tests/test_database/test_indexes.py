@@ -0,0 +1,86 @@
+from typing import Optional
+
+from fastapi import Query
+from sqlalchemy import Column, Date, Index, Integer, String
+from sqlalchemy.orm import DeclarativeBase
+
+from utils.database.indexes import IndexAdvice, advise_indexes, get_table_indexes
+from utils.database.search import install_text_search
+from utils.filters import BaseFilterManager, CommaSeparated, FilterSchema
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class SampleModel(Base):
+    __tablename__ = "sample_indexed"
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer)
+    kind = Column(String)
+    title = Column(String)
+    code = Column(String, unique=True)
+    day = Column(Date)
+
+
+Index("ix_sample_owner_id_day", SampleModel.owner_id, SampleModel.day.desc(), SampleModel.id)
+Index("ix_sample_day_brin", SampleModel.day, postgresql_using="brin")
+install_text_search(SampleModel.__table__, "title")  # type: ignore[arg-type]
+
+
+class SampleFilterSchema(FilterSchema):
+    owner_id__in: Optional[CommaSeparated[int]] = Query(None)
+    day__gte: Optional[int] = Query(None)
+    code__eq: Optional[str] = Query(None)
+    title__icontains: Optional[str] = Query(None)
+    title__isnull: Optional[bool] = Query(None)
+    kind__ieq: Optional[str] = Query(None)
+    kind__not_in: Optional[CommaSeparated[str]] = Query(None)
+
+
+class SampleFilterManager(BaseFilterManager):
+    model = SampleModel
+    search_fields = ("title", "kind")
+    ordering_fields = ("-day", "title")
+
+
+class TestIndexAdvisor:
+    def test_get_table_indexes(self) -> None:
+        table = SampleModel.__table__
+        indexes = {index.name: index for index in get_table_indexes(table)}  # type: ignore[arg-type]
+
+        assert indexes["ix_sample_owner_id_day"].columns == ("owner_id", "day", "id")
+        assert indexes["ix_sample_day_brin"].method == "brin"
+        assert indexes[None].columns == ("code",)
+
+    def test_advise_indexes(self) -> None:
+        advice = advise_indexes(SampleFilterManager, SampleFilterSchema)
+
+        assert advice == [
+            # B-tree indexes only serve their leading column, search indexes do not serve `IS NULL`
+            IndexAdvice("sample_indexed", "title", "filter", "title__isnull"),
+            IndexAdvice("sample_indexed", "kind", "filter", "kind__ieq"),
+            IndexAdvice("sample_indexed", "kind", "search", "kind"),
+            # `(owner_id, day, id)` only serves `-day` once filtered by `owner_id__in`, BRIN never sorts
+            IndexAdvice("sample_indexed", "day", "ordering", "-day"),
+            IndexAdvice("sample_indexed", "day", "ordering", "-day", "code__eq"),
+            IndexAdvice("sample_indexed", "title", "ordering", "title"),
+            IndexAdvice("sample_indexed", "title", "ordering", "title", "owner_id__in"),
+            IndexAdvice("sample_indexed", "title", "ordering", "title", "code__eq"),
+        ]
+        assert str(advice[0]) == "sample_indexed.title: no index supports the filter `title__isnull`"
+        assert str(advice[4]) == (
+            "sample_indexed.day: no index supports the ordering `-day` filtered by `code__eq`"
+        )
+
+    def test_advise_indexes_unfiltered_ordering(self) -> None:
+        class DayFilterManager(SampleFilterManager):
+            ordering_fields = ("-day",)
+
+        index = Index("ix_sample_day_id", SampleModel.day.desc(), SampleModel.id)
+        try:
+            # NOTE: Served unfiltered, and so whatever the filter
+            advice = advise_indexes(DayFilterManager, SampleFilterSchema)
+            assert [item for item in advice if item.usage == "ordering"] == []
+        finally:
+            SampleModel.__table__.indexes.remove(index)  # type: ignore[attr-defined]
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import ForeignKey, create_engine, inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    joinedload,
+    mapped_column,
+    relationship,
+    selectinload,
+)
+
+from utils.database.repository import BaseRepository
+from utils.exceptions.client import BadRequestException
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Parent(Base):
+    __tablename__ = "loading_parent"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    children: Mapped[list["Child"]] = relationship(back_populates="parent")
+
+
+class Child(Base):
+    __tablename__ = "loading_child"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("loading_parent.id"))
+    parent: Mapped[Parent] = relationship(back_populates="children")
+
+
+class ChildRepository(BaseRepository[Child]):
+    model = Child
+    include_options = {"parent": joinedload(Child.parent)}
+
+
+class StrictParentRepository(BaseRepository[Parent]):
+    model = Parent
+    load_options = (selectinload(Parent.children),)
+    strict_loading = True
+
+
+class TestLoadOptionsMixin:
+    @pytest.fixture(autouse=True)
+    def setup_class(self) -> None:
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        self.session = Session(engine)
+        self.session.add_all([Parent(id=1), Child(id=1, parent_id=1), Child(id=2, parent_id=1)])
+        self.session.commit()
+        self.session.expunge_all()
+
+    def test_include(self) -> None:
+        repository = ChildRepository(session=self.session)
+
+        [child, _] = repository.list()
+        assert "parent" in inspect(child).unloaded
+        self.session.expunge_all()
+
+        [child, _] = repository.list(include=["parent"])
+        assert "parent" not in inspect(child).unloaded
+        self.session.expunge_all()
+
+        child = repository.retrieve_by_id(id=2, include=["parent"])
+        assert child.parent.id == 1
+
+        with pytest.raises(BadRequestException):
+            repository.list(include=["parent,siblings"])
+
+    def test_strict_loading(self) -> None:
+        repository = StrictParentRepository(session=self.session)
+
+        parent = repository.retrieve_by_id(id=1)
+        assert [child.id for child in parent.children] == [1, 2]
+
+        with pytest.raises(InvalidRequestError):
+            parent.children[0].parent  # noqa: B018
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+
+from utils.database.pool import InstrumentedQueuePool, PoolMetrics
+
+
+class TestPoolMetrics:
+    def test_snapshot(self, tmp_path: Path) -> None:
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.01,
+        )
+        metrics = PoolMetrics()
+        metrics.attach(engine)
+
+        with engine.connect() as first, engine.connect():
+            first.execute(text("SELECT 1"))
+            snapshot = metrics.snapshot(engine.pool)
+            assert snapshot["in_use"] == 2
+            assert snapshot["overflow"] == 1
+
+            with pytest.raises(TimeoutError):
+                engine.connect()
+            first.invalidate()
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["pool"] == "InstrumentedQueuePool"
+        assert snapshot["connects"] == 2
+        assert snapshot["checkouts"] == 2
+        assert snapshot["checkins"] == 2
+        assert snapshot["invalidations"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["in_use"] == 0
+        assert snapshot["wait_seconds_max"] >= 0.01
+
+    def test_recreate(self) -> None:
+        engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool)
+        metrics = PoolMetrics()
+        metrics.attach(engine)
+
+        engine.dispose()
+        with engine.connect():
+            pass
+        assert engine.pool.metrics is metrics  # type: ignore[attr-defined]
+        assert metrics.snapshot(engine.pool)["checkouts"] == 1
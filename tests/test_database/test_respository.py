@@ -1,12 +1,14 @@
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, NoResultFound, SQLAlchemyError
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
 from utils.database.models import APIBaseModel
 from utils.database.repository import BaseRepository
 from utils.exceptions.generic import ImproperlyConfigured
+from utils.pagination import LimitOffsetPagination, LimitOffsetSchema
 
 
 class MockModel(APIBaseModel):
@@ -91,16 +93,49 @@ class TestBaseRepository:
 
     def test_list_with_filter_manager(self) -> None:
         filter_manager_mock = MagicMock()
-        self.repository.get_base_query = MagicMock()
+        filter_manager_mock.filter_queryset.side_effect = lambda query: query
+        filter_manager_mock.order_by_queryset.side_effect = lambda query: query
         self.repository.list(filter_manager=filter_manager_mock, name="Test")
         filter_manager_mock.filter_queryset.assert_called()  # type: ignore
         filter_manager_mock.order_by_queryset.assert_called()  # type: ignore
 
     def test_list_with_pagination_manager(self) -> None:
-        pagination_manager_mock = MagicMock()
-        self.repository.get_base_query = MagicMock()
-        self.repository.list(pagination_manager=pagination_manager_mock, name="Test")
-        pagination_manager_mock.paginate_queryset.assert_called()  # type: ignore
+        for id in range(501, 506):
+            self.repository.create(entity={"id": id, "name": "Paginated"})
+
+        pagination_manager = LimitOffsetPagination(schema=LimitOffsetSchema(limit=2, offset=1))
+        results = self.repository.list(pagination_manager=pagination_manager, name="Paginated")
+        assert [entity.id for entity in results] == [502, 503]
+        assert pagination_manager.count == 5
+
+    def test_legacy_query_override(self) -> None:
+        class LegacyRepository(BaseRepository[MockModel]):
+            model = MockModel
+
+            def list_queryset(self, base_query: Any, **filters: Any) -> Any:
+                return self.session.query(MockModel).filter(MockModel.id > 601)
+
+        for id in range(601, 604):
+            self.repository.create(entity={"id": id, "name": f"Legacy {id}"})
+
+        with pytest.warns(DeprecationWarning, match="legacy `Query`"):
+            results = LegacyRepository(session=self.session).list()
+        assert [entity.id for entity in results] == [602, 603]
+
+    def test_list_validators(self) -> None:
+        self.repository.last_modified_field = "id"  # type: ignore[misc]
+        for id in range(701, 704):
+            self.repository.create(entity={"id": id, "name": "Validated"})
+
+        assert self.repository.list_validators(name="Validated") == (703, 3)
+        assert self.repository.list_validators(name="Missing") == (None, 0)
+
+    def test_stream(self) -> None:
+        self.repository.bulk_create(entities=[{"id": id, "name": f"Stream {id}"} for id in range(401, 406)])
+
+        stream = self.repository.stream(chunk_size=2)
+        assert [entity.id for entity in stream if entity.id > 400] == [401, 402, 403, 404, 405]
+        assert [entity.id for entity in self.repository.stream(name="Stream 403")] == [403]
 
     def test_perform_commit(self) -> None:
         session_mock = MagicMock()
@@ -111,3 +146,44 @@ class TestBaseRepository:
     def test_update_raises_value_error_on_mismatched_id(self) -> None:
         with pytest.raises(ValueError, match="ID in the entity does not match the given ID."):
             self.repository.update(id=1, entity={"id": 2})
+
+    def test_bulk_create(self) -> None:
+        assert self.repository.bulk_create(entities=[]) == []
+
+        rows = self.repository.bulk_create(
+            entities=[{"id": 101, "name": "First"}, {"id": 102, "name": "Second"}]
+        )
+        assert rows == [{"id": 101, "name": "First"}, {"id": 102, "name": "Second"}]
+        assert self.session.query(MockModel).filter(MockModel.id.in_([101, 102])).count() == 2
+
+        with pytest.raises(IntegrityError):
+            self.repository.bulk_create(entities=[{"id": 101, "name": "Duplicated"}])
+
+    def test_bulk_update(self) -> None:
+        self.repository.bulk_create(entities=[{"id": 201, "name": "First"}, {"id": 202, "name": "Second"}])
+
+        rows = self.repository.bulk_update(entities=[{"id": 202, "name": "Two"}, {"id": 201, "name": "One"}])
+        assert rows == [{"id": 202, "name": "Two"}, {"id": 201, "name": "One"}]
+
+        with pytest.raises(ValueError, match="Every entity must provide its ID."):
+            self.repository.bulk_update(entities=[{"name": "Missing ID"}])
+
+        with pytest.raises(NoResultFound):
+            self.repository.bulk_update(entities=[{"id": 201, "name": "One"}, {"id": 999, "name": "Missing"}])
+
+    def test_bulk_update_without_multi_rowcount(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # NOTE: Like asyncpg, the rowcount of an `executemany` is not reported so no `StaleDataError`
+        monkeypatch.setattr(self.session.get_bind().dialect, "supports_sane_multi_rowcount", False)
+        self.repository.bulk_create(entities=[{"id": 211, "name": "First"}])
+
+        with pytest.raises(NoResultFound):
+            self.repository.bulk_update(entities=[{"id": 211, "name": "One"}, {"id": 999, "name": "Missing"}])
+
+    def test_bulk_destroy(self) -> None:
+        self.repository.bulk_create(entities=[{"id": id, "name": f"Test {id}"} for id in range(301, 304)])
+
+        assert sorted(self.repository.bulk_destroy(ids=[301, 302])) == [301, 302]
+        assert [entity.id for entity in self.session.query(MockModel).filter(MockModel.id > 300)] == [303]
+
+        with pytest.raises(NoResultFound):
+            self.repository.bulk_destroy(ids=[303, 999])
@@ -0,0 +1,104 @@
+from typing import Generator
+
+import pytest
+from sqlalchemy import Engine, StaticPool, create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from utils.database.routing import (
+    USE_PRIMARY,
+    RoutingSession,
+    reads_from_replica,
+    set_read_only_transactions,
+    use_primary,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class RoutedModel(Base):
+    __tablename__ = "routed"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+def create_database(name: str) -> Engine:
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(RoutedModel.__table__.insert(), {"id": 1, "name": name})
+    return engine
+
+
+class TestRoutingSession:
+    @pytest.fixture(autouse=True)
+    def setup_class(self) -> Generator[None, None, None]:
+        self.primary = create_database("primary")
+        self.replica = create_database("replica")
+        yield
+        self.primary.dispose()
+        self.replica.dispose()
+
+    def test_reads_go_to_replica(self) -> None:
+        with RoutingSession(bind=self.primary, replicas=[self.replica]) as session:
+            assert session.scalar(select(RoutedModel.name)) == "replica"
+            assert session.get_bind(clause=select(RoutedModel)) is self.replica
+            assert USE_PRIMARY not in session.info
+
+            # NOTE: Locking reads precede a write, hence the session sticks to the primary from then on
+            assert session.get_bind(clause=select(RoutedModel).with_for_update()) is self.primary
+            assert session.get_bind(clause=select(RoutedModel)) is self.primary
+
+    def test_writes_go_to_primary_and_stick(self) -> None:
+        with RoutingSession(bind=self.primary, replicas=[self.replica]) as session:
+            session.add(RoutedModel(id=2, name="new"))
+            session.flush()
+            assert session.info[USE_PRIMARY]
+            assert session.scalars(select(RoutedModel.name).order_by(RoutedModel.id)).all() == [
+                "primary",
+                "new",
+            ]
+            session.commit()
+
+        with self.replica.connect() as connection:
+            assert connection.scalar(text("SELECT count(*) FROM routed")) == 1
+
+    def test_use_primary(self) -> None:
+        with RoutingSession(bind=self.primary, replicas=[self.replica]) as session:
+            assert reads_from_replica(session)
+            use_primary(session)
+            assert not reads_from_replica(session)
+            assert session.scalar(select(RoutedModel.name)) == "primary"
+
+    def test_without_replicas(self) -> None:
+        with RoutingSession(bind=self.primary) as session:
+            assert not reads_from_replica(session)
+            assert session.scalar(select(RoutedModel.name)) == "primary"
+
+    @pytest.mark.anyio
+    async def test_async_session(self) -> None:
+        primary = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        replica = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        for engine, name in ((primary, "primary"), (replica, "replica")):
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                await connection.execute(RoutedModel.__table__.insert(), {"id": 1, "name": name})
+
+        async with AsyncSession(
+            bind=primary, sync_session_class=RoutingSession, replicas=[replica.sync_engine]
+        ) as session:
+            assert await session.scalar(select(RoutedModel.name)) == "replica"
+            use_primary(session)
+            assert await session.scalar(select(RoutedModel.name)) == "primary"
+
+        await primary.dispose()
+        await replica.dispose()
+
+
+def test_set_read_only_transactions() -> None:
+    engine = create_engine("sqlite:///:memory:")
+    set_read_only_transactions(engine)
+    with engine.begin() as connection:
+        assert connection.scalar(text("SELECT 1")) == 1
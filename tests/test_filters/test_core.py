@@ -1,12 +1,14 @@
-from typing import Optional
+from typing import Any, Optional
 
 import pytest
 from fastapi import Query
-from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy import Column, Integer, String, create_engine, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
+from utils.database.search import install_text_search
 from utils.filters.core import BaseFilterManager
-from utils.filters.schemas import FilterSchema
+from utils.filters.schemas import CommaSeparated, CommaSeparatedRange, FilterSchema
 
 
 class Base(DeclarativeBase):
@@ -22,6 +24,33 @@ class SampleModel(Base):
 
 class SampleFilterSchema(FilterSchema):
     name__icontains: Optional[str] = Query(None)
+    age__gte: Optional[int] = Query(None)
+
+
+class SampleListFilterSchema(FilterSchema):
+    id__in: Optional[CommaSeparated[int]] = Query(None)
+    id__not_in: Optional[CommaSeparated[int]] = Query(None)
+    age__range: Optional[CommaSeparatedRange[int]] = Query(None)
+    name__isnull: Optional[bool] = Query(None)
+    name__startswith: Optional[str] = Query(None)
+
+
+class SampleSearchModel(Base):
+    __tablename__ = "sample_search"
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+
+
+install_text_search(SampleSearchModel.__table__, "title")  # type: ignore[arg-type]
+
+
+class SampleSearchFilterSchema(FilterSchema):
+    title__search: Optional[str] = Query(None)
+
+
+class SampleSearchFilterManager(BaseFilterManager):
+    model = SampleSearchModel
+    search_fields = ("title",)
 
 
 @pytest.fixture
@@ -51,6 +80,67 @@ class TestBaseFilterManager:
         filter_is_empty_query = filter_manager.filter_queryset(query)  # type: ignore[arg-type]
         assert filter_is_empty_query == query
 
+    def test_filter_plan_is_cached(self, sample_session: Session) -> None:
+        class SampleFilterManager(BaseFilterManager):
+            model = SampleModel
+
+        sample_session.add_all([SampleModel(name="test", age=20), SampleModel(name="other", age=40)])
+        sample_session.flush()
+
+        first = SampleFilterManager(filters=SampleFilterSchema(name__icontains="ES", age__gte=10))
+        second = SampleFilterManager(filters=SampleFilterSchema(name__icontains="th", age__gte=30))
+        plan = first.get_filter_plan()
+        assert set(plan) == {"name__icontains", "age__gte"}
+        assert plan["age__gte"].column is SampleModel.age
+        assert second.get_filter_plan() is plan
+
+        first_query = first.filter_queryset(sample_session.query(SampleModel))  # type: ignore[arg-type]
+        second_query = second.filter_queryset(sample_session.query(SampleModel))  # type: ignore[arg-type]
+        # Same SQL, only the bound parameters change
+        assert str(first_query) == str(second_query)
+        assert [entity.name for entity in first_query] == ["test"]
+        assert [entity.name for entity in second_query] == ["other"]
+
+    def test_list_lookups(self, sample_session: Session) -> None:
+        class SampleFilterManager(BaseFilterManager):
+            model = SampleModel
+
+        sample_session.add_all(
+            [
+                SampleModel(id=1, name="test_a", age=20),
+                SampleModel(id=2, name="testing", age=30),
+                SampleModel(id=3, name=None, age=40),
+            ]
+        )
+        sample_session.flush()
+
+        def filter_ids(**filters: Any) -> list[int]:
+            filter_manager = SampleFilterManager(filters=SampleListFilterSchema(**filters))
+            query = filter_manager.filter_queryset(select(SampleModel.id).order_by(SampleModel.id))
+            return list(sample_session.scalars(query))
+
+        assert filter_ids(id__in="1,3") == [1, 3]
+        assert filter_ids(id__in=["2"]) == [2]
+        assert filter_ids(id__not_in="1, 2") == [3]
+        assert filter_ids(age__range="20,30") == [1, 2]
+        assert filter_ids(name__isnull=True) == [3]
+        assert filter_ids(name__isnull=False) == [1, 2]
+        assert filter_ids(name__startswith="test") == [1, 2]
+        # NOTE: Wildcards in the value are escaped, `_` is matched literally
+        assert filter_ids(name__startswith="test_") == [1]
+
+    def test_in_lookup_statement_is_cached(self) -> None:
+        class SampleFilterManager(BaseFilterManager):
+            model = SampleModel
+
+        def compile_query(ids: str) -> str:
+            filter_manager = SampleFilterManager(filters=SampleListFilterSchema(id__in=ids))
+            return str(filter_manager.filter_queryset(select(SampleModel)))
+
+        # Same SQL whatever the number of values, they are sent as one expanding parameter
+        assert compile_query("1") == compile_query("1,2,3")
+        assert "POSTCOMPILE" in compile_query("1")
+
     def test_order_by_queryset(self, sample_session: Session) -> None:
         filter_manager = BaseFilterManager(filters=FilterSchema(), ordering=["-name", "+age", "id"])
         filter_manager.model = SampleModel
@@ -64,3 +154,58 @@ class TestBaseFilterManager:
         filter_manager.ordering = None
         query_without_ordering = filter_manager.order_by_queryset(query)  # type: ignore[arg-type]
         assert query_without_ordering == query
+
+    def test_search(self, sample_session: Session) -> None:
+        sample_session.add_all(
+            [
+                SampleSearchModel(id=1, title="Coffee at the station"),
+                SampleSearchModel(id=2, title="Groceries"),
+                SampleSearchModel(id=3, title="COFFEE beans, coffee filters"),
+                SampleSearchModel(id=4, title=None),
+            ]
+        )
+        sample_session.flush()
+
+        def search_ids(search: Optional[str] = None, **filters: Any) -> list[int]:
+            filter_manager = SampleSearchFilterManager(
+                filters=SampleSearchFilterSchema(**filters), search=search
+            )
+            query = filter_manager.order_by_queryset(
+                filter_manager.filter_queryset(select(SampleSearchModel.id))
+            )
+            return list(sample_session.scalars(query))
+
+        # Case insensitive substrings of every word, the best match first
+        assert search_ids("coffee") == [3, 1]
+        assert search_ids("offe stat") == [1]
+        assert search_ids(title__search="grocer") == [2]
+        # Quotes and FTS5 operators are matched literally
+        assert search_ids('"coffee" OR') == []
+        # Words too short for the index fall back to a scan
+        assert search_ids("gr") == [2]
+        assert search_ids("  ") == [1, 2, 3, 4]
+
+        # The index follows the table
+        sample_session.execute(
+            update(SampleSearchModel).where(SampleSearchModel.id == 2).values(title="Coffee")
+        )
+        sample_session.execute(delete(SampleSearchModel).where(SampleSearchModel.id == 1))
+        assert sorted(search_ids("coffee")) == [2, 3]
+        assert search_ids("grocer") == []
+
+    def test_search_statement(self) -> None:
+        def compile_query(search: str, dialect: Any = sqlite.dialect()) -> str:
+            filter_manager = SampleSearchFilterManager(filters=SampleSearchFilterSchema(), search=search)
+            query = filter_manager.order_by_queryset(
+                filter_manager.filter_queryset(select(SampleSearchModel))
+            )
+            return str(query.compile(dialect=dialect))
+
+        # Same SQL whatever the text searched, it is sent as bound parameters
+        assert compile_query("coffee") == compile_query("a b c")
+        assert "sample_search_title_fts MATCH" in compile_query("coffee")
+
+        statement = compile_query("coffee", postgresql.dialect())
+        assert "to_tsvector('simple', coalesce(sample_search.title" in statement
+        assert "websearch_to_tsquery('simple'" in statement
+        assert "similarity(sample_search.title" in statement
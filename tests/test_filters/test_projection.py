@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, inspect, select
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+
+from utils.exceptions.client import BadRequestException
+from utils.filters.projection import BaseProjectionManager
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class SampleModel(Base):
+    __tablename__ = "sample"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    age = Column(Integer)
+
+
+class SampleProjectionManager(BaseProjectionManager):
+    model = SampleModel
+
+
+@pytest.fixture
+def sample_session() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(SampleModel(id=1, name="Sample", age=30))
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+class TestBaseProjectionManager:
+    def test_fields(self) -> None:
+        assert SampleProjectionManager().fields is None
+        assert SampleProjectionManager(fields=[]).fields is None
+        assert SampleProjectionManager(fields=["name, age", "name"]).fields == ["name", "age"]
+
+        with pytest.raises(BadRequestException):
+            SampleProjectionManager(fields=["name,password"])
+
+    def test_project_queryset(self, sample_session: Session) -> None:
+        projection_manager = SampleProjectionManager(fields=["name"])
+        query = sample_session.query(SampleModel)
+        query = projection_manager.project_queryset(query)  # type: ignore[arg-type]
+        assert "age" not in str(query)
+
+        instance = query.one()
+        assert inspect(instance).unloaded == {"age"}
+        assert projection_manager.project_entity(instance) == {"name": "Sample"}
+        assert projection_manager.project_results([instance]) == [{"name": "Sample"}]
+
+    def test_always_loaded(self, sample_session: Session) -> None:
+        class AgedProjectionManager(SampleProjectionManager):
+            always_loaded = ("age",)
+
+        projection_manager = AgedProjectionManager(fields=["name"])
+        instance = sample_session.scalars(projection_manager.project_queryset(select(SampleModel))).one()
+        assert inspect(instance).unloaded == set()
+        assert projection_manager.project_entity(instance) == {"name": "Sample"}
+
+    def test_no_projection(self, sample_session: Session) -> None:
+        projection_manager = SampleProjectionManager()
+        query = sample_session.query(SampleModel)
+        assert projection_manager.project_queryset(query) is query  # type: ignore[arg-type]
+
+        instance = query.one()
+        assert projection_manager.project_entity(instance) is instance
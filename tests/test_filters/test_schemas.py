@@ -1,7 +1,9 @@
+from typing import Optional
+
 import pytest
 from pydantic_core import ValidationError
 
-from utils.filters.schemas import FilterSchema
+from utils.filters.schemas import CommaSeparated, CommaSeparatedRange, FilterSchema
 
 
 class TestFilterSchema:
@@ -12,11 +14,37 @@ class TestFilterSchema:
             FilterSchema(**valid_filters)
 
     def test_invalid_filter_lookups(self) -> None:
-        class SampleFilterSchema(FilterSchema):
-            field__invalid_lookup: int = 10
-
-        invalid_filters = {"field__invalid_lookup": 11}
+        # NOTE: Lookups are compiled when the class is created, so that is where an invalid one fails
         with pytest.raises(
             ValueError, match=r"Filter attribute field__invalid_lookup should be a valid lookup:"
         ):
-            SampleFilterSchema(**invalid_filters)
+
+            class SampleFilterSchema(FilterSchema):
+                field__invalid_lookup: int = 10
+
+    def test_compiled_filter_lookups(self) -> None:
+        class SampleFilterSchema(FilterSchema):
+            field__gt: Optional[int] = None
+            name__icontains: Optional[str] = None
+            plain: Optional[str] = None
+
+        assert SampleFilterSchema.__filter_lookups__ == {
+            "field__gt": ("field", "gt"),
+            "name__icontains": ("name", "icontains"),
+        }
+        assert FilterSchema.__filter_lookups__ == {}
+
+    def test_comma_separated(self) -> None:
+        class SampleFilterSchema(FilterSchema):
+            id__in: Optional[CommaSeparated[int]] = None
+            age__range: Optional[CommaSeparatedRange[int]] = None
+
+        assert SampleFilterSchema(id__in="1, 2,,3").id__in == [1, 2, 3]
+        assert SampleFilterSchema(id__in=[4]).id__in == [4]
+        assert SampleFilterSchema(age__range="10,20").age__range == [10, 20]
+        assert SampleFilterSchema.__filter_lookups__["age__range"] == ("age", "range")
+
+        with pytest.raises(ValidationError):
+            SampleFilterSchema(id__in="1,x")
+        with pytest.raises(ValidationError):
+            SampleFilterSchema(age__range="10")
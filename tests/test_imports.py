@@ -0,0 +1,92 @@
+import io
+from typing import AsyncIterator
+
+import pytest
+
+from utils.imports import ImportParseError, ImportRow, batched, iter_file, iter_lines, parse_csv, parse_ofx
+
+
+async def split(content: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(content), size):
+        yield content[start : start + size]
+
+
+class AsyncBytesIO(io.BytesIO):
+    async def read(self, size: int = -1) -> bytes:  # type: ignore[override]
+        return super().read(size)
+
+
+OFX = b"""OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20241215120000[-5:EST]
+<TRNAMT>-12.50
+<NAME>Shop &amp; Co
+</STMTTRN>
+<STMTTRN><TRNTYPE>XFER<DTPOSTED>20241216<TRNAMT>3.00<MEMO></MEMO></STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+@pytest.mark.anyio
+class TestImports:
+    async def test_iter_file(self) -> None:
+        chunks = [chunk async for chunk in iter_file(AsyncBytesIO(b"abcde"), chunk_size=2)]
+        assert chunks == [b"ab", b"cd", b"e"]
+
+    @pytest.mark.parametrize("size", [1, 3, 1024])
+    async def test_iter_lines(self, size: int) -> None:
+        content = "﻿a,ñ\r\nb\n\nc".encode()
+        lines = [line async for line in iter_lines(split(content, size))]
+        assert lines == ["a,ñ\r\n", "b\n", "\n", "c"]
+
+    @pytest.mark.parametrize("size", [1, 7, 1024])
+    async def test_parse_csv(self, size: int) -> None:
+        content = b'name,amount\r\n"multi\nline, ""quoted""",1.5\r\n\r\nplain,\r\n'
+        rows = [row async for row in parse_csv(split(content, size))]
+        assert rows == [
+            ImportRow(2, {"name": 'multi\nline, "quoted"', "amount": "1.5"}),
+            ImportRow(5, {"name": "plain", "amount": ""}),
+        ]
+
+    async def test_parse_csv_row_length(self) -> None:
+        rows = [row async for row in parse_csv(split(b"name,amount\nshort\nlong,1.5,extra\n", 1024))]
+        assert rows == [ImportRow(2, {"name": "short"}), ImportRow(3, {"name": "long", "amount": "1.5"})]
+
+    async def test_parse_csv_errors(self) -> None:
+        with pytest.raises(ImportParseError) as error:
+            [row async for row in parse_csv(split(b'name\n"open\n', 4))]
+        assert error.value.line == 2
+
+        with pytest.raises(ImportParseError) as error:
+            [row async for row in parse_csv(split(b"name\nok\n\xff\n", 1024))]
+        assert error.value.line == 1
+
+    @pytest.mark.parametrize("size", [1, 5, 64, 4096])
+    async def test_parse_ofx(self, size: int) -> None:
+        rows = [row async for row in parse_ofx(split(OFX, size))]
+        assert rows == [
+            ImportRow(
+                5,
+                {
+                    "TRNTYPE": "DEBIT",
+                    "DTPOSTED": "20241215120000[-5:EST]",
+                    "TRNAMT": "-12.50",
+                    "NAME": "Shop & Co",
+                },
+            ),
+            ImportRow(11, {"TRNTYPE": "XFER", "DTPOSTED": "20241216", "TRNAMT": "3.00"}),
+        ]
+
+    async def test_parse_ofx_unterminated(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("utils.imports.MAX_RECORD_SIZE", 16)
+        with pytest.raises(ImportParseError) as error:
+            [row async for row in parse_ofx(split(b"<OFX>\n<STMTTRN>\n<TRNAMT>1.00\n<NAME>" + b"x" * 32, 8))]
+        assert error.value.line == 2
+
+    async def test_batched(self) -> None:
+        batches = [batch async for batch in batched(split(b"abcde", 1), 2)]
+        assert batches == [[b"a", b"b"], [b"c", b"d"], [b"e"]]
@@ -1,14 +1,23 @@
-from typing import Any, Callable, Coroutine, Dict, Type, Union
+import asyncio
+from typing import Any, Callable, Coroutine, Dict, Optional, Type, Union
 
+import httpx
 import pytest
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError, TimeoutError
+from starlette.datastructures import Headers
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from starlette.testclient import TestClient
 
-from utils.middleware import SQLAlchemyExceptionHandlerMiddleware
+from utils.cache import ResponseCache, SingleFlight, cache_response, coalesce_requests
+from utils.middleware import (
+    RequestCoalescingMiddleware,
+    ResponseCacheMiddleware,
+    SQLAlchemyExceptionHandlerMiddleware,
+    get_cache_control,
+)
 
 
 def raise_no_result_found() -> None:
@@ -137,3 +146,160 @@ class TestSQLAlchemyExceptionHandlerMiddleware:
         response = client.get("/server-error")
         assert response.status_code == 500
         assert response.json() == {"exception": "server-error"}
+
+
+class TestResponseCacheMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup_class(self) -> None:
+        self.calls = 0
+        self.cache = ResponseCache(name="test-middleware", ttl=60)
+        self.test_app = FastAPI()
+        self.test_app.add_middleware(ResponseCacheMiddleware, cache=self.cache, primary_cookie="read_primary")
+
+        @self.test_app.get("/items")
+        @cache_response(tags=("items",))
+        def list_items(
+            limit: int = Query(10), ordering: Optional[list[str]] = Query(None), name: Optional[str] = None
+        ) -> JSONResponse:
+            self.calls += 1
+            return JSONResponse(
+                {"calls": self.calls, "limit": limit, "ordering": ordering}, headers={"ETag": '"items"'}
+            )
+
+        @self.test_app.get("/uncached")
+        def uncached() -> dict[str, int]:
+            self.calls += 1
+            return {"calls": self.calls}
+
+        self.client = TestClient(self.test_app)
+
+    def test_hit(self) -> None:
+        response = self.client.get("/items")
+        assert response.headers["x-cache"] == "MISS"
+        assert response.headers["cache-control"] == "private, max-age=60"
+
+        response = self.client.get("/items")
+        assert response.headers["x-cache"] == "HIT"
+        assert response.headers["age"] == "0"
+        assert response.json()["calls"] == 1
+        assert self.cache.stats()["hit_ratio"] == 0.5
+
+    def test_normalized_query(self) -> None:
+        self.client.get("/items?name=a&ordering=-id&ordering=name")
+        assert self.client.get("/items?ordering=-id&limit=10&ordering=name&name=a&_=1").json()["calls"] == 1
+        # NOTE: The order of a repeated parameter is meaningful
+        assert self.client.get("/items?name=a&ordering=name&ordering=-id").json()["calls"] == 2
+        assert self.client.get("/items?limit=5").json()["calls"] == 3
+
+    def test_user_key(self) -> None:
+        self.client.get("/items")
+        response = self.client.get("/items", headers={"Authorization": "Bearer token"})
+        assert response.json()["calls"] == 2
+
+    def test_request_cache_control(self) -> None:
+        self.client.get("/items")
+        assert self.client.get("/items", headers={"Cache-Control": "no-cache"}).json()["calls"] == 2
+        assert self.client.get("/items").json()["calls"] == 2
+
+        self.client.get("/items?limit=5", headers={"Cache-Control": "no-store"})
+        assert self.client.get("/items?limit=5").json()["calls"] == 4
+        assert self.cache.bypasses == 2
+
+    def test_if_none_match(self) -> None:
+        self.client.get("/items")
+        response = self.client.get("/items", headers={"If-None-Match": '"items"'})
+        assert response.status_code == 304
+        assert response.headers["x-cache"] == "HIT"
+
+    def test_invalidate(self) -> None:
+        self.client.get("/items")
+        self.cache.invalidate("items")
+        assert self.client.get("/items").json()["calls"] == 2
+
+    def test_not_opted_in(self) -> None:
+        self.client.get("/uncached")
+        response = self.client.get("/uncached")
+        assert response.json()["calls"] == 2
+        assert "x-cache" not in response.headers
+
+    def test_primary_cookie(self) -> None:
+        self.client.get("/items")
+        response = self.client.get("/items", headers={"Cookie": "read_primary=1"})
+        assert response.json()["calls"] == 2
+        assert "x-cache" not in response.headers
+        assert self.client.get("/items").json()["calls"] == 1
+        assert self.cache.bypasses == 1
+
+    def test_replica_lag(self) -> None:
+        self.cache.replica_lag = 60
+        self.cache.invalidate("items")
+        self.client.get("/items")
+        assert self.client.get("/items").json()["calls"] == 2
+
+
+@pytest.mark.anyio
+class TestRequestCoalescingMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup_class(self) -> None:
+        self.calls = 0
+        self.single_flight = SingleFlight(name="test-middleware")
+        self.test_app = FastAPI()
+        self.test_app.add_middleware(
+            RequestCoalescingMiddleware,
+            single_flight=self.single_flight,
+            max_body_bytes=100,
+            primary_cookie="read_primary",
+        )
+
+        @self.test_app.get("/items")
+        @coalesce_requests
+        async def list_items(size: int = 1) -> dict[str, Any]:
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return {"calls": self.calls, "data": "x" * size}
+
+        @self.test_app.get("/uncached")
+        async def uncached() -> dict[str, int]:
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return {"calls": self.calls}
+
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.test_app), base_url="http://test"
+        )
+
+    async def get_concurrently(self, url: str, count: int = 5, **kwargs: Any) -> list[httpx.Response]:
+        return await asyncio.gather(*(self.client.get(url, **kwargs) for _ in range(count)))
+
+    async def test_identical_requests_are_coalesced(self) -> None:
+        responses = await self.get_concurrently("/items?size=1&_=1")
+        assert self.calls == 1
+        assert {response.status_code for response in responses} == {200}
+        assert {response.json()["calls"] for response in responses} == {1}
+        assert self.single_flight.coalesced == 4
+
+    async def test_different_requests_are_not_coalesced(self) -> None:
+        await asyncio.gather(self.client.get("/items?size=1"), self.client.get("/items?size=2"))
+        assert self.calls == 2
+
+    async def test_large_responses_are_not_shared(self) -> None:
+        responses = await self.get_concurrently("/items?size=200", count=3)
+        assert self.calls == 3
+        assert {len(response.json()["data"]) for response in responses} == {200}
+
+    async def test_not_opted_in(self) -> None:
+        await self.get_concurrently("/uncached")
+        assert self.calls == 5
+
+    async def test_primary_cookie_is_not_coalesced(self) -> None:
+        await asyncio.gather(
+            self.client.get("/items?size=1"),
+            self.client.get("/items?size=1", headers={"Cookie": "read_primary=1"}),
+        )
+        assert self.calls == 2
+        assert self.single_flight.coalesced == 0
+
+
+def test_get_cache_control() -> None:
+    headers = Headers({"Cache-Control": 'No-Cache, max-age=0, private="x"'})
+    assert get_cache_control(headers) == {"no-cache": None, "max-age": "0", "private": "x"}
@@ -2,10 +2,21 @@ from unittest.mock import MagicMock
 
 import pytest
 from pydantic_core import ValidationError
-from sqlalchemy import Column, Integer, String, create_engine
-from sqlalchemy.orm import DeclarativeBase, Query, sessionmaker
-
-from utils.pagination import LimitOffsetPagination, LimitOffsetSchema, PageNumberPagination, PageNumberSchema
+from sqlalchemy import Column, Integer, String, create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Query, Session, sessionmaker
+
+from utils.exceptions.client import BadRequestException
+from utils.pagination import (
+    BaseOffsetPagination,
+    CountStrategy,
+    KeysetPagination,
+    KeysetSchema,
+    LimitOffsetPagination,
+    LimitOffsetSchema,
+    PageNumberPagination,
+    PageNumberSchema,
+)
 
 
 class Base(DeclarativeBase):
@@ -126,20 +137,19 @@ class TestPageNumberPagination:
 class TestLimitOffsetPagination:
     def test_pagination(self) -> None:
         mock_query = MagicMock()
+        mock_query.add_columns.return_value = mock_query
         mock_query.offset.return_value = mock_query
         mock_query.limit.return_value = mock_query
-        mock_query.count.return_value = 10
 
         schema = LimitOffsetSchema(limit=4, offset=8)
         paginator = LimitOffsetPagination(schema=schema)
 
         _ = paginator.paginate_queryset(mock_query)
 
+        mock_query.add_columns.assert_called_once()
         mock_query.offset.assert_called_once_with(8)
         mock_query.limit.assert_called_once_with(4)
-        mock_query.count.assert_called_once()
-
-        assert paginator.count == 10
+        mock_query.count.assert_not_called()
 
     def test_paginated_response_data(self) -> None:
         schema = LimitOffsetSchema(limit=4, offset=8)
@@ -168,6 +178,14 @@ class TestLimitOffsetPagination:
         assert props["limit"] == 10
         assert props["offset"] == 10
 
+    def test_paginate_sequence(self) -> None:
+        paginator = LimitOffsetPagination(schema=LimitOffsetSchema(limit=2, offset=1))
+        assert paginator.paginate_sequence((1, 2, 3, 4)) == [2, 3]
+        assert paginator.count == 4
+
+        paginator = LimitOffsetPagination(schema=type("MockSchema", (), {"limit": None, "offset": None}))
+        assert paginator.paginate_sequence((1, 2)) == [1, 2]
+
     def test_no_pagination_limit_and_offset(self):
         schema = type("MockSchema", (), {"limit": None, "offset": None})
         paginator = LimitOffsetPagination(schema=schema)
@@ -176,3 +194,181 @@ class TestLimitOffsetPagination:
         response_data = paginator.get_paginated_response_data(results=[])
         assert props == {}
         assert "pagination" not in response_data
+
+
+class TestKeysetSchema:
+    def test_fields_unset(self) -> None:
+        schema = KeysetSchema()
+        assert schema.cursor is None
+        assert schema.limit is None
+
+    def test_cursor_requires_limit(self) -> None:
+        with pytest.raises(ValidationError):
+            KeysetSchema(cursor="cursor")
+
+
+class TestKeysetPagination:
+    @pytest.fixture
+    def session(self) -> Session:
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add_all([SampleModel(id=id, name=name) for id, name in enumerate("aabbbcd", start=1)])
+        session.commit()
+        return session
+
+    def paginate(  # type: ignore
+        self, session: Session, limit: int, ordering=None, cursor=None, leading_keys=()
+    ):
+        schema = type("MockSchema", (), {"cursor": cursor, "limit": limit})
+        paginator = KeysetPagination(schema=schema, ordering=ordering, leading_keys=leading_keys)
+        self.results = paginator.paginate_results(
+            paginator.paginate_queryset(session.query(SampleModel)).all()
+        )
+        return paginator
+
+    def test_no_pagination(self, sample_query: Query[SampleModel]) -> None:
+        paginator = KeysetPagination(schema=KeysetSchema())
+        assert paginator.paginate_queryset(sample_query) is sample_query
+        assert paginator.paginate_results([1, 2]) == [1, 2]
+        assert paginator.get_paginated_response_data(results=[]) == {"data": []}
+
+    def test_paginate_queryset(self) -> None:
+        paginator = KeysetPagination(schema=KeysetSchema(limit=10))
+        modified_query = str(paginator.paginate_queryset(select(SampleModel)))  # type: ignore[arg-type]
+        assert "ORDER BY sample.id ASC" in modified_query
+        assert "OFFSET" not in modified_query
+        assert paginator.count_queryset(select(SampleModel)) is None
+
+    def test_forward_and_backward(self, session: Session) -> None:
+        pages = []
+        paginator = self.paginate(session, limit=3, ordering=["-name"])
+        while True:
+            pages.append([instance.id for instance in self.results])
+            if not paginator.next_cursor:
+                break
+            paginator = self.paginate(session, limit=3, ordering=["-name"], cursor=paginator.next_cursor)
+        assert pages == [[7, 6, 3], [4, 5, 1], [2]]
+
+        paginator = self.paginate(session, limit=3, ordering=["-name"], cursor=paginator.previous_cursor)
+        assert [instance.id for instance in self.results] == [4, 5, 1]
+        paginator = self.paginate(session, limit=3, ordering=["-name"], cursor=paginator.previous_cursor)
+        assert [instance.id for instance in self.results] == [7, 6, 3]
+        assert paginator.previous_cursor is None
+        assert paginator.get_pagination_properties()["next"] == paginator.next_cursor
+
+    def test_mixed_directions(self, session: Session) -> None:
+        paginator = self.paginate(session, limit=4, ordering=["name", "-id"])
+        assert [instance.id for instance in self.results] == [2, 1, 5, 4]
+        paginator = self.paginate(session, limit=4, ordering=["name", "-id"], cursor=paginator.next_cursor)
+        assert [instance.id for instance in self.results] == [3, 6, 7]
+        assert paginator.next_cursor is None
+
+    def test_leading_keys(self, session: Session) -> None:
+        # NOTE: A computed key, e.g. the relevance of a search, sorted before the primary key
+        leading_keys = [(SampleModel.id % 3, True)]
+        pages = []
+        paginator = self.paginate(session, limit=3, leading_keys=leading_keys)
+        while True:
+            pages.append([instance.id for instance in self.results])
+            if not paginator.next_cursor:
+                break
+            paginator = self.paginate(
+                session, limit=3, cursor=paginator.next_cursor, leading_keys=leading_keys
+            )
+        assert pages == [[2, 5, 1], [4, 7, 3], [6]]
+
+        paginator = self.paginate(
+            session, limit=3, cursor=paginator.previous_cursor, leading_keys=leading_keys
+        )
+        assert [instance.id for instance in self.results] == [4, 7, 3]
+
+    def test_invalid_cursor(self, session: Session) -> None:
+        with pytest.raises(BadRequestException):
+            self.paginate(session, limit=3, cursor="invalid")
+
+        paginator = self.paginate(session, limit=3, ordering=["name"])
+        with pytest.raises(BadRequestException):
+            self.paginate(session, limit=3, cursor=paginator.next_cursor)
+
+    def test_invalid_ordering(self, session: Session) -> None:
+        with pytest.raises(BadRequestException):
+            self.paginate(session, limit=3, ordering=["unknown"])
+
+
+class TestCountStrategy:
+    @pytest.fixture
+    def session(self) -> Session:
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add_all([SampleModel(id=id, name=f"name {id}") for id in range(1, 8)])
+        session.commit()
+        return session
+
+    def paginate(self, session: Session, paginator: BaseOffsetPagination) -> list[SampleModel]:
+        query = paginator.paginate_queryset(select(SampleModel).order_by(SampleModel.id))  # type: ignore
+        if (count_query := paginator.count_queryset(query)) is not None:  # type: ignore
+            paginator.set_count(session.scalar(count_query))
+        return paginator.paginate_results(list(session.execute(query).all()))  # type: ignore
+
+    def test_exact(self, session: Session) -> None:
+        paginator = LimitOffsetPagination(schema=LimitOffsetSchema(limit=3, offset=3))
+        assert paginator.count_strategy == CountStrategy.exact
+        results = self.paginate(session, paginator)
+        assert [instance.id for instance in results] == [4, 5, 6]
+        assert paginator.count == 7
+
+        paginator = PageNumberPagination(schema=PageNumberSchema(page=3, page_size=3))
+        results = self.paginate(session, paginator)
+        assert [instance.id for instance in results] == [7]
+        assert paginator.get_pagination_properties()["total_pages"] == 3
+
+    def test_exact_past_the_end(self, session: Session) -> None:
+        paginator = LimitOffsetPagination(schema=LimitOffsetSchema(limit=3, offset=30))
+        assert self.paginate(session, paginator) == []
+        assert paginator.count is None
+
+    def test_none(self, session: Session) -> None:
+        schema = PageNumberSchema(page=2, page_size=3)
+        paginator = PageNumberPagination(schema=schema, count_strategy=CountStrategy.none)
+        results = self.paginate(session, paginator)
+        assert [instance.id for instance in results] == [4, 5, 6]
+        assert paginator.count is None
+        assert paginator.get_pagination_properties() == {
+            "page": 2,
+            "page_size": 3,
+            "previous_page": 1,
+            "next_page": 3,
+        }
+
+        schema = LimitOffsetSchema(limit=3, offset=6)
+        paginator = LimitOffsetPagination(schema=schema, count_strategy=CountStrategy.none)
+        assert [instance.id for instance in self.paginate(session, paginator)] == [7]
+        assert paginator.get_pagination_properties() == {"has_next": False, "limit": 3, "offset": 6}
+
+    def test_estimate(self, session: Session) -> None:
+        schema = LimitOffsetSchema(limit=3, offset=3)
+        paginator = LimitOffsetPagination(schema=schema, count_strategy=CountStrategy.estimate)
+        results = self.paginate(session, paginator)
+        assert [instance.id for instance in results] == [4, 5, 6]
+        # NOTE: SQLite has no planner estimate, hence an exact count is issued instead
+        assert paginator.count == 7
+
+    def test_estimate_postgresql(self) -> None:
+        schema = LimitOffsetSchema(limit=3, offset=3)
+        paginator = LimitOffsetPagination(schema=schema, count_strategy=CountStrategy.estimate)
+        query = paginator.paginate_queryset(select(SampleModel))  # type: ignore[arg-type]
+        statement = str(paginator.count_queryset(query).compile(dialect=postgresql.dialect()))  # type: ignore
+        assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "LIMIT" not in statement
+
+        paginator.set_count('[{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1200}}]')
+        assert paginator.count == 1200
+        paginator.set_count([{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 42}}])
+        assert paginator.count == 42
+
+    def test_no_pagination(self, session: Session) -> None:
+        paginator = LimitOffsetPagination(schema=LimitOffsetSchema(), count_strategy=CountStrategy.estimate)
+        assert len(self.paginate(session, paginator)) == 7
+        assert paginator.count is None
@@ -1,4 +1,26 @@
-from utils.responses import DatabaseErrorResponse, NotFoundErrorResponse, TimeoutErrorResponse
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from utils.responses import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    ConditionalRequest,
+    DatabaseErrorResponse,
+    NotFoundErrorResponse,
+    NotModifiedResponse,
+    StreamingListResponse,
+    TimeoutErrorResponse,
+    etag_matches,
+    get_streaming_media_type,
+    http_date,
+    make_etag,
+    not_modified_since,
+    parse_http_date,
+)
 
 
 class TestSpecificErrorResponses:
@@ -27,3 +49,134 @@ class TestSpecificErrorResponses:
             '{"detail":"' + DatabaseErrorResponse.detail + '","debug_message":"' + debug_msg + '"}'
         )
         assert response.body.decode() == expected_body
+
+
+async def generate(*entities: Any) -> AsyncIterator[Any]:
+    for entity in entities:
+        yield entity
+
+
+async def consume(response: StreamingListResponse) -> str:
+    return "".join([chunk async for chunk in response.body_iterator])  # type: ignore
+
+
+@pytest.mark.anyio
+class TestStreamingListResponse:
+    def test_get_streaming_media_type(self) -> None:
+        assert get_streaming_media_type(None) is None
+        assert get_streaming_media_type("application/json") is None
+        assert get_streaming_media_type("application/x-ndjson") == NDJSON_MEDIA_TYPE
+        assert get_streaming_media_type("text/html, text/csv;q=0.9") == CSV_MEDIA_TYPE
+
+    async def test_ndjson(self) -> None:
+        response = StreamingListResponse(generate({"id": 1}, {"id": 2}), media_type=NDJSON_MEDIA_TYPE)
+        assert response.media_type == NDJSON_MEDIA_TYPE
+        assert await consume(response) == '{"id":1}\n{"id":2}\n'
+
+    async def test_csv(self) -> None:
+        entities = generate({"id": 1, "name": "a,b"}, {"id": 2, "name": "c"})
+        response = StreamingListResponse(entities, media_type=CSV_MEDIA_TYPE)
+        assert await consume(response) == 'id,name\r\n1,"a,b"\r\n2,c\r\n'
+
+        response = StreamingListResponse(generate(), media_type=CSV_MEDIA_TYPE)
+        assert await consume(response) == ""
+
+    async def test_csv_embedded(self) -> None:
+        entities = generate({"id": 1, "account": {"id": 2, "name": "Cash"}}, {"id": 3, "account": None})
+        response = StreamingListResponse(entities, media_type=CSV_MEDIA_TYPE)
+        assert await consume(response) == "id,account.id,account.name\r\n1,2,Cash\r\n3,,\r\n"
+
+    async def test_chunks(self) -> None:
+        response = StreamingListResponse(
+            generate(*({"id": id} for id in range(10))), media_type=NDJSON_MEDIA_TYPE
+        )
+        response.chunk_size = 20
+        chunks = [chunk async for chunk in response.body_iterator]
+        assert len(chunks) == 4
+        assert "".join(chunks).count("\n") == 10
+
+    def test_unsupported_media_type(self) -> None:
+        with pytest.raises(ValueError):
+            StreamingListResponse(generate(), media_type="application/json")
+
+
+class TestConditional:
+    def test_make_etag(self) -> None:
+        etag = make_etag("digest", "limit=10")
+        assert etag.startswith('"')
+        assert etag.endswith('"')
+        assert etag == make_etag("digest", "limit=10")
+        assert etag != make_etag("digest", "limit=20")
+
+    def test_etag_matches(self) -> None:
+        etag = make_etag("digest")
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('"other"', etag)
+
+    def test_not_modified_response(self) -> None:
+        response = NotModifiedResponse('"abc"')
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == '"abc"'
+
+    def test_http_date(self) -> None:
+        value = datetime(2024, 12, 1, 10, 30, 15, 999)
+        assert http_date(value) == "Sun, 01 Dec 2024 10:30:15 GMT"
+        assert parse_http_date(http_date(value)) == value.replace(microsecond=0, tzinfo=timezone.utc)
+        assert parse_http_date("yesterday") is None
+        assert parse_http_date(None) is None
+
+    def test_not_modified_since(self) -> None:
+        value = datetime(2024, 12, 1, 10, 30, 15, 999)
+        assert not_modified_since("Sun, 01 Dec 2024 10:30:15 GMT", value)
+        assert not not_modified_since("Sun, 01 Dec 2024 10:30:14 GMT", value)
+        assert not not_modified_since(None, value)
+
+
+class TestConditionalRequest:
+    last_modified = datetime(2024, 12, 1, 10, 30, 15)
+
+    def get_conditional(self, query: str = "", **headers: str) -> ConditionalRequest:
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": query.encode(),
+            "headers": [(key.replace("_", "-").encode(), value.encode()) for key, value in headers.items()],
+        }
+        return ConditionalRequest(Request(scope))
+
+    def evaluate(self, conditional: ConditionalRequest, response: Response) -> Optional[Response]:
+        return conditional.evaluate(response, parts=(1, self.last_modified), last_modified=self.last_modified)
+
+    def test_sets_validators(self) -> None:
+        response = Response()
+        assert self.evaluate(self.get_conditional(), response) is None
+        assert response.headers["etag"] == make_etag(1, self.last_modified, "")
+        assert response.headers["last-modified"] == "Sun, 01 Dec 2024 10:30:15 GMT"
+
+    def test_if_none_match(self) -> None:
+        etag = make_etag(1, self.last_modified, "")
+        not_modified = self.evaluate(self.get_conditional(if_none_match=etag), Response())
+        assert not_modified is not None
+        assert not_modified.status_code == 304
+        assert not_modified.headers["last-modified"] == "Sun, 01 Dec 2024 10:30:15 GMT"
+
+        # NOTE: The query string is a distinct representation
+        assert self.evaluate(self.get_conditional("limit=10", if_none_match=etag), Response()) is None
+
+    def test_if_modified_since(self) -> None:
+        conditional = self.get_conditional(if_modified_since="Sun, 01 Dec 2024 10:30:15 GMT")
+        assert self.evaluate(conditional, Response()) is not None
+
+        conditional = self.get_conditional(if_modified_since="Sun, 01 Dec 2024 10:30:14 GMT")
+        assert self.evaluate(conditional, Response()) is None
+
+    def test_if_none_match_takes_precedence(self) -> None:
+        conditional = self.get_conditional(
+            if_none_match='"other"', if_modified_since="Sun, 01 Dec 2024 10:30:15 GMT"
+        )
+        assert self.evaluate(conditional, Response()) is None
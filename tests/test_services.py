@@ -1,11 +1,15 @@
-from utils.services import BaseService
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.services import AsyncBaseService, BaseService
 
 
 class TestBaseService:
     def test_retrieve_by_id(self, mock_repository):  # type: ignore
         service = BaseService(repository=mock_repository)
         result = service.retrieve_by_id(id=1)
-        mock_repository.retrieve_by_id.assert_called_once_with(id=1)
+        mock_repository.retrieve_by_id.assert_called_once_with(id=1, projection_manager=None, include=None)
         assert result == mock_repository.retrieve_by_id.return_value
 
     def test_get(self, mock_repository):  # type: ignore
@@ -19,9 +23,19 @@ class TestBaseService:
         service = BaseService(repository=mock_repository)
         filters = {"key": "value"}
         result = service.list(filter_manager=None, pagination_manager=None, **filters)
-        mock_repository.list.assert_called_once_with(filter_manager=None, pagination_manager=None, **filters)
+        mock_repository.list.assert_called_once_with(
+            filter_manager=None, pagination_manager=None, projection_manager=None, include=None, **filters
+        )
         assert result == mock_repository.list.return_value
 
+    def test_stream(self, mock_repository):  # type: ignore
+        service = BaseService(repository=mock_repository)
+        result = service.stream(filter_manager=None, key="value")
+        mock_repository.stream.assert_called_once_with(
+            filter_manager=None, projection_manager=None, include=None, key="value"
+        )
+        assert result == mock_repository.stream.return_value
+
     def test_create(self, mock_repository):  # type: ignore
         service = BaseService(repository=mock_repository)
         entity = {"key": "value"}
@@ -40,3 +54,101 @@ class TestBaseService:
         service = BaseService(repository=mock_repository)
         service.destroy(id=1)
         mock_repository.destroy.assert_called_once_with(id=1)
+
+    def test_bulk_create(self, mock_repository):  # type: ignore
+        service = BaseService(repository=mock_repository)
+        entities = [{"key": "value"}]
+        result = service.bulk_create(entities=entities)
+        mock_repository.bulk_create.assert_called_once_with(entities=entities)
+        mock_repository.perform_commit.assert_called_once()
+        assert result == mock_repository.bulk_create.return_value
+
+    def test_bulk_update(self, mock_repository):  # type: ignore
+        service = BaseService(repository=mock_repository)
+        entities = [{"id": 1, "key": "value"}]
+        result = service.bulk_update(entities=entities)
+        mock_repository.bulk_update.assert_called_once_with(entities=entities)
+        assert result == mock_repository.bulk_update.return_value
+
+    def test_bulk_destroy(self, mock_repository):  # type: ignore
+        service = BaseService(repository=mock_repository)
+        service.bulk_destroy(ids=[1, 2])
+        mock_repository.bulk_destroy.assert_called_once_with(ids=[1, 2])
+
+
+@pytest.mark.anyio
+class TestAsyncBaseService:
+    async def test_retrieve_by_id(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        result = await service.retrieve_by_id(id=1)
+        mock_async_repository.retrieve_by_id.assert_awaited_once_with(
+            id=1, projection_manager=None, include=None
+        )
+        assert result == mock_async_repository.retrieve_by_id.return_value
+
+    async def test_get(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        filters = {"key": "value"}
+        result = await service.get(**filters)
+        mock_async_repository.retrieve.assert_awaited_once_with(**filters)
+        assert result == mock_async_repository.retrieve.return_value
+
+    async def test_list(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        filters = {"key": "value"}
+        result = await service.list(filter_manager=None, pagination_manager=None, **filters)
+        mock_async_repository.list.assert_awaited_once_with(
+            filter_manager=None, pagination_manager=None, projection_manager=None, include=None, **filters
+        )
+        assert result == mock_async_repository.list.return_value
+
+    async def test_stream(self, mock_async_repository):  # type: ignore
+        mock_async_repository.stream = MagicMock()
+        service = AsyncBaseService(repository=mock_async_repository)
+        result = service.stream(filter_manager=None, key="value")
+        mock_async_repository.stream.assert_called_once_with(
+            filter_manager=None, projection_manager=None, include=None, key="value"
+        )
+        assert result == mock_async_repository.stream.return_value
+
+    async def test_create(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        entity = {"key": "value"}
+        result = await service.create(entity=entity)
+        mock_async_repository.create.assert_awaited_once_with(entity=entity)
+        mock_async_repository.perform_commit.assert_awaited_once()
+        assert result == mock_async_repository.create.return_value
+
+    async def test_update(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        entity = {"key": "value"}
+        result = await service.update(id=1, entity=entity)
+        mock_async_repository.update.assert_awaited_once_with(id=1, entity=entity)
+        mock_async_repository.perform_commit.assert_awaited_once()
+        assert result == mock_async_repository.update.return_value
+
+    async def test_destroy(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        await service.destroy(id=1)
+        mock_async_repository.destroy.assert_awaited_once_with(id=1)
+        mock_async_repository.perform_commit.assert_awaited_once()
+
+    async def test_bulk_create(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        entities = [{"key": "value"}]
+        result = await service.bulk_create(entities=entities)
+        mock_async_repository.bulk_create.assert_awaited_once_with(entities=entities)
+        mock_async_repository.perform_commit.assert_awaited_once()
+        assert result == mock_async_repository.bulk_create.return_value
+
+    async def test_bulk_update(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        entities = [{"id": 1, "key": "value"}]
+        result = await service.bulk_update(entities=entities)
+        mock_async_repository.bulk_update.assert_awaited_once_with(entities=entities)
+        assert result == mock_async_repository.bulk_update.return_value
+
+    async def test_bulk_destroy(self, mock_async_repository):  # type: ignore
+        service = AsyncBaseService(repository=mock_async_repository)
+        await service.bulk_destroy(ids=[1, 2])
+        mock_async_repository.bulk_destroy.assert_awaited_once_with(ids=[1, 2])
@@ -0,0 +1,28 @@
+from .backends import CacheBackend, LRUCache
+from .catalog import Catalog, CatalogSnapshot
+from .coalescing import SingleFlight, SingleFlightError, coalesce_requests, get_single_flight_stats
+from .responses import (
+    CachedResponse,
+    ResponseCache,
+    ResponseCachePolicy,
+    cache_response,
+    get_response_cache_stats,
+    invalidate_responses,
+)
+
+__all__ = (
+    "CacheBackend",
+    "CachedResponse",
+    "Catalog",
+    "CatalogSnapshot",
+    "LRUCache",
+    "ResponseCache",
+    "ResponseCachePolicy",
+    "SingleFlight",
+    "SingleFlightError",
+    "cache_response",
+    "coalesce_requests",
+    "get_response_cache_stats",
+    "get_single_flight_stats",
+    "invalidate_responses",
+)
@@ -0,0 +1,100 @@
+"""
+Cache backends.
+
+`CacheBackend` is the interface every backend implements, so an in-process cache can be swapped for a
+shared one (e.g. Redis, memcached) without touching its callers. `LRUCache` is the in-process
+implementation: bounded in size, with a time to live per entry and hit/miss/eviction counters.
+"""
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional, Protocol
+
+
+class CacheBackend(Protocol):  # pragma: no cover
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Value stored at `key`, `None` when missing or expired."""
+
+    def set(self, key: Hashable, value: Any, *, ttl: Optional[float] = None) -> None:
+        """Store `value` at `key` for `ttl` seconds (the backend default when `None`)."""
+
+    def delete(self, *keys: Hashable) -> None:
+        """Remove `keys`, missing ones are ignored."""
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        """Counters of the backend, for monitoring."""
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache evicting the least recently used entry once `maxsize` is reached.
+
+    Every entry expires `ttl` seconds after being set, expired entries are dropped when read. Values
+    are stored as given, hence they should be immutable or treated as such by the callers.
+    """
+
+    def __init__(self, *, maxsize: int = 1024, ttl: Optional[float] = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if expires_at is not None and expires_at <= monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, *, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.__class__.__name__,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,182 @@
+"""
+Process-local catalogs of small, rarely written tables.
+
+A `Catalog` loads every row of its model once into an immutable `CatalogSnapshot`, indexed by the
+given columns, and serves lookups from memory afterwards. Writes call `Catalog.invalidate`, which
+bumps its version so the next read loads a fresh snapshot. `max_age` bounds how long a snapshot
+can miss writes made by other processes, and a lookup missing a row (`Catalog.get`) reloads it.
+
+Snapshots are always loaded from the primary: a replica lagging behind the write that bumped the
+version would otherwise be stamped with the new version and kept for `max_age`.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import astuple, dataclass, field, make_dataclass
+from time import monotonic
+from typing import Any, Optional, Sequence, Type
+
+from sqlalchemy import select
+from sqlalchemy.exc import MultipleResultsFound, NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+
+from utils.database.routing import use_primary
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable copy of a table.
+
+    Attributes:
+        entries: Every row as a frozen dataclass holding its column values, ordered by primary key.
+        version: `Catalog.version` at the time the snapshot started loading.
+        etag: Digest of the content, identical across processes holding the same rows.
+    """
+
+    entries: tuple[Any, ...]
+    version: int
+    etag: str
+    loaded_at: float = field(default_factory=monotonic)
+    indexes: dict[str, dict[Any, Any]] = field(default_factory=dict)
+    multi_indexes: dict[str, dict[Any, tuple[Any, ...]]] = field(default_factory=dict)
+
+    def get(self, **filters: Any) -> Any:
+        """
+        Single entry matching all `filters`, looked up by index when filtering by a single indexed column.
+
+        Raises
+        ------
+            NoResultFound: If no entry matches.
+            MultipleResultsFound: If more than one entry matches.
+        """
+        if len(filters) == 1:
+            [(key, value)] = filters.items()
+            if key in self.indexes:
+                if (entry := self.indexes[key].get(value)) is None:
+                    raise NoResultFound("No row was found when one was required")
+                return entry
+        entries = self.filter(**filters)
+        if not entries:
+            raise NoResultFound("No row was found when one was required")
+        if len(entries) > 1:
+            raise MultipleResultsFound("Multiple rows were found when exactly one was required")
+        return entries[0]
+
+    def filter(self, **filters: Any) -> tuple[Any, ...]:
+        """Entries matching all `filters` (equality), through the first multi index available."""
+        entries, filters = self.entries, dict(filters)
+        if (indexed := next((key for key in filters if key in self.multi_indexes), None)) is not None:
+            entries = self.multi_indexes[indexed].get(filters.pop(indexed), ())
+        if not filters:
+            return entries
+        return tuple(entry for entry in entries if all(getattr(entry, k) == v for k, v in filters.items()))
+
+
+class Catalog:
+    """
+    In-memory catalog of `model`.
+
+    Attributes:
+        model: Model whose whole table is kept in memory.
+        unique: Columns indexed one to one, e.g. `("id", "name")`.
+        grouped: Columns indexed one to many, e.g. `("type",)`.
+        max_age: Seconds after which a snapshot is reloaded even without local writes.
+        min_reload_interval: Seconds a snapshot is kept before a lookup miss reloads it, bounding the
+            loads requests for missing rows can trigger.
+    """
+
+    def __init__(
+        self,
+        model: Type[DeclarativeBase],
+        *,
+        unique: Sequence[str] = ("id",),
+        grouped: Sequence[str] = (),
+        max_age: Optional[float] = 300.0,
+        min_reload_interval: float = 1.0,
+    ) -> None:
+        self.model = model
+        self.unique = tuple(unique)
+        self.grouped = tuple(grouped)
+        self.max_age = max_age
+        self.min_reload_interval = min_reload_interval
+        self.version = 0
+        self.loads = 0
+        self.columns = tuple(model.__table__.columns)
+        self.entry_class = make_dataclass(
+            f"{model.__name__}Entry", [column.key for column in self.columns], frozen=True, slots=True
+        )
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Bump the version, to be called once writes to the table are committed."""
+        self.version += 1
+
+    def is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        if snapshot is None or snapshot.version != self.version:
+            return False
+        return self.max_age is None or monotonic() - snapshot.loaded_at < self.max_age
+
+    async def get_snapshot(self, session: AsyncSession) -> CatalogSnapshot:
+        """Current snapshot, loaded through `session` when stale. Concurrent callers share one load."""
+        if self.is_fresh(snapshot := self._snapshot):
+            return snapshot  # type: ignore[return-value]
+        async with self._lock:
+            if not self.is_fresh(snapshot := self._snapshot):
+                snapshot = self._snapshot = await self.load(session)
+        return snapshot  # type: ignore[return-value]
+
+    async def refresh(self, session: AsyncSession) -> CatalogSnapshot:
+        """Snapshot reloaded through `session`, unless stale or younger than `min_reload_interval`."""
+        async with self._lock:
+            snapshot = self._snapshot
+            if (
+                not self.is_fresh(snapshot)
+                or monotonic() - snapshot.loaded_at >= self.min_reload_interval  # type: ignore[union-attr]
+            ):
+                snapshot = self._snapshot = await self.load(session)
+        return snapshot  # type: ignore[return-value]
+
+    async def get(self, session: AsyncSession, **filters: Any) -> Any:
+        """
+        Single entry matching all `filters`, see `CatalogSnapshot.get`. On a miss the snapshot is reloaded
+        (`refresh`) and searched once more, the row may have been written by another process.
+
+        Raises
+        ------
+            NoResultFound: If no entry matches.
+            MultipleResultsFound: If more than one entry matches.
+        """
+        try:
+            return (await self.get_snapshot(session)).get(**filters)
+        except NoResultFound:
+            return (await self.refresh(session)).get(**filters)
+
+    async def load(self, session: AsyncSession) -> CatalogSnapshot:
+        # NOTE: Read before querying, so writes committed meanwhile leave the snapshot stale
+        version = self.version
+        # NOTE: The session sticks to the primary from now on, see `utils.database.routing`
+        use_primary(session)
+        query = select(*self.columns).order_by(*self.model.__table__.primary_key.columns)
+        result = await session.execute(query)
+        entries = tuple(self.entry_class(*row) for row in result)
+        self.loads += 1
+        return self.build_snapshot(entries, version=version)
+
+    def build_snapshot(self, entries: tuple[Any, ...], *, version: int) -> CatalogSnapshot:
+        content = json.dumps([astuple(entry) for entry in entries], default=str, separators=(",", ":"))
+        grouped: dict[str, dict[Any, list[Any]]] = {key: defaultdict(list) for key in self.grouped}
+        for entry in entries:
+            for key in self.grouped:
+                grouped[key][getattr(entry, key)].append(entry)
+        return CatalogSnapshot(
+            entries=entries,
+            version=version,
+            etag=hashlib.sha256(content.encode()).hexdigest()[:32],
+            indexes={key: {getattr(entry, key): entry for entry in entries} for key in self.unique},
+            multi_indexes={key: {k: tuple(v) for k, v in index.items()} for key, index in grouped.items()},
+        )
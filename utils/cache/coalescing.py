@@ -0,0 +1,100 @@
+"""
+Single-flight coalescing.
+
+`SingleFlight` runs one computation per key at a time: callers arriving while it is in flight wait for
+it and share its result instead of running their own, so a burst of identical reads (a dashboard
+opening, a cache expiring) costs a single round trip to the database. Nothing is kept once the
+computation finishes, it is not a cache.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+# NOTE: Every single-flight group by name, for monitoring
+single_flights: dict[str, "SingleFlight"] = {}
+
+ResultType = TypeVar("ResultType")
+EndpointType = TypeVar("EndpointType", bound=Callable[..., Any])
+
+
+def coalesce_requests(endpoint: EndpointType) -> EndpointType:
+    """
+    Opt a route in request coalescing, to be listed below the route decorator:
+
+        @router.get("/{id}")
+        @coalesce_requests
+        async def retrieve_transaction(...): ...
+
+    The endpoint is returned untouched, it is only flagged.
+    """
+    endpoint.__coalesce_requests__ = True  # type: ignore[attr-defined]
+    return endpoint
+
+
+def is_coalesced(endpoint: Callable[..., Any]) -> bool:
+    return getattr(endpoint, "__coalesce_requests__", False)
+
+
+class SingleFlightError(Exception):
+    """The in-flight computation was cancelled, waiting callers should run their own."""
+
+
+class SingleFlight:
+    """
+    Group of in-flight computations by key, to be used from a single event loop.
+
+    `do` returns the result along with whether it was shared, i.e. computed by another caller. Waiting
+    callers receive the exception raised by the computation, or `SingleFlightError` when it was
+    cancelled.
+    """
+
+    def __init__(self, *, name: str = "requests") -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.failures = 0
+        single_flights[name] = self
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, function: Callable[[], Awaitable[ResultType]]
+    ) -> tuple[ResultType, bool]:
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # NOTE: Shielded so a waiting caller going away does not cancel the shared computation
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.calls += 1
+        try:
+            result = await function()
+        except BaseException as exc:
+            self.failures += 1
+            future.set_exception(exc if isinstance(exc, Exception) else SingleFlightError(key))
+            # NOTE: Retrieved so it is not logged as never retrieved when nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, Any]:
+        requests = self.calls + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+            "failures": self.failures,
+        }
+
+
+def get_single_flight_stats() -> dict[str, dict[str, Any]]:
+    return {name: group.stats() for name, group in single_flights.items()}
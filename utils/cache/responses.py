@@ -0,0 +1,246 @@
+"""
+HTTP response cache.
+
+`ResponseCache` keeps rendered `GET` responses in process, bounded both by time to live and by the
+bytes of the stored bodies. Every entry is tagged with the tables its representation is built from;
+writes going through the service layer call `invalidate_responses` with the written table, which
+drops the tagged entries of every cache. Routes opt in through `cache_response`, the
+`ResponseCacheMiddleware` does the lookups and stores.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+# NOTE: Every response cache by name, so writes invalidate all of them and for monitoring
+response_caches: dict[str, "ResponseCache"] = {}
+
+EndpointType = TypeVar("EndpointType", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class ResponseCachePolicy:
+    """
+    Attributes:
+        tags: Tables the response is built from, a write to any of them drops the entry.
+        ttl: Time to live of the entries, the cache default when `None`.
+    """
+
+    tags: tuple[str, ...]
+    ttl: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    tags: tuple[str, ...] = ()
+    stored_at: float = field(default_factory=monotonic)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers)
+
+    @property
+    def age(self) -> int:
+        return int(monotonic() - self.stored_at)
+
+
+def cache_response(
+    *, tags: tuple[str, ...], ttl: Optional[float] = None
+) -> Callable[[EndpointType], EndpointType]:
+    """
+    Opt a route in the response cache, to be listed below the route decorator:
+
+        @router.get("/")
+        @cache_response(tags=("transaction",))
+        async def list_transaction(...): ...
+
+    The endpoint is returned untouched, only `ResponseCachePolicy` is attached to it.
+    """
+
+    def decorator(endpoint: EndpointType) -> EndpointType:
+        endpoint.__response_cache__ = ResponseCachePolicy(tags=tags, ttl=ttl)  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorator
+
+
+def get_response_cache_policy(endpoint: Callable[..., Any]) -> Optional[ResponseCachePolicy]:
+    return getattr(endpoint, "__response_cache__", None)
+
+
+class ResponseCache:
+    """
+    Thread-safe cache of rendered responses evicting the least recently used entries once the stored
+    bytes exceed `maxbytes`. Responses larger than `max_entry_bytes` are never stored.
+
+    Tags carry a generation counter: a response rendered while one of its tags was invalidated is not
+    stored, as it might hold data read before the write committed. Nor is one rendered less than
+    `replica_lag` seconds after such an invalidation (see `is_settled`), as it might have been read from
+    a replica not caught up with the write yet.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "responses",
+        maxbytes: int = 16 * 1024 * 1024,
+        max_entry_bytes: int = 1024 * 1024,
+        ttl: Optional[float] = 30.0,
+        replica_lag: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.maxbytes = maxbytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self._data: OrderedDict[Hashable, tuple[Optional[float], CachedResponse]] = OrderedDict()
+        self.replica_lag = replica_lag
+        self._generations: dict[str, int] = {}
+        self._invalidated_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.stores = 0
+        self.rejections = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        response_caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            try:
+                expires_at, response = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if expires_at is not None and expires_at <= monotonic():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def set(
+        self,
+        key: Hashable,
+        value: CachedResponse,
+        *,
+        ttl: Optional[float] = None,
+        generation: Optional[tuple[int, ...]] = None,
+    ) -> bool:
+        """
+        Store `value` at `key`, returns whether it was stored.
+
+        `generation` is the `get_generation` of the tags taken before rendering `value`, it is not stored
+        when any of them was invalidated meanwhile.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        size = value.size
+        with self._lock:
+            if size > min(self.max_entry_bytes, self.maxbytes) or (
+                generation is not None and generation != self._get_generation(value.tags)
+            ):
+                self.rejections += 1
+                return False
+            self._pop(key)
+            self._data[key] = (monotonic() + ttl if ttl is not None else None, value)
+            self.bytes += size
+            self.stores += 1
+            while self.bytes > self.maxbytes:
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+            return True
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def get_generation(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        with self._lock:
+            return self._get_generation(tags)
+
+    def is_settled(self, tags: tuple[str, ...]) -> bool:
+        """Whether none of `tags` was invalidated within the last `replica_lag` seconds."""
+        if not self.replica_lag:
+            return True
+        since = monotonic() - self.replica_lag
+        with self._lock:
+            return all(self._invalidated_at.get(tag, since) <= since for tag in tags)
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry tagged with any of `tags`."""
+        with self._lock:
+            now = monotonic()
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                self._invalidated_at[tag] = now
+            stale = [
+                key for key, (_, response) in self._data.items() if not set(tags).isdisjoint(response.tags)
+            ]
+            for key in stale:
+                self._pop(key)
+            self.invalidations += len(stale)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypasses += 1
+
+    def record_rejection(self) -> None:
+        with self._lock:
+            self.rejections += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.__class__.__name__,
+            "size": len(self._data),
+            "bytes": self.bytes,
+            "maxbytes": self.maxbytes,
+            "ttl": self.ttl,
+            "replica_lag": self.replica_lag,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bypasses": self.bypasses,
+            "stores": self.stores,
+            "rejections": self.rejections,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _get_generation(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def _pop(self, key: Hashable) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.bytes -= item[1].size
+
+
+def invalidate_responses(*tags: str) -> None:
+    """Drop the responses tagged with any of `tags` from every response cache."""
+    for cache in response_caches.values():
+        cache.invalidate(*tags)
+
+
+def get_response_cache_stats() -> dict[str, dict[str, Any]]:
+    return {name: cache.stats() for name, cache in response_caches.items()}
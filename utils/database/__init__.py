@@ -1 +1,2 @@
+from .async_repository import *  # noqa: F403
 from .repository import *  # noqa: F403
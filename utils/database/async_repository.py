@@ -0,0 +1,516 @@
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Generic,
+    Optional,
+    Protocol,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import Delete, Executable, Insert, Select, Update, delete, func, insert, select, update
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm.exc import StaleDataError
+
+from utils.exceptions.generic import ImproperlyConfigured
+
+from .loading import LoadOptionsMixin
+
+ModelType = TypeVar("ModelType", bound=DeclarativeBase)
+
+STREAM_CHUNK_SIZE = 500
+
+
+class AsyncFilterManagerProtocol(Protocol):  # pragma: no cover
+    def filter_queryset(self, query: Select[Any]) -> Select[Any]:
+        pass
+
+    def order_by_queryset(self, query: Select[Any]) -> Select[Any]:
+        pass
+
+
+class AsyncProjectionManagerProtocol(Protocol):  # pragma: no cover
+    def project_queryset(self, query: Select[Any]) -> Select[Any]:
+        pass
+
+
+class AsyncPaginationManagerProtocol(Protocol):  # pragma: no cover
+    def paginate_queryset(self, query: Select[Any]) -> Select[Any]:
+        pass
+
+    def count_queryset(self, query: Select[Any]) -> Optional[Executable]:
+        pass
+
+    def set_count(self, value: Any) -> None:
+        pass
+
+    def paginate_results(self, results: list[Any]) -> list[Any]:
+        pass
+
+
+class AsyncListModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
+    last_modified_field: ClassVar[str] = "updated_at"
+
+    async def list(
+        self,
+        *,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        pagination_manager: Optional[AsyncPaginationManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> list[ModelType]:
+        """
+        Args:
+            filter_manager: Object implementing `filter_queryset` and `order_by_queryset` methods
+            pagination_manager: Object implementing `paginate_queryset`, `count_queryset`, `set_count`
+                and `paginate_results` methods
+            projection_manager: Object implementing `project_queryset` method
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
+            **filters: Filters to refine the query results.
+
+        Returns
+        -------
+            List of ModelType instances.
+        """
+        base_query = self.get_base_query(include=include)
+        query = self.list_queryset(base_query, **filters)
+        if filter_manager:
+            query = filter_manager.filter_queryset(query)
+            query = filter_manager.order_by_queryset(query)
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        if pagination_manager:
+            query = pagination_manager.paginate_queryset(query)
+            if (count_query := pagination_manager.count_queryset(query)) is not None:
+                pagination_manager.set_count(await self.session.scalar(count_query))
+            rows = await self.session.execute(query)
+            return pagination_manager.paginate_results(list(rows.all()))
+        result = await self.session.scalars(query)
+        return list(result.all())
+
+    def stream(
+        self,
+        *,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> AsyncIterator[ModelType]:
+        """
+        Iterate over the list results through a server-side cursor, `chunk_size` rows at a time.
+
+        The query is built right away, so invalid arguments (e.g. an unknown `include`) raise before the
+        first row is requested, i.e. before a streaming response starts.
+
+        Args:
+            filter_manager: Object implementing `filter_queryset` and `order_by_queryset` methods
+            projection_manager: Object implementing `project_queryset` method
+            chunk_size: Number of rows fetched and built as ModelType instances per round trip.
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
+            **filters: Filters to refine the query results.
+
+        Returns
+        -------
+            Async iterator of ModelType instances.
+        """
+        base_query = self.get_base_query(include=include)
+        query = self.list_queryset(base_query, **filters)
+        if filter_manager:
+            query = filter_manager.filter_queryset(query)
+            query = filter_manager.order_by_queryset(query)
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        return self.stream_query(query.execution_options(yield_per=chunk_size))
+
+    async def stream_query(self, query: Select[tuple[ModelType]]) -> AsyncIterator[ModelType]:
+        result = await self.session.stream_scalars(query)
+        try:
+            async for instance in result:
+                yield instance
+        finally:
+            await result.close()
+
+    def list_queryset(self, base_query: Select[tuple[ModelType]], **filters: Any) -> Select[tuple[ModelType]]:
+        """Override for custom list fetching logic."""
+        return base_query.filter_by(**filters)
+
+    async def list_validators(
+        self, *, filter_manager: Optional[AsyncFilterManagerProtocol] = None, **filters: Any
+    ) -> tuple[Optional[datetime], int]:
+        """
+        Cheap validator of the `list` results under the same filters, for conditional requests.
+
+        Args:
+            filter_manager: Object implementing `filter_queryset` method
+            **filters: Filters to refine the query results.
+
+        Returns
+        -------
+            Latest `last_modified_field` value (`None` when there are no rows) and number of rows.
+        """
+        query = self.list_queryset(self.get_base_query(), **filters)
+        if filter_manager:
+            query = filter_manager.filter_queryset(query)
+        column = getattr(self.get_model(), self.last_modified_field)
+        # NOTE: Entities (and their loader options) are replaced by the aggregates, the WHERE clause is kept
+        query = query.with_only_columns(func.max(column), func.count(), maintain_column_froms=True)
+        result = await self.session.execute(query.order_by(None))
+        last_modified, count = result.one()
+        return last_modified, count
+
+
+class AsyncRetrieveModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
+
+    async def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> ModelType:
+        """
+        Args:
+            id: ID of the entity to retrieve.
+            projection_manager: Object implementing `project_queryset` method
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
+
+        Returns
+        -------
+            Single ModelType instance.
+        """
+        query = self.retrieve_queryset(self.get_base_query(include=include), id=id)
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        result = await self.session.scalars(query)
+        return result.one()
+
+    async def retrieve(
+        self,
+        *,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> ModelType:
+        """
+        Args:
+            projection_manager: Object implementing `project_queryset` method
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
+            **filters: Filters to refine the query results.
+
+        Returns
+        -------
+            Single ModelType instance.
+        """
+        query = self.retrieve_queryset(self.get_base_query(include=include), **filters)
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        result = await self.session.scalars(query)
+        return result.one()
+
+    def retrieve_queryset(
+        self, base_query: Select[tuple[ModelType]], **filters: Any
+    ) -> Select[tuple[ModelType]]:
+        """Override for custom retrieval logic."""
+        return base_query.filter_by(**filters)
+
+
+class AsyncCreateModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+
+    async def create(self, *, entity: dict[str, Any]) -> ModelType:
+        """
+        Insert the entity in a single `INSERT ... RETURNING` statement, hydrating the persisted row
+        (ID, defaults and timestamps included).
+
+        When `create_queryset` is overridden the instance it builds is added and flushed instead.
+
+        Args:
+            entity: Data dictionary to create a new entity.
+
+        Returns
+        -------
+            Newly created ModelType instance.
+        """
+        model = self.get_model()
+        if not self.uses_fast_create():
+            new_record = self.create_queryset(model=model, entity=entity)
+            self.session.add(new_record)
+            await self.session.flush()
+            return new_record
+
+        result = await self.session.scalars(self.fast_create_queryset(model=model, entity=entity))
+        return result.one()
+
+    def uses_fast_create(self) -> bool:
+        """Whether `create` can insert the row straight away, i.e. `create_queryset` is not overridden."""
+        return type(self).create_queryset is AsyncCreateModelMixin.create_queryset
+
+    def fast_create_queryset(self, *, model: Type[ModelType], entity: dict[str, Any]) -> Insert:
+        """Statement inserting the entity and returning it."""
+        return insert(model).values(**entity).returning(model)
+
+    def create_queryset(self, *, model: Type[ModelType], entity: dict[str, Any]) -> ModelType:
+        """Override for custom object creation logic."""
+        return model(**entity)
+
+
+class AsyncUpdateModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
+
+    async def update(self, *, id: int, entity: dict[str, Any]) -> ModelType:
+        """
+        Update the entity in a single `UPDATE ... RETURNING` statement.
+
+        Only the given columns are sent, hence partial updates (PATCH) are supported as well.
+
+        Args:
+            id: ID of the entity to update.
+            entity: Data dictionary with updated values.
+
+        Returns
+        -------
+            Updated ModelType instance.
+
+        Raises
+        ------
+            ValueError: If provided ID doesn't match entity's ID.
+            NoResultFound: If the entity does not exist.
+        """
+        if id != entity.pop("id", id):
+            raise ValueError("ID in the entity does not match the given ID.")
+
+        if not entity:
+            result = await self.session.scalars(self.get_base_query().filter_by(id=id))
+            return result.one()
+
+        # NOTE: The returned row hydrates the instance (refreshing it if already in the identity map),
+        #       so no SELECT follows the UPDATE
+        result = await self.session.scalars(
+            self.update_queryset(id=id, entity=entity),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )
+        return result.one()
+
+    def update_queryset(self, *, id: int, entity: dict[str, Any]) -> Update:
+        """Override for custom update logic, the statement must return the updated entity."""
+        model = self.get_model()
+        return update(model).filter_by(id=id).values(**entity).returning(model)
+
+
+class AsyncDestroyModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
+
+    async def destroy(self, *, id: int) -> None:
+        """
+        Delete the entity in a single `DELETE ... RETURNING` statement, the instance is never loaded.
+
+        When `destroy_queryset` or `perform_destroy` are overridden (e.g., soft deletes) the instance is
+        loaded and handed to `perform_destroy` instead.
+
+        Args:
+            id: ID of the entity to delete.
+
+        Raises
+        ------
+            NoResultFound: If the entity does not exist.
+        """
+        if not self.uses_fast_destroy():
+            base_query = self.get_base_query()
+            result = await self.session.scalars(self.destroy_queryset(base_query, id=id))
+            await self.perform_destroy(result.one())
+            await self.session.flush()
+            return
+
+        result = await self.session.scalars(self.fast_destroy_queryset(id=id))
+        result.one()
+
+    def uses_fast_destroy(self) -> bool:
+        """Whether `destroy` can skip loading the instance, i.e. no destroy hook is overridden."""
+        cls = type(self)
+        return (
+            cls.destroy_queryset is AsyncDestroyModelMixin.destroy_queryset
+            and cls.perform_destroy is AsyncDestroyModelMixin.perform_destroy
+        )
+
+    def fast_destroy_queryset(self, *, id: int) -> Delete:
+        """Statement deleting the entity without loading it, returning the deleted ID."""
+        model = self.get_model()
+        return delete(model).filter_by(id=id).returning(model.id)  # type: ignore[attr-defined]
+
+    def destroy_queryset(self, base_query: Select[tuple[ModelType]], *, id: int) -> Select[tuple[ModelType]]:
+        """Query to delete of an instance."""
+        query = base_query.filter_by(id=id)
+        return query  # noqa: RET504
+
+    async def perform_destroy(self, instance: ModelType) -> None:
+        """
+        Explicit deletion of an instance.
+
+        Override for custom delete behavior, e.g., soft deletes.
+        In case of soft-delete this method can be easily overwritten and
+        set it as `instance.deleted_at = now()`
+        """
+        await self.session.delete(instance)
+
+
+class AsyncBulkCreateModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+
+    async def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Insert all the entities in a single `executemany` (insertmanyvalues) statement.
+
+        Args:
+            entities: Data dictionaries to create the new entities.
+
+        Returns
+        -------
+            Column values of the newly created rows, in the same order as `entities`.
+        """
+        if not entities:
+            return []
+        result = await self.session.execute(self.bulk_create_queryset(model=self.get_model()), entities)
+        return [dict(row) for row in result.mappings()]
+
+    def bulk_create_queryset(self, *, model: Type[ModelType]) -> Insert:
+        """Override for custom bulk insert logic."""
+        return insert(model).returning(*model.__table__.columns, sort_by_parameter_order=True)
+
+
+class AsyncBulkUpdateModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+
+    async def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Update all the entities by primary key in a single `executemany` statement.
+
+        Args:
+            entities: Data dictionaries with updated values, each one including its `id`.
+
+        Returns
+        -------
+            Column values of the updated rows, in the same order as `entities`.
+
+        Raises
+        ------
+            ValueError: If any entity has no `id`.
+            NoResultFound: If any entity does not exist.
+        """
+        if not entities:
+            return []
+        if any(entity.get("id") is None for entity in entities):
+            raise ValueError("Every entity must provide its ID.")
+
+        model = self.get_model()
+        try:
+            await self.session.execute(self.bulk_update_queryset(model=model), entities)
+        except StaleDataError as exc:
+            raise NoResultFound("Some of the entities to update do not exist.") from exc
+
+        ids = [entity["id"] for entity in entities]
+        result = await self.session.execute(self.bulk_fetch_queryset(model=model, ids=ids))
+        rows = {row["id"]: dict(row) for row in result.mappings()}
+        # NOTE: Drivers without a sane `executemany` rowcount (e.g. asyncpg) never raise `StaleDataError`
+        if set(ids) - rows.keys():
+            raise NoResultFound("Some of the entities to update do not exist.")
+        return [rows[id] for id in ids]
+
+    def bulk_update_queryset(self, *, model: Type[ModelType]) -> Update:
+        """Override for custom bulk update logic."""
+        return update(model)
+
+    def bulk_fetch_queryset(self, *, model: Type[ModelType], ids: list[int]) -> Select[Any]:
+        """Statement to read back the updated rows as plain column values."""
+        return select(*model.__table__.columns).where(model.id.in_(ids))  # type: ignore[attr-defined]
+
+
+class AsyncBulkDestroyModelMixin(Generic[ModelType]):
+    session: AsyncSession
+    get_model: Callable[..., Type[ModelType]]
+
+    async def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        """
+        Delete all the entities in a single `DELETE ... RETURNING` statement.
+
+        Unlike `destroy`, the instances are never loaded, hence `perform_destroy` is not called.
+        Override `bulk_destroy_queryset` for custom behavior, e.g., soft deletes.
+
+        Args:
+            ids: IDs of the entities to delete.
+
+        Returns
+        -------
+            IDs of the deleted entities.
+
+        Raises
+        ------
+            NoResultFound: If any entity does not exist.
+        """
+        if not ids:
+            return []
+        result = await self.session.execute(self.bulk_destroy_queryset(model=self.get_model(), ids=ids))
+        deleted = list(result.scalars())
+        if len(deleted) != len(set(ids)):
+            raise NoResultFound("Some of the entities to delete do not exist.")
+        return deleted
+
+    def bulk_destroy_queryset(self, *, model: Type[ModelType], ids: list[int]) -> Delete:
+        """Override for custom bulk delete logic."""
+        return delete(model).where(model.id.in_(ids)).returning(model.id)  # type: ignore[attr-defined]
+
+
+class AsyncBaseRepository(
+    AsyncListModelMixin[ModelType],
+    AsyncRetrieveModelMixin[ModelType],
+    AsyncCreateModelMixin[ModelType],
+    AsyncUpdateModelMixin[ModelType],
+    AsyncDestroyModelMixin[ModelType],
+    AsyncBulkCreateModelMixin[ModelType],
+    AsyncBulkUpdateModelMixin[ModelType],
+    AsyncBulkDestroyModelMixin[ModelType],
+    LoadOptionsMixin,
+):
+    model: Optional[Type[ModelType]]
+
+    def __init__(self, *, session: AsyncSession):
+        """
+        Args:
+            session: SQLAlchemy async session instance.
+        """
+        self.session = session
+
+    def get_model(self) -> Type[ModelType]:
+        """Get the model associated with this repository. Raise exception if not set."""
+        if self.model is None:
+            cls = self.__class__.__name__
+            raise ImproperlyConfigured(
+                f"{cls} is missing a Model. Define {cls}.model, or override {cls}.get_model()."
+            )
+        return self.model
+
+    def get_base_query(self, *, include: Optional[Sequence[str]] = None) -> Select[tuple[ModelType]]:
+        """Provide the base statement associated with the model of the repository, with its loader options."""
+        return select(self.get_model()).options(*self.get_load_options(include=include))
+
+    async def perform_commit(self) -> None:
+        await self.session.commit()
@@ -0,0 +1,178 @@
+"""
+Read-through entity cache for repositories.
+
+`retrieve_by_id` is served from a `CacheBackend` holding the column values of each entity by
+`(table, id)`, so hot rows skip the database. Writes going through the repository (`update`,
+`destroy` and the bulk paths) invalidate the affected keys right away and once more after the
+transaction commits, so a concurrent read cannot keep a value the commit made stale.
+
+Entities are only cached out of reads from the primary: a replica may still return the values a
+commit just invalidated (see `utils.database.routing`), which would then outlive its lag in the cache.
+"""
+
+from typing import Any, ClassVar, Hashable, Optional, Sequence
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from utils.cache import CacheBackend
+
+from .routing import reads_from_replica
+
+PENDING_INVALIDATIONS = "cache_pending_invalidations"
+
+# NOTE: Backend of every repository class with caching enabled, by class name, for monitoring
+entity_caches: dict[str, CacheBackend] = {}
+
+
+class BaseEntityCacheMixin:
+    """
+    Attributes:
+        cache: Backend holding the cached entities, caching is disabled when `None`.
+        cache_ttl: Time to live of the entries, the backend default when `None`.
+    """
+
+    cache: ClassVar[Optional[CacheBackend]] = None
+    cache_ttl: ClassVar[Optional[float]] = None
+
+    session: Any
+    get_model: Any
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.cache is not None:
+            entity_caches[cls.__name__] = cls.cache
+
+    def get_cache_key(self, id: Any) -> Hashable:
+        return (self.get_model().__tablename__, id)
+
+    def use_cache(self, include: Optional[Sequence[str]]) -> bool:
+        """Entities embedding relationships are not cached, only their own columns are."""
+        return self.cache is not None and not include
+
+    def get_cached_identity(self, id: Any) -> Optional[Any]:
+        """The instance already present in the session, if any; it always wins over the cache."""
+        mapper = inspect(self.get_model())
+        return self.session.identity_map.get(mapper.identity_key_from_primary_key((id,)))
+
+    def cache_entity(self, id: Any, instance: Any) -> None:
+        """
+        Store the column values of `instance`, unless some of them were not loaded (projections) or the
+        session reads from a replica.
+        """
+        state = inspect(instance)
+        columns = [attr.key for attr in state.mapper.column_attrs]
+        if (
+            self.cache is None
+            or reads_from_replica(self.session)
+            or any(key in state.unloaded for key in columns)
+        ):
+            return
+        self.cache.set(self.get_cache_key(id), {key: state.dict[key] for key in columns}, ttl=self.cache_ttl)
+
+    def build_cached_entity(self, data: dict[str, Any]) -> Any:
+        """Detached instance out of cached column values, to be merged into the session."""
+        instance = self.get_model()(**data)
+        make_transient_to_detached(instance)
+        return instance
+
+    def invalidate_cache(self, ids: Sequence[Any]) -> None:
+        """Drop `ids` now and, through `PENDING_INVALIDATIONS`, once again after commit."""
+        if self.cache is None or not ids:
+            return
+        keys = [self.get_cache_key(id) for id in ids]
+        self.cache.delete(*keys)
+        self.session.info.setdefault(PENDING_INVALIDATIONS, []).append((self.cache, keys))
+
+
+class EntityCacheMixin(BaseEntityCacheMixin):
+    """
+    Read-through cache of `retrieve_by_id`, to be listed before `BaseRepository`:
+
+        class AccountRepository(EntityCacheMixin, BaseRepository[Account]):
+            cache = LRUCache(maxsize=1024, ttl=60)
+    """
+
+    def retrieve_by_id(self, *, id: int, include: Optional[Sequence[str]] = None, **kwargs: Any) -> Any:
+        if not self.use_cache(include):
+            return super().retrieve_by_id(id=id, include=include, **kwargs)  # type: ignore[misc]
+        if (instance := self.get_cached_identity(id)) is not None:
+            return instance
+        if (data := self.cache.get(self.get_cache_key(id))) is not None:  # type: ignore[union-attr]
+            return self.session.merge(self.build_cached_entity(data), load=False)
+        instance = super().retrieve_by_id(id=id, include=include, **kwargs)  # type: ignore[misc]
+        self.cache_entity(id, instance)
+        return instance
+
+    def update(self, *, id: int, entity: dict[str, Any]) -> Any:
+        instance = super().update(id=id, entity=entity)  # type: ignore[misc]
+        self.invalidate_cache([id])
+        return instance
+
+    def destroy(self, *, id: int) -> None:
+        super().destroy(id=id)  # type: ignore[misc]
+        self.invalidate_cache([id])
+
+    def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = super().bulk_update(entities=entities)  # type: ignore[misc]
+        self.invalidate_cache([entity["id"] for entity in entities])
+        return rows  # type: ignore[no-any-return]
+
+    def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        deleted = super().bulk_destroy(ids=ids)  # type: ignore[misc]
+        self.invalidate_cache(deleted)
+        return deleted  # type: ignore[no-any-return]
+
+
+class AsyncEntityCacheMixin(BaseEntityCacheMixin):
+    """
+    Read-through cache of `retrieve_by_id`, to be listed before `AsyncBaseRepository`:
+
+        class AccountRepository(AsyncEntityCacheMixin, AsyncBaseRepository[Account]):
+            cache = LRUCache(maxsize=1024, ttl=60)
+    """
+
+    async def retrieve_by_id(self, *, id: int, include: Optional[Sequence[str]] = None, **kwargs: Any) -> Any:
+        if not self.use_cache(include):
+            return await super().retrieve_by_id(id=id, include=include, **kwargs)  # type: ignore[misc]
+        if (instance := self.get_cached_identity(id)) is not None:
+            return instance
+        if (data := self.cache.get(self.get_cache_key(id))) is not None:  # type: ignore[union-attr]
+            return await self.session.merge(self.build_cached_entity(data), load=False)
+        instance = await super().retrieve_by_id(id=id, include=include, **kwargs)  # type: ignore[misc]
+        self.cache_entity(id, instance)
+        return instance
+
+    async def update(self, *, id: int, entity: dict[str, Any]) -> Any:
+        instance = await super().update(id=id, entity=entity)  # type: ignore[misc]
+        self.invalidate_cache([id])
+        return instance
+
+    async def destroy(self, *, id: int) -> None:
+        await super().destroy(id=id)  # type: ignore[misc]
+        self.invalidate_cache([id])
+
+    async def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = await super().bulk_update(entities=entities)  # type: ignore[misc]
+        self.invalidate_cache([entity["id"] for entity in entities])
+        return rows  # type: ignore[no-any-return]
+
+    async def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        deleted = await super().bulk_destroy(ids=ids)  # type: ignore[misc]
+        self.invalidate_cache(deleted)
+        return deleted  # type: ignore[no-any-return]
+
+
+def get_entity_cache_stats() -> dict[str, dict[str, Any]]:
+    return {name: cache.stats() for name, cache in entity_caches.items()}
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for cache, keys in session.info.pop(PENDING_INVALIDATIONS, ()):
+        cache.delete(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS, None)
@@ -0,0 +1,232 @@
+"""Custom SQL constructs compiled per dialect."""
+
+import json
+from typing import Any
+
+from sqlalchemy import (
+    Boolean,
+    Date,
+    Float,
+    Select,
+    String,
+    bindparam,
+    cast,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import coercions, roles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import (
+    ClauseElement,
+    ColumnClause,
+    ColumnElement,
+    ColumnExpressionArgument,
+    Executable,
+)
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class EstimatedCount(Executable, ClauseElement):
+    """
+    Planner estimate of the number of rows returned by `query`.
+
+    On PostgreSQL it compiles to `EXPLAIN (FORMAT JSON) <query>`, whose top plan node carries the
+    estimated row count (see `parse_estimated_count`). Other dialects have no usable estimate and
+    fall back to an exact `SELECT count(*)` over the query.
+    """
+
+    inherit_cache = True
+    _traverse_internals = [("query", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, query: Select[Any]) -> None:
+        self.query = query
+
+
+@compiles(EstimatedCount)
+def _compile_estimated_count(element: EstimatedCount, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return compiler.process(select(func.count()).select_from(element.query.subquery()), **kwargs)
+
+
+@compiles(EstimatedCount, "postgresql")
+def _compile_estimated_count_postgresql(element: EstimatedCount, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kwargs)
+
+
+def parse_estimated_count(value: Any) -> int:
+    """Row count out of the `EstimatedCount` result, either a plain count or an `EXPLAIN` JSON plan."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    if isinstance(value, list):
+        value = value[0]["Plan"]["Plan Rows"]
+    return int(value or 0)
+
+
+class MonthStart(ColumnElement[Any]):
+    """
+    First day of the month of the date `column`, e.g. `2024-12-01` for `2024-12-24`.
+
+    On PostgreSQL it compiles to `CAST(date_trunc('month', column) AS DATE)`, on SQLite to
+    `date(column, 'start of month')`.
+    """
+
+    inherit_cache = True
+    type = Date()
+    _traverse_internals = [("column", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, column: ColumnExpressionArgument[Any]) -> None:
+        self.column: ColumnElement[Any] = coercions.expect(roles.ExpressionElementRole, column)
+
+    @property
+    def _from_objects(self) -> list[Any]:
+        return self.column._from_objects
+
+
+@compiles(MonthStart)
+def _compile_month_start(element: MonthStart, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return compiler.process(
+        cast(func.date_trunc(literal_column("'month'"), element.column), Date()), **kwargs
+    )
+
+
+@compiles(MonthStart, "sqlite")
+def _compile_month_start_sqlite(element: MonthStart, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return compiler.process(func.date(element.column, literal_column("'start of month'")), **kwargs)
+
+
+def get_search_table_name(table_name: str, column_name: str) -> str:
+    """Name of the SQLite FTS5 table indexing a column, e.g. `transactions_description_fts`."""
+    return f"{table_name}_{column_name}_fts"
+
+
+def get_fts_query(value: str) -> str:
+    """
+    FTS5 query out of free text: every word of at least 3 characters (the trigram size) as a quoted
+    string, so operators and quotes in the text are matched literally. `""`, matching nothing, when no
+    word is left.
+    """
+    words = [word.replace('"', '""') for word in value.split() if len(word) >= 3]
+    return " ".join(f'"{word}"' for word in words) or '""'
+
+
+def get_like_pattern(value: str) -> str:
+    """`%value%` pattern with the `LIKE` wildcards of `value` escaped by a backslash."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class BaseTextSearch(ColumnElement[Any]):
+    """
+    Search of free text `value` in `column`. Both the text and the forms derived from it (the `LIKE`
+    pattern and the FTS5 query) are bound parameters, so the statement is cached once whatever the text.
+    """
+
+    inherit_cache = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("value", InternalTraversal.dp_clauseelement),
+        ("pattern", InternalTraversal.dp_clauseelement),
+        ("fts_query", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column: ColumnExpressionArgument[Any], value: str) -> None:
+        self.column: ColumnClause[Any] = coercions.expect(roles.ColumnsClauseRole, column)
+        self.value = bindparam(None, value, String())
+        self.pattern = bindparam(None, get_like_pattern(value), String())
+        self.fts_query = bindparam(None, get_fts_query(value), String())
+
+    def get_fts_table(self, compiler: SQLCompiler) -> tuple[str, str]:
+        """Quoted names of the FTS5 table indexing the column and of the column table."""
+        table = self.column.table
+        name = get_search_table_name(table.name, self.column.name)  # type: ignore[attr-defined]
+        return compiler.preparer.quote(name), compiler.preparer.format_table(table)  # type: ignore[arg-type]
+
+
+class TextSearch(BaseTextSearch):
+    """
+    Whether `column` matches the free text `value`.
+
+    - PostgreSQL: a full text match of its words (`to_tsvector @@ websearch_to_tsquery`) or a case
+      insensitive substring match (`ILIKE`), both served by the GIN indexes of the search migration.
+    - SQLite: a match in the FTS5 trigram table of the column, i.e. a case insensitive substring match of
+      every word. Text with no word long enough to be indexed falls back to a `LIKE` scan.
+    - Others: a case insensitive substring match.
+    """
+
+    inherit_cache = True
+    type = Boolean()
+
+
+class TextSearchRank(BaseTextSearch):
+    """
+    Relevance of `column` for the free text `value`, the higher the better.
+
+    - PostgreSQL: `ts_rank` of the full text match plus the trigram `similarity`.
+    - SQLite: the negated FTS5 `bm25` rank, `0` when not matching.
+    - Others: `0.0`, results keep their order.
+    """
+
+    inherit_cache = True
+    type = Float()
+
+
+@compiles(TextSearch)
+def _compile_text_search(element: TextSearch, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return compiler.process(element.column.ilike(element.pattern, escape="\\"), **kwargs)
+
+
+def _get_tsvector(element: BaseTextSearch) -> ColumnElement[Any]:
+    # NOTE: Same expression as the GIN index of the search migration, otherwise the index is not used
+    return func.to_tsvector(literal_column("'simple'"), func.coalesce(element.column, literal_column("''")))
+
+
+def _get_tsquery(element: BaseTextSearch) -> ColumnElement[Any]:
+    return func.websearch_to_tsquery(literal_column("'simple'"), element.value)
+
+
+@compiles(TextSearch, "postgresql")
+def _compile_text_search_postgresql(element: TextSearch, compiler: SQLCompiler, **kwargs: Any) -> str:
+    condition = or_(
+        _get_tsvector(element).bool_op("@@")(_get_tsquery(element)),
+        element.column.ilike(element.pattern, escape="\\"),
+    )
+    return compiler.process(condition.self_group(), **kwargs)
+
+
+@compiles(TextSearch, "sqlite")
+def _compile_text_search_sqlite(element: TextSearch, compiler: SQLCompiler, **kwargs: Any) -> str:
+    fts_table, table = element.get_fts_table(compiler)
+    fts_query = compiler.process(element.fts_query, **kwargs)
+    like = compiler.process(element.column.ilike(element.pattern, escape="\\"), **kwargs)
+    return (
+        f"({table}.rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH {fts_query})"
+        f" OR ({fts_query} = '\"\"' AND {like}))"
+    )
+
+
+@compiles(TextSearchRank)
+def _compile_text_search_rank(element: TextSearchRank, compiler: SQLCompiler, **kwargs: Any) -> str:
+    # NOTE: Not a plain `0`, an integer in `ORDER BY` refers to a column position
+    return "0.0"
+
+
+@compiles(TextSearchRank, "postgresql")
+def _compile_text_search_rank_postgresql(
+    element: TextSearchRank, compiler: SQLCompiler, **kwargs: Any
+) -> str:
+    rank = func.ts_rank(_get_tsvector(element), _get_tsquery(element)) + func.similarity(
+        element.column, element.value
+    )
+    return compiler.process(rank.self_group(), **kwargs)
+
+
+@compiles(TextSearchRank, "sqlite")
+def _compile_text_search_rank_sqlite(element: TextSearchRank, compiler: SQLCompiler, **kwargs: Any) -> str:
+    fts_table, table = element.get_fts_table(compiler)
+    fts_query = compiler.process(element.fts_query, **kwargs)
+    return (
+        f"coalesce((SELECT -rank FROM {fts_table} WHERE {fts_table} MATCH {fts_query}"
+        f" AND {fts_table}.rowid = {table}.rowid), 0)"
+    )
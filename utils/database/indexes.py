@@ -0,0 +1,143 @@
+"""
+Index advisor.
+
+`advise_indexes` checks the filters (`FilterSchema` lookups and `search_fields`) and sorts
+(`ordering_fields`) a filter manager declares against the indexes of its table, and reports the ones
+no index can serve, i.e. the ones answered by a sequential scan. Index kinds follow PostgreSQL:
+
+- B-tree: equality, range, `IS NULL` and prefix lookups, and sorts, on a column whose preceding ones can
+  be pinned by an equality lookup (e.g. `(account_id, date)` filters and sorts by `date` once filtered
+  by `account_id`).
+- BRIN: equality and range lookups on their leading column, no sorts.
+- Search indexes (`utils.database.search`): text lookups (`ieq`, `contains`, `icontains`,
+  `startswith`, `search`).
+
+Filters are optional, a sort is checked on its own (the unfiltered list) and along with each declared
+equality lookup separately, e.g. `(account_id, date)` only serves `-date` once filtered by `account_id`.
+
+`not_in` lookups are never served by an index and are not reported.
+"""
+
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import Column, Table, UniqueConstraint
+from sqlalchemy.sql.elements import UnaryExpression
+
+from .search import text_search_columns
+
+EQUALITY_LOOKUPS = ("eq", "in", "isnull")
+RANGE_LOOKUPS = ("gt", "gte", "lt", "lte", "range")
+TEXT_LOOKUPS = ("ieq", "contains", "icontains", "startswith", "search")
+
+
+class IndexAdvice(NamedTuple):
+    """
+    A filter or sort of `field` (as declared, e.g. `date__gt` or `-date`) with no supporting index, sorts
+    along with the equality lookup they were checked with, if any.
+    """
+
+    table: str
+    field: str
+    usage: str
+    declaration: str
+    filter: Optional[str] = None
+
+    def __str__(self) -> str:
+        message = f"{self.table}.{self.field}: no index supports the {self.usage} `{self.declaration}`"
+        return f"{message} filtered by `{self.filter}`" if self.filter else message
+
+
+class IndexColumns(NamedTuple):
+    name: Optional[str]
+    method: str
+    columns: tuple[str, ...]
+
+
+def get_index_column_name(expression: Any) -> Optional[str]:
+    """Column name of an index expression (`date`, `date DESC`), `None` for any other expression."""
+    if isinstance(expression, UnaryExpression):
+        expression = expression.element
+    return expression.name if isinstance(expression, Column) else None
+
+
+def get_table_indexes(table: Table) -> list[IndexColumns]:
+    """
+    Columns of every index of `table`, along with its method, including the ones backing the primary
+    key and unique constraints. Columns stop at the first expression, only the prefix is usable.
+    """
+    indexes = [IndexColumns(table.primary_key.name, "btree", tuple(c.name for c in table.primary_key))]
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            indexes.append(IndexColumns(constraint.name, "btree", tuple(c.name for c in constraint.columns)))
+    for index in table.indexes:
+        columns: list[str] = []
+        for expression in index.expressions:
+            name = get_index_column_name(expression)
+            if name is None:
+                break
+            columns.append(name)
+        method = index.dialect_options["postgresql"]["using"] or "btree"
+        indexes.append(IndexColumns(index.name, method.lower(), tuple(columns)))  # type: ignore[arg-type]
+    for column in table.columns:
+        if column.unique:
+            indexes.append(IndexColumns(None, "btree", (column.name,)))
+    return indexes
+
+
+def supports_filter(
+    table: Table, indexes: list[IndexColumns], field: str, lookup: str, pinned: Optional[set[str]] = None
+) -> bool:
+    if lookup in TEXT_LOOKUPS and (table.name, field) in text_search_columns:
+        return True
+    if lookup in EQUALITY_LOOKUPS or lookup in RANGE_LOOKUPS:
+        methods: tuple[str, ...] = ("btree", "brin")
+    elif lookup == "startswith":
+        methods = ("btree",)
+    else:
+        return False
+    return any(
+        index.method in methods
+        and is_prefix_pinned(index, field, (pinned or set()) if index.method == "btree" else set())
+        for index in indexes
+    )
+
+
+def is_prefix_pinned(index: IndexColumns, field: str, pinned: set[str]) -> bool:
+    """Whether `field` is a column of `index` whose preceding columns are all `pinned`."""
+    return field in index.columns and set(index.columns[: index.columns.index(field)]) <= pinned
+
+
+def supports_ordering(indexes: list[IndexColumns], field: str, pinned: set[str]) -> bool:
+    return any(index.method == "btree" and is_prefix_pinned(index, field, pinned) for index in indexes)
+
+
+def advise_indexes(filter_manager: Any, filter_schema: Any) -> list[IndexAdvice]:
+    """
+    Filters and sorts declared by `filter_manager` (a `BaseFilterManager` class) and `filter_schema`
+    (its `FilterSchema` class) with no supporting index.
+    """
+    table: Table = filter_manager.model.__table__
+    indexes = get_table_indexes(table)
+    lookups: dict[str, tuple[str, str]] = filter_schema.__filter_lookups__
+    pinned = {field for field, lookup in lookups.values() if lookup in ("eq", "in")}
+
+    advice = [
+        IndexAdvice(table.name, field, "filter", name)
+        for name, (field, lookup) in lookups.items()
+        if lookup != "not_in" and not supports_filter(table, indexes, field, lookup, pinned)
+    ]
+    advice.extend(
+        IndexAdvice(table.name, field, "search", field)
+        for field in filter_manager.search_fields
+        if not supports_filter(table, indexes, field, "search")
+    )
+    for ordering in filter_manager.ordering_fields:
+        field = ordering.lstrip("+-")
+        if not supports_ordering(indexes, field, set()):
+            advice.append(IndexAdvice(table.name, field, "ordering", ordering))
+        advice.extend(
+            IndexAdvice(table.name, field, "ordering", ordering, name)
+            for name, (pinned_field, lookup) in lookups.items()
+            if lookup in ("eq", "in") and not supports_ordering(indexes, field, {pinned_field})
+        )
+    return advice
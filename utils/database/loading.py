@@ -0,0 +1,47 @@
+from typing import ClassVar, Mapping, Optional, Sequence
+
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.base import ExecutableOption
+
+from utils.exceptions.client import BadRequestException
+
+
+class LoadOptionsMixin:
+    """
+    Declarative loader strategies for the base query of a repository.
+
+    Attributes:
+        load_options: Options always applied, e.g. `(selectinload(Account.transactions),)`.
+        include_options: Options applied on demand by name through `include=`,
+            e.g. `{"category": joinedload(Transaction.category)}`.
+        strict_loading: Apply `raiseload("*")` so any relationship that was not explicitly loaded
+            raises instead of firing a lazy SELECT per row.
+    """
+
+    load_options: ClassVar[Sequence[ExecutableOption]] = ()
+    include_options: ClassVar[Mapping[str, ExecutableOption]] = {}
+    strict_loading: ClassVar[bool] = False
+
+    def get_load_options(self, *, include: Optional[Sequence[str]] = None) -> list[ExecutableOption]:
+        """
+        Args:
+            include: Names of `include_options` to apply, each item may hold several comma separated names.
+
+        Returns
+        -------
+            Loader options for the base query.
+
+        Raises
+        ------
+            BadRequestException: If any name is not declared in `include_options`.
+        """
+        options = list(self.load_options)
+        for name in dict.fromkeys(name.strip() for item in include or () for name in item.split(",")):
+            if not name:
+                continue
+            if name not in self.include_options:
+                raise BadRequestException(detail=f"Relationship `{name}` cannot be included")
+            options.append(self.include_options[name])
+        if self.strict_loading:
+            options.append(raiseload("*"))
+        return options
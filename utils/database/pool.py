@@ -0,0 +1,123 @@
+"""
+Connection pool instrumentation.
+
+`PoolMetrics` listens to the pool events of an engine and, together with the instrumented pool classes,
+keeps the figures needed to size the pool: checkout wait times, connections in use, overflow and
+invalidations.
+"""
+
+import threading
+from time import perf_counter
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, QueuePool
+
+
+class PoolMetrics:
+    """Counters of a connection pool, updated from its events."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def attach(self, engine: Engine) -> None:
+        """Listen to the pool events of `engine` (kept when the pool is recreated)."""
+        if isinstance(engine.pool, InstrumentedPoolMixin):
+            engine.pool.metrics = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_invalidate)
+
+    def record_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        """Counters along with the live state of `pool`."""
+        data: dict[str, Any] = {
+            "pool": pool.__class__.__name__,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+        }
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "size": pool.size(),
+                    "in_use": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                    "max_overflow": pool._max_overflow,
+                }
+            )
+        return data
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection: Any, connection_record: ConnectionPoolEntry, proxy: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(
+        self,
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+        exception: Optional[BaseException],
+    ) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+
+class InstrumentedPoolMixin:
+    """Measure how long every checkout waits for a connection, pool events do not expose it."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(perf_counter() - start, timed_out=timed_out)
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool  # type: ignore[no-any-return]
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
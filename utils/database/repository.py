@@ -1,89 +1,241 @@
-from typing import Any, Callable, Generic, Optional, Protocol, Type, TypeVar
-
+import warnings
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Generic,
+    Iterator,
+    Optional,
+    Protocol,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy import Delete, Executable, Insert, Select, Update, delete, func, insert, select, update
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import DeclarativeBase, Query, Session
+from sqlalchemy.orm.exc import StaleDataError
 
 from utils.exceptions.generic import ImproperlyConfigured
 
+from .loading import LoadOptionsMixin
+
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
 
+STREAM_CHUNK_SIZE = 500
+
 
 class FilterManagerProtocol(Protocol):  # pragma: no cover
-    def filter_queryset(self, query: Query[ModelType]) -> Query[ModelType]:  # type: ignore
+    def filter_queryset(self, query: Select[Any]) -> Select[Any]:
+        pass
+
+    def order_by_queryset(self, query: Select[Any]) -> Select[Any]:
         pass
 
-    def order_by_queryset(self, query: Query[ModelType]) -> Query[ModelType]:  # type: ignore
+
+class ProjectionManagerProtocol(Protocol):  # pragma: no cover
+    def project_queryset(self, query: Select[Any]) -> Select[Any]:
         pass
 
 
 class PaginationManagerProtocol(Protocol):  # pragma: no cover
-    def paginate_queryset(self, query: Query[ModelType]) -> Query[ModelType]:  # type: ignore
+    def paginate_queryset(self, query: Select[Any]) -> Select[Any]:
+        pass
+
+    def count_queryset(self, query: Select[Any]) -> Optional[Executable]:
         pass
 
+    def set_count(self, value: Any) -> None:
+        pass
+
+    def paginate_results(self, results: list[Any]) -> list[Any]:  # type: ignore
+        pass
+
+
+def as_statement(query: Union[Select[Any], Query[Any]]) -> Select[Any]:
+    """
+    Compatibility shim for `*_queryset` overrides still written against the legacy `Query` API.
+
+    Repositories build and execute 2.0 `select()` statements, a `Query` returned by an override is
+    turned into its equivalent statement (with a `DeprecationWarning`) so it can be executed likewise.
+    """
+    if isinstance(query, Query):
+        warnings.warn(
+            "Returning a legacy `Query` from a `*_queryset` method is deprecated, return a `select()`.",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        return query.statement  # type: ignore[return-value]
+    return query
+
 
 class ListModelMixin(Generic[ModelType]):
     session: Session
-    get_base_query: Callable[..., Query[ModelType]]
+    get_model: Callable[..., Type[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
+    last_modified_field: ClassVar[str] = "updated_at"
 
     def list(
         self,
         *,
         filter_manager: Optional[FilterManagerProtocol] = None,
         pagination_manager: Optional[PaginationManagerProtocol] = None,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
         **filters: Any,
     ) -> list[ModelType]:
         """
         Args:
             filter_manager: Object implementing `filter_queryset` and `order_by_queryset` methods
-            pagination_manager: Object implementing `paginate_queryset` method
+            pagination_manager: Object implementing `paginate_queryset`, `count_queryset`, `set_count`
+                and `paginate_results` methods
+            projection_manager: Object implementing `project_queryset` method
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
             **filters: Filters to refine the query results.
 
         Returns
         -------
             List of ModelType instances.
         """
-        base_query = self.get_base_query()
-        query = self.list_queryset(base_query, **filters)
+        base_query = self.get_base_query(include=include)
+        query = as_statement(self.list_queryset(base_query, **filters))
         if filter_manager:
             query = filter_manager.filter_queryset(query)
             query = filter_manager.order_by_queryset(query)
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
         if pagination_manager:
             query = pagination_manager.paginate_queryset(query)
-        return query.all()
+            if (count_query := pagination_manager.count_queryset(query)) is not None:
+                pagination_manager.set_count(self.session.scalar(count_query))
+            return pagination_manager.paginate_results(list(self.session.execute(query).all()))
+        return list(self.session.scalars(query).all())
+
+    def stream(
+        self,
+        *,
+        filter_manager: Optional[FilterManagerProtocol] = None,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> Iterator[ModelType]:
+        """
+        Iterate over the list results through a server-side cursor, `chunk_size` rows at a time.
+
+        The query is built right away, so invalid arguments (e.g. an unknown `include`) raise before the
+        first row is requested, i.e. before a streaming response starts.
 
-    def list_queryset(self, base_query: Query[ModelType], **filters: Any) -> Query[ModelType]:
+        Args:
+            filter_manager: Object implementing `filter_queryset` and `order_by_queryset` methods
+            projection_manager: Object implementing `project_queryset` method
+            chunk_size: Number of rows fetched and built as ModelType instances per round trip.
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
+            **filters: Filters to refine the query results.
+
+        Returns
+        -------
+            Iterator of ModelType instances.
+        """
+        base_query = self.get_base_query(include=include)
+        query = as_statement(self.list_queryset(base_query, **filters))
+        if filter_manager:
+            query = filter_manager.filter_queryset(query)
+            query = filter_manager.order_by_queryset(query)
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        return self.stream_query(query.execution_options(yield_per=chunk_size))
+
+    def stream_query(self, query: Select[tuple[ModelType]]) -> Iterator[ModelType]:
+        result = self.session.scalars(query)
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    def list_queryset(self, base_query: Select[tuple[ModelType]], **filters: Any) -> Select[tuple[ModelType]]:
         """Override for custom list fetching logic."""
         return base_query.filter_by(**filters)
 
+    def list_validators(
+        self, *, filter_manager: Optional[FilterManagerProtocol] = None, **filters: Any
+    ) -> tuple[Optional[datetime], int]:
+        """
+        Cheap validator of the `list` results under the same filters, for conditional requests.
+
+        Args:
+            filter_manager: Object implementing `filter_queryset` method
+            **filters: Filters to refine the query results.
+
+        Returns
+        -------
+            Latest `last_modified_field` value (`None` when there are no rows) and number of rows.
+        """
+        query = as_statement(self.list_queryset(self.get_base_query(), **filters))
+        if filter_manager:
+            query = filter_manager.filter_queryset(query)
+        column = getattr(self.get_model(), self.last_modified_field)
+        # NOTE: Entities (and their loader options) are replaced by the aggregates, the WHERE clause is kept
+        query = query.with_only_columns(func.max(column), func.count(), maintain_column_froms=True)
+        result = self.session.execute(query.order_by(None))
+        last_modified, count = result.one()
+        return last_modified, count
+
 
 class RetrieveModelMixin(Generic[ModelType]):
     session: Session
-    get_base_query: Callable[..., Query[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
 
-    def retrieve_by_id(self, *, id: int) -> ModelType:
+    def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> ModelType:
         """
         Args:
             id: ID of the entity to retrieve.
+            projection_manager: Object implementing `project_queryset` method
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
 
         Returns
         -------
             Single ModelType instance.
         """
-        base_query = self.get_base_query()
-        return self.retrieve_queryset(base_query, id=id).one()
+        query = as_statement(self.retrieve_queryset(self.get_base_query(include=include), id=id))
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        return self.session.scalars(query).one()
 
-    def retrieve(self, **filters: Any) -> ModelType:
+    def retrieve(
+        self,
+        *,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> ModelType:
         """
         Args:
+            projection_manager: Object implementing `project_queryset` method
+            include: Names of the relationships to eager load, see `LoadOptionsMixin.include_options`.
             **filters: Filters to refine the query results.
 
         Returns
         -------
             Single ModelType instance.
         """
-        base_query = self.get_base_query()
-        return self.retrieve_queryset(base_query, **filters).one()
-
-    def retrieve_queryset(self, base_query: Query[ModelType], **filters: Any) -> Query[ModelType]:
+        query = as_statement(self.retrieve_queryset(self.get_base_query(include=include), **filters))
+        if projection_manager:
+            query = projection_manager.project_queryset(query)
+        return self.session.scalars(query).one()
+
+    def retrieve_queryset(
+        self, base_query: Select[tuple[ModelType]], **filters: Any
+    ) -> Select[tuple[ModelType]]:
         """Override for custom retrieval logic."""
         return base_query.filter_by(**filters)
 
@@ -94,6 +246,11 @@ class CreateModelMixin(Generic[ModelType]):
 
     def create(self, *, entity: dict[str, Any]) -> ModelType:
         """
+        Insert the entity in a single `INSERT ... RETURNING` statement, hydrating the persisted row
+        (ID, defaults and timestamps included).
+
+        When `create_queryset` is overridden the instance it builds is added and flushed instead.
+
         Args:
             entity: Data dictionary to create a new entity.
 
@@ -102,10 +259,22 @@ class CreateModelMixin(Generic[ModelType]):
             Newly created ModelType instance.
         """
         model = self.get_model()
-        new_record = self.create_queryset(model=model, entity=entity)
-        self.session.add(new_record)
-        self.session.flush()
-        return new_record
+        if not self.uses_fast_create():
+            new_record = self.create_queryset(model=model, entity=entity)
+            self.session.add(new_record)
+            self.session.flush()
+            return new_record
+
+        result = self.session.scalars(self.fast_create_queryset(model=model, entity=entity))
+        return result.one()
+
+    def uses_fast_create(self) -> bool:
+        """Whether `create` can insert the row straight away, i.e. `create_queryset` is not overridden."""
+        return type(self).create_queryset is CreateModelMixin.create_queryset
+
+    def fast_create_queryset(self, *, model: Type[ModelType], entity: dict[str, Any]) -> Insert:
+        """Statement inserting the entity and returning it."""
+        return insert(model).values(**entity).returning(model)
 
     def create_queryset(self, *, model: Type[ModelType], entity: dict[str, Any]) -> ModelType:
         """Override for custom object creation logic."""
@@ -114,10 +283,15 @@ class CreateModelMixin(Generic[ModelType]):
 
 class UpdateModelMixin(Generic[ModelType]):
     session: Session
-    get_base_query: Callable[..., Query[ModelType]]
+    get_model: Callable[..., Type[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
 
     def update(self, *, id: int, entity: dict[str, Any]) -> ModelType:
         """
+        Update the entity in a single `UPDATE ... RETURNING` statement.
+
+        Only the given columns are sent, hence partial updates (PATCH) are supported as well.
+
         Args:
             id: ID of the entity to update.
             entity: Data dictionary with updated values.
@@ -129,39 +303,72 @@ class UpdateModelMixin(Generic[ModelType]):
         Raises
         ------
             ValueError: If provided ID doesn't match entity's ID.
+            NoResultFound: If the entity does not exist.
         """
         if id != entity.pop("id", id):
             raise ValueError("ID in the entity does not match the given ID.")
 
-        base_query = self.get_base_query()
-        query = self.update_queryset(base_query, id=id, entity=entity)
-        instance = query.one()
-        self.session.flush()
-        return instance
+        if not entity:
+            result = self.session.scalars(self.get_base_query().filter_by(id=id))
+            return result.one()
 
-    def update_queryset(
-        self, base_query: Query[ModelType], *, id: int, entity: dict[str, Any]
-    ) -> Query[ModelType]:
-        query = base_query.filter_by(id=id)
-        query.update(entity)  # type: ignore[arg-type]
-        return query
+        # NOTE: The returned row hydrates the instance (refreshing it if already in the identity map),
+        #       so no SELECT follows the UPDATE
+        result = self.session.scalars(
+            self.update_queryset(id=id, entity=entity),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )
+        return result.one()
+
+    def update_queryset(self, *, id: int, entity: dict[str, Any]) -> Update:
+        """Override for custom update logic, the statement must return the updated entity."""
+        model = self.get_model()
+        return update(model).filter_by(id=id).values(**entity).returning(model)
 
 
 class DestroyModelMixin(Generic[ModelType]):
     session: Session
-    get_base_query: Callable[..., Query[ModelType]]
+    get_model: Callable[..., Type[ModelType]]
+    get_base_query: Callable[..., Select[tuple[ModelType]]]
 
     def destroy(self, *, id: int) -> None:
         """
+        Delete the entity in a single `DELETE ... RETURNING` statement, the instance is never loaded.
+
+        When `destroy_queryset` or `perform_destroy` are overridden (e.g., soft deletes) the instance is
+        loaded and handed to `perform_destroy` instead.
+
         Args:
             id: ID of the entity to delete.
+
+        Raises
+        ------
+            NoResultFound: If the entity does not exist.
         """
-        base_query = self.get_base_query()
-        instance = self.destroy_queryset(base_query, id=id).one()
-        self.perform_destroy(instance)
-        self.session.flush()
+        if not self.uses_fast_destroy():
+            base_query = self.get_base_query()
+            instance = self.session.scalars(as_statement(self.destroy_queryset(base_query, id=id))).one()
+            self.perform_destroy(instance)
+            self.session.flush()
+            return
+
+        result = self.session.scalars(self.fast_destroy_queryset(id=id))
+        result.one()
+
+    def uses_fast_destroy(self) -> bool:
+        """Whether `destroy` can skip loading the instance, i.e. no destroy hook is overridden."""
+        cls = type(self)
+        return (
+            cls.destroy_queryset is DestroyModelMixin.destroy_queryset
+            and cls.perform_destroy is DestroyModelMixin.perform_destroy
+        )
+
+    def fast_destroy_queryset(self, *, id: int) -> Delete:
+        """Statement deleting the entity without loading it, returning the deleted ID."""
+        model = self.get_model()
+        return delete(model).filter_by(id=id).returning(model.id)  # type: ignore[attr-defined]
 
-    def destroy_queryset(self, base_query: Query[ModelType], *, id: int) -> Query[ModelType]:
+    def destroy_queryset(self, base_query: Select[tuple[ModelType]], *, id: int) -> Select[tuple[ModelType]]:
         """Query to delete of an instance."""
         query = base_query.filter_by(id=id)
         return query  # noqa: RET504
@@ -177,12 +384,124 @@ class DestroyModelMixin(Generic[ModelType]):
         self.session.delete(instance)
 
 
+class BulkCreateModelMixin(Generic[ModelType]):
+    session: Session
+    get_model: Callable[..., Type[ModelType]]
+
+    def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Insert all the entities in a single `executemany` (insertmanyvalues) statement.
+
+        Args:
+            entities: Data dictionaries to create the new entities.
+
+        Returns
+        -------
+            Column values of the newly created rows, in the same order as `entities`.
+        """
+        if not entities:
+            return []
+        result = self.session.execute(self.bulk_create_queryset(model=self.get_model()), entities)
+        return [dict(row) for row in result.mappings()]
+
+    def bulk_create_queryset(self, *, model: Type[ModelType]) -> Insert:
+        """Override for custom bulk insert logic."""
+        return insert(model).returning(*model.__table__.columns, sort_by_parameter_order=True)
+
+
+class BulkUpdateModelMixin(Generic[ModelType]):
+    session: Session
+    get_model: Callable[..., Type[ModelType]]
+
+    def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Update all the entities by primary key in a single `executemany` statement.
+
+        Args:
+            entities: Data dictionaries with updated values, each one including its `id`.
+
+        Returns
+        -------
+            Column values of the updated rows, in the same order as `entities`.
+
+        Raises
+        ------
+            ValueError: If any entity has no `id`.
+            NoResultFound: If any entity does not exist.
+        """
+        if not entities:
+            return []
+        if any(entity.get("id") is None for entity in entities):
+            raise ValueError("Every entity must provide its ID.")
+
+        model = self.get_model()
+        try:
+            self.session.execute(self.bulk_update_queryset(model=model), entities)
+        except StaleDataError as exc:
+            raise NoResultFound("Some of the entities to update do not exist.") from exc
+
+        ids = [entity["id"] for entity in entities]
+        result = self.session.execute(self.bulk_fetch_queryset(model=model, ids=ids))
+        rows = {row["id"]: dict(row) for row in result.mappings()}
+        # NOTE: Drivers without a sane `executemany` rowcount (e.g. asyncpg) never raise `StaleDataError`
+        if set(ids) - rows.keys():
+            raise NoResultFound("Some of the entities to update do not exist.")
+        return [rows[id] for id in ids]
+
+    def bulk_update_queryset(self, *, model: Type[ModelType]) -> Update:
+        """Override for custom bulk update logic."""
+        return update(model)
+
+    def bulk_fetch_queryset(self, *, model: Type[ModelType], ids: list[int]) -> Select[Any]:
+        """Statement to read back the updated rows as plain column values."""
+        return select(*model.__table__.columns).where(model.id.in_(ids))  # type: ignore[attr-defined]
+
+
+class BulkDestroyModelMixin(Generic[ModelType]):
+    session: Session
+    get_model: Callable[..., Type[ModelType]]
+
+    def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        """
+        Delete all the entities in a single `DELETE ... RETURNING` statement.
+
+        Unlike `destroy`, the instances are never loaded, hence `perform_destroy` is not called.
+        Override `bulk_destroy_queryset` for custom behavior, e.g., soft deletes.
+
+        Args:
+            ids: IDs of the entities to delete.
+
+        Returns
+        -------
+            IDs of the deleted entities.
+
+        Raises
+        ------
+            NoResultFound: If any entity does not exist.
+        """
+        if not ids:
+            return []
+        result = self.session.execute(self.bulk_destroy_queryset(model=self.get_model(), ids=ids))
+        deleted = list(result.scalars())
+        if len(deleted) != len(set(ids)):
+            raise NoResultFound("Some of the entities to delete do not exist.")
+        return deleted
+
+    def bulk_destroy_queryset(self, *, model: Type[ModelType], ids: list[int]) -> Delete:
+        """Override for custom bulk delete logic."""
+        return delete(model).where(model.id.in_(ids)).returning(model.id)  # type: ignore[attr-defined]
+
+
 class BaseRepository(
     ListModelMixin[ModelType],
     RetrieveModelMixin[ModelType],
     CreateModelMixin[ModelType],
     UpdateModelMixin[ModelType],
     DestroyModelMixin[ModelType],
+    BulkCreateModelMixin[ModelType],
+    BulkUpdateModelMixin[ModelType],
+    BulkDestroyModelMixin[ModelType],
+    LoadOptionsMixin,
 ):
     model: Optional[Type[ModelType]]
 
@@ -202,9 +521,9 @@ class BaseRepository(
             )
         return self.model
 
-    def get_base_query(self) -> Query[ModelType]:
-        """Provide the base query associated with the model of the repository."""
-        return self.session.query(self.get_model())
+    def get_base_query(self, *, include: Optional[Sequence[str]] = None) -> Select[tuple[ModelType]]:
+        """Provide the base query associated with the model of the repository, with its loader options."""
+        return select(self.get_model()).options(*self.get_load_options(include=include))
 
     def perform_commit(self) -> None:
         self.session.commit()
@@ -0,0 +1,72 @@
+"""
+Primary/replica routing for SQLAlchemy sessions.
+
+Reads are sent to a replica while writes, flushes and locking reads go to the primary. Once a session
+writes (or is told to with `use_primary`) every later statement sticks to the primary, so a request
+always reads its own writes.
+"""
+
+import random
+from typing import Any, Optional, Sequence, Union
+
+from sqlalchemy import Connection, Engine, Select, event
+from sqlalchemy.orm import Session
+
+USE_PRIMARY = "use_primary"
+
+
+class RoutingSession(Session):
+    """
+    Session routing reads to `replicas` and everything else to the primary `bind`.
+
+    When no replicas are given it behaves exactly as a regular `Session`. Each session picks a single
+    replica on its first read, so all its reads share the same snapshot.
+    """
+
+    def __init__(self, *, replicas: Sequence[Engine] = (), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.replicas = list(replicas)
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kwargs: Any) -> Union[Engine, Connection]:
+        if self.replicas and not self.info.get(USE_PRIMARY):
+            if self.is_read(clause):
+                if self._replica is None:
+                    # NOTE: Spreads the load across replicas, nothing security sensitive depends on it
+                    self._replica = random.choice(self.replicas)  # noqa: S311
+                return self._replica
+            use_primary(self)
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def is_read(self, clause: Any) -> bool:
+        """Whether `clause` can be served by a replica, plain `SELECT`s not locking any row."""
+        return not self._flushing and isinstance(clause, Select) and clause._for_update_arg is None
+
+
+def use_primary(session: Union[Session, Any]) -> None:
+    """
+    Send every following statement of `session` to the primary (read-your-writes).
+
+    Accepts either a `Session` or an `AsyncSession`.
+    """
+    session.info[USE_PRIMARY] = True
+
+
+def reads_from_replica(session: Union[Session, Any]) -> bool:
+    """
+    Whether the reads of `session` may be served by a replica, hence lag behind the latest writes.
+
+    Accepts either a `Session` or an `AsyncSession`.
+    """
+    session = getattr(session, "sync_session", session)
+    return bool(getattr(session, "replicas", None)) and not session.info.get(USE_PRIMARY)
+
+
+def set_read_only_transactions(engine: Engine) -> None:
+    """Start every transaction of `engine` with `SET TRANSACTION READ ONLY` (PostgreSQL only)."""
+    if engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "begin")
+    def _set_read_only(connection: Connection) -> None:
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
@@ -1,13 +1,26 @@
+from typing import Any
+
 from pydantic import BaseModel
 
 
 class DatabaseProperties(BaseModel):
     engine: str
+    async_engine: str = "postgresql+asyncpg"
     name: str
     user: str
     password: str
     host: str
     port: int
+    # NOTE: Full async URLs of the read replicas, reads are routed to the primary when empty
+    replica_urls: list[str] = []
+    read_your_writes_seconds: int = 5
+    # Connection pool, see `sqlalchemy.create_engine` for every option
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = True
+    pool_use_lifo: bool = False
 
 
 class DatabaseSettingsMixin(BaseModel):
@@ -16,3 +29,23 @@ class DatabaseSettingsMixin(BaseModel):
     def get_database_url(self) -> str:
         props = self.DATABASE.model_dump()
         return "{engine}://{user}:{password}@{host}:{port}/{name}".format(**props)
+
+    def get_async_database_url(self) -> str:
+        props = self.DATABASE.model_dump()
+        return "{async_engine}://{user}:{password}@{host}:{port}/{name}".format(**props)
+
+    def get_async_replica_urls(self) -> list[str]:
+        return list(self.DATABASE.replica_urls)
+
+    def get_engine_options(self) -> dict[str, Any]:
+        """Keyword arguments for `create_engine`/`create_async_engine` sizing the connection pool."""
+        return self.DATABASE.model_dump(
+            include={
+                "pool_size",
+                "max_overflow",
+                "pool_timeout",
+                "pool_recycle",
+                "pool_pre_ping",
+                "pool_use_lifo",
+            }
+        )
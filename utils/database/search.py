@@ -0,0 +1,71 @@
+"""
+Indexes backing `TextSearch` (see `utils.database.expressions`).
+
+- PostgreSQL: a GIN index over the `to_tsvector` of the column for word matches, and a `pg_trgm` GIN
+  index for substring (`ILIKE`) matches and the `similarity` ranking.
+- SQLite: an FTS5 external content table with the `trigram` tokenizer, kept in sync with the indexed
+  table by triggers. Only the index lives there, the text is read from the table itself.
+
+`install_text_search` creates them along with the table (e.g. `create_all` in tests), migrations use
+`get_text_search_ddl` directly.
+"""
+
+from sqlalchemy import DDL, Table, event
+
+from .expressions import get_search_table_name
+
+# NOTE: Every `(table, column)` with a search index installed, for the index advisor
+text_search_columns: set[tuple[str, str]] = set()
+
+
+def get_text_search_ddl(dialect: str, table: str, column: str) -> tuple[list[str], list[str]]:
+    """
+    Statements creating and dropping the search index of `table.column` for `dialect`, empty for
+    dialects with no index support (searches scan the table then).
+    """
+    if dialect == "postgresql":
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_tsvector ON {table} "
+            f"USING gin (to_tsvector('simple', coalesce({column}, '')))",
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm ON {table} "
+            f"USING gin ({column} gin_trgm_ops)",
+        ], [
+            f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm",
+            f"DROP INDEX IF EXISTS ix_{table}_{column}_tsvector",
+        ]
+    if dialect == "sqlite":
+        fts = get_search_table_name(table, column)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+            f"USING fts5({column}, content='{table}', content_rowid='rowid', tokenize='trigram')",
+            # NOTE: External content tables are maintained by hand, deletes are inserts of the special
+            #       `delete` command carrying the old value
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column}) VALUES (new.rowid, new.{column}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.rowid, old.{column}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {column} ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.rowid, old.{column}); "
+            f"INSERT INTO {fts}(rowid, {column}) VALUES (new.rowid, new.{column}); END",
+            # NOTE: Indexes the rows already in the table
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ], [
+            f"DROP TRIGGER IF EXISTS {fts}_update",
+            f"DROP TRIGGER IF EXISTS {fts}_delete",
+            f"DROP TRIGGER IF EXISTS {fts}_insert",
+            f"DROP TABLE IF EXISTS {fts}",
+        ]
+    return [], []
+
+
+def install_text_search(table: Table, *columns: str) -> None:
+    """Create (and drop) the search index of every column in `columns` along with `table`."""
+    text_search_columns.update((table.name, column) for column in columns)
+    for dialect in ("postgresql", "sqlite"):
+        for column in columns:
+            create, drop = get_text_search_ddl(dialect, table.name, column)
+            for statement in create:
+                event.listen(table, "after_create", DDL(statement).execute_if(dialect=dialect))
+            for statement in drop:
+                event.listen(table, "before_drop", DDL(statement).execute_if(dialect=dialect))
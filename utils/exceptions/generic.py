@@ -2,6 +2,7 @@
 This module provides generic exceptions for applications.
 It allows for more specific error handling and detailed error responses.
 """
+
 from typing import Any, Dict, Optional
 
 from fastapi import HTTPException
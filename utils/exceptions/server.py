@@ -1,6 +1,7 @@
 """
 This module provides exceptions for server errors (5XX).
 """
+
 from fastapi import status
 
 from .generic import HTTPBaseException
@@ -1,7 +1,11 @@
 from .core import BaseFilterManager
-from .schemas import FilterSchema
+from .projection import BaseProjectionManager
+from .schemas import CommaSeparated, CommaSeparatedRange, FilterSchema
 
 __all__ = (
     "BaseFilterManager",
+    "BaseProjectionManager",
+    "CommaSeparated",
+    "CommaSeparatedRange",
     "FilterSchema",
 )
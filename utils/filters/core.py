@@ -1,12 +1,27 @@
-from typing import Any, Callable, Dict, Optional, Type
+from typing import Any, Callable, ClassVar, Dict, NamedTuple, Optional, Type
 
-from sqlalchemy import and_, asc, desc
-from sqlalchemy.orm import DeclarativeBase, Query
+from sqlalchemy import ColumnElement, Select, and_, asc, desc, or_
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
 from sqlalchemy.sql.expression import ColumnExpressionArgument, UnaryExpression
 
+from utils.database.expressions import TextSearch, TextSearchRank
+
 from .schemas import FilterSchema
 
 
+class FilterLookup(NamedTuple):
+    """A compiled filter attribute: the model column and the operation applied to it."""
+
+    column: InstrumentedAttribute[Any]
+    operation: Callable[[Any, Any], Any]
+
+    def __call__(self, value: Any) -> Any:
+        return self.operation(self.column, value)
+
+
+FilterPlan = dict[str, FilterLookup]
+
+
 class BaseFilterManager:
     """
     The BaseFilterManager provides a mapping of operation names to filtering
@@ -28,6 +43,22 @@ class BaseFilterManager:
     ordering : Optional[list[str]]
         List of fields by which the queryset should be ordered.
 
+    search : Optional[str]
+        Free text searched in every field of `search_fields`, results are
+        ordered by relevance unless an ordering is given.
+
+    search_fields : ClassVar[tuple[str, ...]]
+        Fields looked up by `search`, with an index installed through
+        `utils.database.search.install_text_search`.
+
+    ordering_fields : ClassVar[tuple[str, ...]]
+        Sorts clients are expected to request (e.g. `"-date"`). Not enforced,
+        they are checked by the index advisor (`utils.database.indexes`).
+
+    plans : ClassVar[dict[tuple, FilterPlan]]
+        The compiled `FilterPlan` of every (manager, model, filter schema)
+        combination, so columns and operations are resolved only once.
+
     Available operations:
     ---------------------
     - "gt": Greater than
@@ -38,6 +69,14 @@ class BaseFilterManager:
     - "ieq": Case insensitive equality (using `ILIKE`)
     - "contains": Check if column contains the value
     - "icontains": Case insensitive check if column contains the value
+    - "startswith": Check if column starts with the value (`LIKE 'value%'`,
+      which unlike `contains` can use an index)
+    - "in": Check if column is any of the values
+    - "not_in": Check if column is none of the values
+    - "range": Check if column is between both values, inclusive
+    - "isnull": Check if column is (true) or is not (false) null
+    - "search": Check if column matches the free text value, using the
+      full text/trigram index of the column (see `TextSearch`)
 
     Example:
     --------
@@ -53,6 +92,9 @@ class BaseFilterManager:
     """
 
     model: Type[DeclarativeBase]
+    search_fields: ClassVar[tuple[str, ...]] = ()
+    ordering_fields: ClassVar[tuple[str, ...]] = ()
+    plans: ClassVar[dict[tuple[type, type, type], FilterPlan]] = {}
 
     OPERATIONS: Dict[str, Callable[[Any, Any], Any]] = {
         "gt": lambda col, val: col > val,
@@ -63,58 +105,99 @@ class BaseFilterManager:
         "ieq": lambda col, val: col.ilike(val),
         "contains": lambda col, val: col.contains(val),
         "icontains": lambda col, val: col.ilike(f"%{val}%"),
+        "startswith": lambda col, val: col.startswith(val, autoescape=True),
+        # NOTE: `IN` lists render a single expanding bound parameter, so the statement is cached once
+        #       whatever the number of values
+        "in": lambda col, val: col.in_(val),
+        "not_in": lambda col, val: col.not_in(val),
+        "range": lambda col, val: col.between(*val),
+        "isnull": lambda col, val: col.is_(None) if val else col.is_not(None),
+        "search": lambda col, val: TextSearch(col, val),
     }
 
-    def __init__(self, *, filters: FilterSchema, ordering: Optional[list[str]] = None) -> None:
+    def __init__(
+        self, *, filters: FilterSchema, ordering: Optional[list[str]] = None, search: Optional[str] = None
+    ) -> None:
         """
         Parameters:
         -----------
         filters : Type[FilterSchema]
             A schema containing filtering conditions.
             See `filters.schemas.FilterSchema` for more details.
+
+        search : Optional[str]
+            Free text searched in `search_fields`, ignored when blank.
         """
         self.filters: dict[str, Any] = filters.model_dump(exclude_none=True, exclude_unset=True)
+        self.filter_schema = type(filters)
         self.ordering = ordering
+        self.search = search.strip() if search and search.strip() and self.search_fields else None
 
-    def filter_queryset(self, query: Query[DeclarativeBase]) -> Query[DeclarativeBase]:
+    def get_filter_plan(self) -> FilterPlan:
+        """
+        Returns the compiled plan of the filter schema: a `FilterLookup` per
+        filter attribute. It is built on first use and cached afterwards.
+
+        Returns:
+        --------
+        FilterPlan
+            Mapping of filter attribute to its `FilterLookup`.
+        """
+        key = (type(self), self.model, self.filter_schema)
+        plan = self.plans.get(key)
+        if plan is None:
+            plan = {
+                name: FilterLookup(getattr(self.model, field), self.OPERATIONS[op])
+                for name, (field, op) in self.filter_schema.__filter_lookups__.items()
+            }
+            self.plans[key] = plan
+        return plan
+
+    def filter_queryset(self, query: Select[Any]) -> Select[Any]:
         """
         Applies filtering conditions from self.filters to the provided query.
 
         Parameters:
         -----------
-        query : Query
+        query : Select
             The query to be filtered.
 
         Returns:
         --------
-        Query
+        Select
             The filtered query.
         """
-        if not self.filters:
+        if not self.filters and not self.search:
             return query
-        conditions: list[ColumnExpressionArgument[bool]] = []
-        for key, value in self.filters.items():
-            if "__" in key:
-                field, op = key.split("__")
-                column = getattr(self.model, field)
-                conditions.append(self.OPERATIONS[op](column, value))
+        plan = self.get_filter_plan()
+        # NOTE: Values are sent as bound parameters, so the statement compiles to the same cached SQL
+        #       for every request using the same set of filters
+        conditions: list[ColumnExpressionArgument[bool]] = [
+            plan[key](value) for key, value in self.filters.items() if key in plan
+        ]
+        if self.search:
+            conditions.append(
+                or_(*(TextSearch(getattr(self.model, field), self.search) for field in self.search_fields))
+            )
         return query.filter(and_(*conditions))
 
-    def order_by_queryset(self, query: Query[DeclarativeBase]) -> Query[DeclarativeBase]:
+    def order_by_queryset(self, query: Select[Any]) -> Select[Any]:
         """
         Orders the provided query based on self.ordering.
 
         Parameters:
         -----------
-        query : Query
+        query : Select
             The query to be ordered.
 
         Returns:
         --------
-        Query
+        Select
             The ordered query.
         """
         if self.ordering is None:
+            if self.search:
+                return query.order_by(*self.get_search_ordering())
             return query
 
         order_expressions: list[UnaryExpression[DeclarativeBase]] = []
@@ -127,3 +210,34 @@ class BaseFilterManager:
                 order_expressions.append(asc(attr))
 
         return query.order_by(*order_expressions)
+
+    def get_search_ordering(self) -> list[UnaryExpression[Any]]:
+        """
+        Orders by relevance to `search`, most relevant first, then by primary key so ties keep a
+        stable order.
+
+        Returns:
+        --------
+        list[UnaryExpression]
+            The order expressions.
+        """
+        return [desc(self.get_search_rank()), *(asc(column) for column in self.model.__table__.primary_key)]
+
+    def get_search_rank(self) -> ColumnElement[float]:
+        """Relevance to `search`, summed over the `search_fields`."""
+        ranks = [TextSearchRank(getattr(self.model, field), self.search) for field in self.search_fields]
+        return sum(ranks[1:], ranks[0])
+
+    def get_search_keys(self) -> list[tuple[ColumnElement[Any], bool]]:
+        """
+        Relevance as a descending keyset sort key (see `KeysetPagination.leading_keys`), when results
+        are ordered by it, i.e. `search` is set and `ordering` is not.
+
+        Returns:
+        --------
+        list[tuple[ColumnElement, bool]]
+            The `(expression, descending)` sort keys.
+        """
+        if self.search and self.ordering is None:
+            return [(self.get_search_rank(), True)]
+        return []
@@ -0,0 +1,95 @@
+from typing import Any, AsyncIterable, AsyncIterator, ClassVar, Optional, Type
+
+from sqlalchemy import Select
+from sqlalchemy.orm import DeclarativeBase, load_only
+
+from utils.exceptions.client import BadRequestException
+
+
+class BaseProjectionManager:
+    """
+    The BaseProjectionManager restricts the columns loaded and returned for the
+    specified SQL model to a sparse fieldset requested by the client.
+
+    Attributes:
+    -----------
+    model : Type[DeclarativeBase]
+        The SQL model to be projected.
+
+    fields : Optional[list[str]]
+        Validated column names to load and return, `None` meaning every column.
+
+    always_loaded : tuple[str, ...]
+        Columns loaded even when not requested (e.g. `updated_at` to compute
+        conditional request validators), they are not returned unless requested.
+
+    Usage:
+    ------
+    Fields are requested as `?fields=id,amount,date` (or repeating `fields`). The
+    repository applies `project_queryset` so only those columns are selected, and
+    the router shapes the response through `project_entity`/`project_results`.
+    """
+
+    model: Type[DeclarativeBase]
+    always_loaded: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(self, *, fields: Optional[list[str]] = None) -> None:
+        """
+        Parameters:
+        -----------
+        fields : Optional[list[str]]
+            Requested column names, each item may hold several comma separated names.
+
+        Raises:
+        -------
+        BadRequestException
+            If any of the fields is not a column of the model.
+        """
+        self.fields = self.get_fields(fields)
+
+    def get_fields(self, fields: Optional[list[str]]) -> Optional[list[str]]:
+        if not fields:
+            return None
+
+        columns = self.model.__mapper__.column_attrs.keys()
+        names = list(
+            dict.fromkeys(name.strip() for item in fields for name in item.split(",") if name.strip())
+        )
+        for name in names:
+            if name not in columns:
+                raise BadRequestException(detail=f"Field `{name}` is not available")
+        return names or None
+
+    def project_queryset(self, query: Select[Any]) -> Select[Any]:
+        """
+        Loads only the requested columns (primary keys are always loaded).
+
+        Parameters:
+        -----------
+        query : Select
+            The query to be projected.
+
+        Returns:
+        --------
+        Select
+            The projected query.
+        """
+        if self.fields is None:
+            return query
+        names = dict.fromkeys((*self.fields, *self.always_loaded))
+        return query.options(load_only(*(getattr(self.model, name) for name in names)))
+
+    def project_entity(self, entity: Any) -> Any:
+        """Response data of `entity` holding only the requested fields."""
+        if self.fields is None:
+            return entity
+        return {name: getattr(entity, name) for name in self.fields}
+
+    def project_results(self, results: list[Any]) -> list[Any]:
+        """Response data of every entity in `results` holding only the requested fields."""
+        return [self.project_entity(entity) for entity in results]
+
+    async def project_stream(self, results: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """Response data of every entity streamed by `results` holding only the requested fields."""
+        async for entity in results:
+            yield self.project_entity(entity)
@@ -9,6 +9,8 @@ that requires structured data validation.
 Currently, the module contains:
 
 - `FilterSchema`: A schema to validate and process filter-related query parameters.
+- `CommaSeparated`/`CommaSeparatedRange`: Types of the list lookups (`in`, `not_in`
+  and `range`), parsed out of a single comma separated query parameter.
 
 Usage:
 ------
@@ -29,11 +31,45 @@ Note:
 When adding new schemas, ensure to provide necessary validations and documentation
 for clarity and maintainability.
 """
-from typing import Any, Optional, Type, TypeVar
 
-from pydantic import BaseModel, ConfigDict, PrivateAttr, root_validator
+from typing import Annotated, Any, ClassVar, Optional, TypeVar
 
-T = TypeVar("T", bound="FilterSchema")
+from annotated_types import Len
+from pydantic import BaseModel, BeforeValidator, ConfigDict, PrivateAttr
+
+LOOKUPS = (
+    "gt",
+    "gte",
+    "lt",
+    "lte",
+    "eq",
+    "ieq",
+    "contains",
+    "icontains",
+    "startswith",
+    "in",
+    "not_in",
+    "range",
+    "isnull",
+    "search",
+)
+
+ItemType = TypeVar("ItemType")
+
+
+def split_comma_separated(value: Any) -> Any:
+    """Splits `"1,2,3"` into `["1", "2", "3"]`, leaving any other value untouched."""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+
+# NOTE: Typed as a string in the OpenAPI schema, the list is parsed out of a single query parameter
+#       (i.e. `?account_id__in=1,2,3`), each item being validated as `ItemType`
+CommaSeparated = Annotated[list[ItemType], BeforeValidator(split_comma_separated, json_schema_input_type=str)]
+CommaSeparatedRange = Annotated[
+    list[ItemType], BeforeValidator(split_comma_separated, json_schema_input_type=str), Len(2, 2)
+]
 
 
 class FilterMeta:
@@ -60,63 +96,62 @@ class FilterSchema(BaseModel):
         Configuration dictionary for the schema, forbidding extra
         attributes that are not explicitly defined.
 
+    __filter_lookups__ : ClassVar[dict[str, tuple[str, str]]]
+        The `(field, lookup)` pair of every filter attribute, e.g.
+        `{"date__gt": ("date", "gt")}`. Compiled once, when the class is created.
+
     Methods:
     --------
-    check_valid_filter_lookups:
-        A root validator that checks the validity of filter attributes
-        based on the recognized lookups.
+    compile_filter_lookups:
+        Checks the validity of filter attributes based on the recognized
+        lookups and compiles them into `__filter_lookups__`.
     """
 
     model_config = ConfigDict(extra="forbid")
     _meta = PrivateAttr()
+    __filter_lookups__: ClassVar[dict[str, tuple[str, str]]] = {}
 
-    def __new__(cls: Type[T], **kwargs: Optional[dict[str, Any]]) -> T:
-        _meta = FilterMeta(getattr(cls, "Meta", None))
-        new_class = super(FilterSchema, cls).__new__(cls)
-
-        # Here (rather than __ini__) for better compatibility with validators
-        cls._meta = _meta
-        return new_class
-
-    # def __init__(self, **data: Optional[dict[str, Any]]) -> None:
-    #     super().__init__(**data)
-    #     self._meta = FilterMeta(getattr(self, "Meta", None))
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        # NOTE: Done once per class rather than on every instantiation (i.e. on every request)
+        cls._meta = FilterMeta(getattr(cls, "Meta", None))
+        cls.__filter_lookups__ = cls.compile_filter_lookups(cls.model_fields)
 
     # TODO: Validate ordering IF DEFINED
 
     # TODO: Possible bug? extra='forbid' is not working
     #       UPDATE: This is because of the nature of query params
 
-    @root_validator(pre=True)
-    def check_valid_filter_lookups(cls, values: dict[str, Any]) -> dict[str, Any]:
+    @staticmethod
+    def compile_filter_lookups(fields: dict[str, Any]) -> dict[str, tuple[str, str]]:
         """
         Validates filter attributes based on recognized lookups or operations.
 
-        This validator checks if provided filter attributes are constructed
-        with valid operations. Raises a ValueError for invalid attributes.
+        This checks if the declared filter attributes are constructed with
+        valid operations, raising a ValueError for invalid attributes, and
+        splits them into their field and lookup.
 
         Parameters:
         -----------
-        values : dict
-            Dictionary containing the provided filter attributes.
+        fields : dict
+            Dictionary containing the declared filter attributes.
 
         Returns:
         --------
         dict
-            The original dictionary if validation passes.
+            The `(field, lookup)` pair of every filter attribute.
 
         Raises:
         -------
         ValueError:
             If any filter attribute is invalid.
         """
-
-        valid_lookups = ["gt", "gte", "lt", "lte", "eq", "ieq", "contains", "icontains"]
-        for key in values.keys():
+        lookups: dict[str, tuple[str, str]] = {}
+        for key in fields:
             if key.count("__") == 1:
-                suffix = key.split("__")[-1]
-                if suffix not in valid_lookups:
-                    raise ValueError(
-                        f"Filter attribute {key} should be a valid lookup: {', '.join(valid_lookups)}"
-                    )
-        return values
+                field, suffix = key.split("__")
+                if suffix not in LOOKUPS:
+                    raise ValueError(f"Filter attribute {key} should be a valid lookup: {', '.join(LOOKUPS)}")
+                lookups[key] = (field, suffix)
+        return lookups
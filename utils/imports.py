@@ -0,0 +1,151 @@
+"""
+Streaming parsers to import large files row by row, keeping memory usage constant.
+
+Files are read in chunks of bytes (e.g. `iter_file` over an `UploadFile`, which Starlette spools to
+disk) and decoded incrementally, so only the record being parsed is held in memory. Every parser yields
+`ImportRow`s, the line number the record starts at and its fields as strings, left to the caller to
+validate and load in batches (see `batched`).
+"""
+
+import codecs
+import csv
+import html
+import re
+from typing import AsyncIterable, AsyncIterator, NamedTuple, Protocol, TypeVar
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 64 * 1024
+# NOTE: Bounds the memory a malformed file (e.g. an unterminated quote or aggregate) can take
+MAX_RECORD_SIZE = 1024 * 1024
+
+OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.DOTALL | re.IGNORECASE)
+# NOTE: OFX 1.x is SGML, leaf elements are usually left unclosed (`<TRNAMT>-5.00` up to the next tag)
+OFX_ELEMENT = re.compile(r"<([A-Za-z0-9.]+)>([^<]*)")
+
+
+class ImportRow(NamedTuple):
+    line: int
+    data: dict[str, str]
+
+
+class ImportParseError(ValueError):
+    """The file cannot be parsed past `line`."""
+
+    def __init__(self, message: str, line: int) -> None:
+        super().__init__(message)
+        self.line = line
+
+
+class AsyncReadable(Protocol):  # pragma: no cover
+    async def read(self, size: int = -1) -> bytes:
+        pass
+
+
+async def iter_file(file: AsyncReadable, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Chunks of `file` (e.g. an `UploadFile`) until exhausted."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def iter_text(chunks: AsyncIterable[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[str]:
+    """Decode `chunks`, keeping characters split across chunks whole. A leading BOM is dropped."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    line = 1
+    try:
+        async for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                line += text.count("\n")
+                yield text
+        if text := decoder.decode(b"", final=True):
+            yield text
+    except UnicodeDecodeError as error:
+        raise ImportParseError(f"The file is not valid {encoding}: {error.reason}.", line) from error
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[str]:
+    """Lines of the decoded `chunks`, line breaks included."""
+    pending, number = "", 1
+    async for text in iter_text(chunks, encoding):
+        *lines, pending = (pending + text).split("\n")
+        number += len(lines)
+        for line in lines:
+            yield line + "\n"
+        if len(pending) > MAX_RECORD_SIZE:
+            raise ImportParseError("Line too long.", number)
+    if pending:
+        yield pending
+
+
+async def parse_csv(
+    chunks: AsyncIterable[bytes], *, delimiter: str = ",", encoding: str = "utf-8-sig"
+) -> AsyncIterator[ImportRow]:
+    """
+    Records of a CSV file with a header, as `{column: value}`. Blank lines are skipped and quoted values
+    may span lines, `ImportRow.line` is the line the record starts at.
+    """
+    header: list[str] = []
+    record, start, quotes = "", 0, 0
+    number = 0
+    async for line in iter_lines(chunks, encoding):
+        number += 1
+        if not record:
+            start = number
+        record += line
+        # NOTE: Escaped quotes come in pairs, an odd count means a quoted value goes on in the next line
+        quotes += line.count('"')
+        if quotes % 2:
+            if len(record) > MAX_RECORD_SIZE:
+                raise ImportParseError("Unterminated quoted value.", start)
+            continue
+        values = next(csv.reader([record], delimiter=delimiter), [])
+        record, quotes = "", 0
+        if not any(value.strip() for value in values):
+            continue
+        if not header:
+            header = [value.strip() for value in values]
+            continue
+        # NOTE: Rows may leave trailing values out or carry more than the header, extra ones are dropped
+        yield ImportRow(start, dict(zip(header, values, strict=False)))
+    if record:
+        raise ImportParseError("Unterminated quoted value.", start)
+
+
+async def parse_ofx(chunks: AsyncIterable[bytes], *, encoding: str = "utf-8-sig") -> AsyncIterator[ImportRow]:
+    """
+    Statement transactions (`<STMTTRN>` aggregates) of an OFX file, 1.x (SGML) or 2.x (XML), as
+    `{element: value}` with the element names upper-cased, e.g. `TRNTYPE`, `DTPOSTED`, `TRNAMT`, `NAME`.
+    """
+    # NOTE: `line` is the line number `buffer` starts at
+    buffer, line = "", 1
+    async for text in iter_text(chunks, encoding):
+        buffer += text
+        position = end = 0
+        for match in OFX_TRANSACTION.finditer(buffer):
+            line += buffer.count("\n", position, match.start())
+            position, end = match.start(), match.end()
+            data = {
+                name.upper(): html.unescape(value.strip())
+                for name, value in OFX_ELEMENT.findall(match.group(1))
+            }
+            yield ImportRow(line, {name: value for name, value in data.items() if value})
+        # NOTE: Keep the aggregate left open, or enough characters to complete a split opening tag
+        opening = buffer.upper().rfind("<STMTTRN>", end)
+        keep = opening if opening >= 0 else max(end, len(buffer) - len("<STMTTRN>"))
+        line += buffer.count("\n", position, keep)
+        buffer = buffer[keep:]
+        if len(buffer) > MAX_RECORD_SIZE:
+            raise ImportParseError("Unterminated <STMTTRN> aggregate.", line)
+
+
+async def batched(items: AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """Lists of up to `size` consecutive `items`."""
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
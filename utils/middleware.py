@@ -1,11 +1,25 @@
-from typing import Optional, Type
+import hashlib
+from typing import Any, Callable, Hashable, Optional, Type
 
 from fastapi import Request, Response
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError, TimeoutError
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware, DispatchFunction, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .responses import BaseErrorResponse, DatabaseErrorResponse, NotFoundErrorResponse, TimeoutErrorResponse
+from .cache.coalescing import SingleFlight, is_coalesced
+from .cache.responses import CachedResponse, ResponseCache, ResponseCachePolicy, get_response_cache_policy
+from .responses import (
+    BaseErrorResponse,
+    DatabaseErrorResponse,
+    NotFoundErrorResponse,
+    NotModifiedResponse,
+    TimeoutErrorResponse,
+    etag_matches,
+)
 
 
 # NOTE: HTTPExceptions are automatically handled by the `ExceptionMiddleware` class
@@ -38,3 +52,271 @@ class SQLAlchemyExceptionHandlerMiddleware(BaseHTTPMiddleware):
             error_response = self._exception_responses.get(type(exc), DatabaseErrorResponse)
             debug_message = str(exc) if self.debug else None
             return error_response(debug_message=debug_message)
+
+
+def get_authorization_key(request: Request) -> Optional[Hashable]:
+    """Digest of the `Authorization` header, so every credential gets its own cache entries."""
+    authorization = request.headers.get("authorization")
+    return hashlib.sha256(authorization.encode()).hexdigest() if authorization else None
+
+
+def get_cache_control(headers: Headers) -> dict[str, Optional[str]]:
+    """Directives of the `Cache-Control` header, e.g. `{"no-cache": None, "max-age": "0"}`."""
+    directives: dict[str, Optional[str]] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+class RequestKeyMiddleware:
+    """
+    Base of the middlewares keying `GET` requests by path, user (`get_user_key`), `Accept` header and
+    normalized query: only the parameters declared by the route are kept, sorted by name, and dropped
+    when equal to their default, so neither the parameter order nor spelling out a default creates a
+    new key.
+
+    Requests carrying `primary_cookie` (set after a write so the client reads its own writes from the
+    primary, see `utils.database.routing`) must not be served responses rendered from a replica.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        get_user_key: Callable[[Request], Optional[Hashable]] = get_authorization_key,
+        primary_cookie: Optional[str] = None,
+    ) -> None:
+        self.app = app
+        self.get_user_key = get_user_key
+        self.primary_cookie = primary_cookie
+        self._query_defaults: dict[str, dict[str, Any]] = {}
+
+    def reads_primary(self, request: Request) -> bool:
+        return self.primary_cookie is not None and bool(request.cookies.get(self.primary_cookie))
+
+    def get_route(self, scope: Scope) -> Optional[APIRoute]:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route if isinstance(route, APIRoute) else None
+        return None
+
+    def get_query_defaults(self, route: APIRoute) -> dict[str, Any]:
+        """Default value of every query parameter declared by `route` (or its dependencies)."""
+        if route.unique_id not in self._query_defaults:
+            self._query_defaults[route.unique_id] = {
+                param.alias: param.default for param in get_flat_dependant(route.dependant).query_params
+            }
+        return self._query_defaults[route.unique_id]
+
+    def get_request_key(self, request: Request, route: APIRoute) -> Hashable:
+        defaults = self.get_query_defaults(route)
+        params = [
+            (name, value)
+            for name, value in request.query_params.multi_items()
+            if name in defaults and not self.is_default(defaults[name], value)
+        ]
+        # NOTE: A stable sort by name, repeated parameters (e.g. `ordering`) keep their relative order
+        query = tuple(sorted(params, key=lambda param: param[0]))
+        return (request.url.path, self.get_user_key(request), request.headers.get("accept"), query)
+
+    @staticmethod
+    def is_default(default: Any, value: str) -> bool:
+        if default is None or isinstance(default, (list, tuple)):
+            return False
+        if isinstance(default, bool):
+            return value.lower() == str(default).lower()
+        return value == str(default)
+
+
+class ResponseCacheMiddleware(RequestKeyMiddleware):
+    """
+    Serve the `GET` routes opted in through `cache_response` out of a `ResponseCache`.
+
+    Entries are keyed by `get_request_key`. Only `200` JSON responses are stored, along with
+    `Cache-Control: private, max-age=<ttl>` unless the route set one.
+
+    Clients skip the lookup with `Cache-Control: no-cache` (or `max-age=0`), `no-store` also skips
+    storing the response, and so does `primary_cookie`: the entries may have been rendered from a
+    replica. Hits are marked with `X-Cache: HIT` and answer `If-None-Match` with a `304`.
+
+    NOTE: Entries are served without running the route dependencies, cached routes must depend on the
+    user only through `get_user_key`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        cache: ResponseCache,
+        get_user_key: Callable[[Request], Optional[Hashable]] = get_authorization_key,
+        primary_cookie: Optional[str] = None,
+    ) -> None:
+        super().__init__(app, get_user_key=get_user_key, primary_cookie=primary_cookie)
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = self.get_route(scope)
+        policy = get_response_cache_policy(route.endpoint) if route else None
+        if route is None or policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        if self.reads_primary(request):
+            self.cache.record_bypass()
+            await self.app(scope, receive, send)
+            return
+
+        directives = get_cache_control(request.headers)
+        key = self.get_request_key(request, route)
+        if "no-cache" in directives or directives.get("max-age") == "0" or "no-store" in directives:
+            self.cache.record_bypass()
+        else:
+            cached = self.cache.get(key)
+            max_age = directives.get("max-age")
+            if cached is not None and not (max_age and max_age.isdigit() and cached.age > int(max_age)):
+                await self.send_cached(cached, request, send)
+                return
+
+        # NOTE: Replicas may not have caught up with a recent write yet, what they return is not kept
+        if "no-store" in directives or not self.cache.is_settled(policy.tags):
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, self.get_storing_send(send, key, policy))
+
+    def get_storing_send(self, send: Send, key: Hashable, policy: ResponseCachePolicy) -> Send:
+        generation = self.cache.get_generation(policy.tags)
+        ttl = self.cache.ttl if policy.ttl is None else policy.ttl
+        state: dict[str, Any] = {"store": False, "body": bytearray()}
+
+        async def storing_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message["headers"]))
+                cache_control = get_cache_control(headers)
+                state["store"] = (
+                    message["status"] == 200
+                    and headers.get("content-type", "").startswith("application/json")
+                    and "no-store" not in cache_control
+                )
+                if state["store"]:
+                    if not cache_control and ttl is not None:
+                        headers["Cache-Control"] = f"private, max-age={int(ttl)}"
+                    state["status"], state["headers"] = message["status"], list(headers.raw)
+                    headers["X-Cache"] = "MISS"
+                    message = {**message, "headers": headers.raw}
+            elif message["type"] == "http.response.body" and state["store"]:
+                state["body"].extend(message.get("body", b""))
+                if len(state["body"]) > self.cache.max_entry_bytes:
+                    state["store"] = False
+                    state["body"] = bytearray()
+                    self.cache.record_rejection()
+                elif not message.get("more_body", False):
+                    response = CachedResponse(
+                        state["status"], state["headers"], bytes(state["body"]), policy.tags
+                    )
+                    self.cache.set(key, response, ttl=policy.ttl, generation=generation)
+            await send(message)
+
+        return storing_send
+
+    async def send_cached(self, cached: CachedResponse, request: Request, send: Send) -> None:
+        headers = MutableHeaders(raw=list(cached.headers))
+        headers["Age"] = str(cached.age)
+        headers["X-Cache"] = "HIT"
+        etag = headers.get("etag")
+        if etag and etag_matches(request.headers.get("if-none-match"), etag):
+            response: Response = NotModifiedResponse(
+                etag, headers={key: value for key, value in headers.items() if key != "content-length"}
+            )
+        else:
+            response = Response(cached.body, status_code=cached.status_code)
+            response.raw_headers = headers.raw
+        await response(request.scope, request.receive, send)
+
+
+class RequestCoalescingMiddleware(RequestKeyMiddleware):
+    """
+    Share one response between identical concurrent `GET` requests of the routes opted in through
+    `coalesce_requests`.
+
+    Requests are keyed by `get_request_key` along with their conditional headers. The first request
+    runs the route while the ones arriving meanwhile wait and get a copy of its response. Responses
+    larger than `max_body_bytes` (e.g. streams) are not kept, nor are failed ones: the waiting requests
+    run the route on their own then. Requests carrying `primary_cookie` always run the route, as the
+    response they would share may have been read from a replica.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        single_flight: SingleFlight,
+        max_body_bytes: int = 1024 * 1024,
+        get_user_key: Callable[[Request], Optional[Hashable]] = get_authorization_key,
+        primary_cookie: Optional[str] = None,
+    ) -> None:
+        super().__init__(app, get_user_key=get_user_key, primary_cookie=primary_cookie)
+        self.single_flight = single_flight
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = self.get_route(scope)
+        if route is None or not is_coalesced(route.endpoint):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        if self.reads_primary(request):
+            await self.app(scope, receive, send)
+            return
+
+        key = (
+            self.get_request_key(request, route),
+            request.headers.get("if-none-match"),
+            request.headers.get("if-modified-since"),
+        )
+        leader = False
+
+        async def call() -> Optional[CachedResponse]:
+            nonlocal leader
+            leader = True
+            return await self.call_shared(scope, receive, send)
+
+        try:
+            response, shared = await self.single_flight.do(key, call)
+        except Exception:
+            if leader:
+                raise
+            response, shared = None, True
+        if not shared:
+            return
+        if response is None:
+            await self.app(scope, receive, send)
+            return
+        await send(
+            {"type": "http.response.start", "status": response.status_code, "headers": response.headers}
+        )
+        await send({"type": "http.response.body", "body": response.body})
+
+    async def call_shared(self, scope: Scope, receive: Receive, send: Send) -> Optional[CachedResponse]:
+        """Run the route for this request, keeping a copy of its response for the waiting ones."""
+        state: dict[str, Any] = {"body": bytearray(), "shareable": True}
+
+        async def sharing_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"], state["headers"] = message["status"], list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and state["shareable"]:
+                state["body"].extend(message.get("body", b""))
+                if len(state["body"]) > self.max_body_bytes:
+                    state["shareable"], state["body"] = False, bytearray()
+            await send(message)
+
+        await self.app(scope, receive, sharing_send)
+        if not state["shareable"] or "status" not in state:
+            return None
+        return CachedResponse(state["status"], state["headers"], bytes(state["body"]))
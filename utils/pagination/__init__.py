@@ -1,9 +1,19 @@
-from .core import LimitOffsetPagination, PageNumberPagination
-from .schemas import LimitOffsetSchema, PageNumberSchema
+from .core import (
+    BaseOffsetPagination,
+    CountStrategy,
+    KeysetPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+from .schemas import KeysetSchema, LimitOffsetSchema, PageNumberSchema
 
 __all__ = [
+    "BaseOffsetPagination",
+    "CountStrategy",
     "PageNumberPagination",
     "LimitOffsetPagination",
+    "KeysetPagination",
     "PageNumberSchema",
     "LimitOffsetSchema",
+    "KeysetSchema",
 ]
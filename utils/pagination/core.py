@@ -1,7 +1,17 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
 from math import ceil
-from typing import Any, Optional, Protocol
+from typing import Any, Optional, Protocol, Sequence, Union
 
-from sqlalchemy.orm import DeclarativeBase, Query
+from sqlalchemy import ColumnElement, Executable, Row, Select, and_, asc, desc, func, inspect, or_, tuple_
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute
+
+from utils.database.expressions import EstimatedCount, parse_estimated_count
+from utils.exceptions.client import BadRequestException
 
 
 class PageNumberSchemaProtocol(Protocol):  # pragma: no cover
@@ -14,70 +24,309 @@ class LimitOffsetSchemaProtocol(Protocol):  # pragma: no cover
     offset: Optional[int]
 
 
+class KeysetSchemaProtocol(Protocol):  # pragma: no cover
+    cursor: Optional[str]
+    limit: Optional[int]
+
+
 class BasePagination:
-    def paginate_queryset(self, query: Query[DeclarativeBase]) -> Query[DeclarativeBase]:  # pragma: no cover
+    def paginate_queryset(self, query: Select[Any]) -> Select[Any]:  # pragma: no cover
         raise NotImplementedError("paginate_queryset() must be implemented.")
 
-    def get_paginated_response_data(self, results: list[dict[str, Any]]) -> dict[str, Any]:
+    def count_queryset(self, query: Select[Any]) -> Optional[Executable]:
+        """Statement to run apart from `query` in order to count its rows, if any."""
+        return None
+
+    def set_count(self, value: Any) -> None:
+        """Receive the result of the `count_queryset` statement."""
+
+    def paginate_results(self, results: list[Any]) -> list[Any]:
+        """Post-process the fetched rows of the paginated query."""
+        return self.get_entities(results)
+
+    def get_entities(self, results: list[Any]) -> list[Any]:
+        """Entities out of the fetched rows, dropping any column added by the paginator."""
+        return [row[0] if isinstance(row, Row) else row for row in results]
+
+    def get_paginated_response_data(self, results: list[Any]) -> dict[str, Any]:
         data: dict[str, Any] = {"data": results}
         if pagination := self.get_pagination_properties():
             data["pagination"] = pagination
         return data
 
-    def get_pagination_properties(self) -> dict[str, Optional[int]]:  # pragma: no cover
+    def get_pagination_properties(self) -> dict[str, Any]:  # pragma: no cover
         raise NotImplementedError("get_pagination_properties() must be implemented.")
 
 
-class PageNumberPagination(BasePagination):
-    count: int
+class CountStrategy(str, Enum):
+    """
+    How offset based paginators obtain the total number of rows.
+
+    - `exact`: Total fetched in the same statement through a `COUNT(*) OVER()` window column.
+    - `estimate`: Planner estimate (PostgreSQL `EXPLAIN`), for unfiltered or huge result sets.
+    - `none`: No total at all; one extra row is fetched to tell whether a next page exists.
+    """
+
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
+
+
+class BaseOffsetPagination(BasePagination):
+    count: Optional[int]
+    has_next: Optional[bool]
+    count_strategy: CountStrategy = CountStrategy.exact
+
+    TOTAL_COUNT_LABEL = "_pagination_total_count"
+
+    def __init__(self, *, count_strategy: Optional[CountStrategy] = None) -> None:
+        self.count = None
+        self.has_next = None
+        if count_strategy is not None:
+            self.count_strategy = count_strategy
+
+    def get_limit_offset(self) -> tuple[Optional[int], Optional[int]]:  # pragma: no cover
+        raise NotImplementedError("get_limit_offset() must be implemented.")
+
+    def paginate_queryset(self, query: Select[Any]) -> Select[Any]:
+        limit, offset = self.get_limit_offset()
+        if limit is None:
+            return query
+
+        if self.count_strategy == CountStrategy.exact:
+            query = query.add_columns(func.count().over().label(self.TOTAL_COUNT_LABEL))
+        elif self.count_strategy == CountStrategy.none:
+            limit += 1
+        return query.limit(limit).offset(offset)
+
+    def count_queryset(self, query: Select[Any]) -> Optional[Executable]:
+        if self.get_limit_offset()[0] is None or self.count_strategy != CountStrategy.estimate:
+            return None
+        return EstimatedCount(query.limit(None).offset(None).order_by(None))
+
+    def set_count(self, value: Any) -> None:
+        self.count = parse_estimated_count(value)
+
+    def paginate_sequence(self, items: Sequence[Any]) -> list[Any]:
+        """Paginate entities already in memory, whose total is always known."""
+        limit, offset = self.get_limit_offset()
+        self.count = len(items)
+        if limit is None:
+            return list(items)
+        start = offset or 0
+        return list(items[start : start + limit])
+
+    def paginate_results(self, results: list[Any]) -> list[Any]:
+        limit, offset = self.get_limit_offset()
+        if limit is None:
+            return self.get_entities(results)
+
+        if self.count_strategy == CountStrategy.exact:
+            # NOTE: An empty page past the end carries no window value, hence the total is unknown
+            self.count = results[0][-1] if results else (None if offset else 0)
+        elif self.count_strategy == CountStrategy.none:
+            self.has_next = len(results) > limit
+            results = results[:limit]
+        return self.get_entities(results)
+
+
+class PageNumberPagination(BaseOffsetPagination):
     page: Optional[int]
     page_size: Optional[int]
 
-    def __init__(self, schema: PageNumberSchemaProtocol) -> None:
+    def __init__(
+        self, schema: PageNumberSchemaProtocol, count_strategy: Optional[CountStrategy] = None
+    ) -> None:
+        super().__init__(count_strategy=count_strategy)
         self.page = schema.page
         self.page_size = schema.page_size
 
-    def paginate_queryset(self, query: Query[DeclarativeBase]) -> Query[DeclarativeBase]:
-        if self.page and self.page_size:
-            offset = (self.page - 1) * self.page_size
-            query = query.limit(self.page_size).offset(offset)
-
-        self.count = query.count()
-        return query
+    def get_limit_offset(self) -> tuple[Optional[int], Optional[int]]:
+        if not self.page or not self.page_size:
+            return None, None
+        return self.page_size, (self.page - 1) * self.page_size
 
-    def get_pagination_properties(self) -> dict[str, Optional[int]]:
+    def get_pagination_properties(self) -> dict[str, Any]:
         # TODO: Consider adding `links` property/object to follow JSON API references.
         if self.page is None or self.page_size is None:
             return {}
 
-        total_pages = int(ceil(self.count / float(self.page_size)))
+        total_pages = int(ceil(self.count / float(self.page_size))) if self.count is not None else None
+        has_next = self.has_next if total_pages is None else self.page < total_pages
         pagination_properties: dict[str, Optional[int]] = {
             "count": self.count,
             "page": self.page,
             "page_size": self.page_size,
             "previous_page": self.page - 1 if self.page > 1 else None,
             "total_pages": total_pages if total_pages else None,
-            "next_page": self.page + 1 if self.page < total_pages else None,
+            "next_page": self.page + 1 if has_next else None,
         }
         return {prop: val for prop, val in pagination_properties.items() if val}
 
 
-class LimitOffsetPagination(BasePagination):
-    count: int
+class LimitOffsetPagination(BaseOffsetPagination):
     offset: Optional[int]
     limit: Optional[int]
 
-    def __init__(self, schema: LimitOffsetSchemaProtocol) -> None:
+    def __init__(
+        self, schema: LimitOffsetSchemaProtocol, count_strategy: Optional[CountStrategy] = None
+    ) -> None:
+        super().__init__(count_strategy=count_strategy)
         self.offset = schema.offset
         self.limit = schema.limit
 
-    def paginate_queryset(self, query: Query[DeclarativeBase]) -> Query[DeclarativeBase]:
-        query = query.offset(self.offset).limit(self.limit)
-        self.count = query.count()
-        return query
+    def get_limit_offset(self) -> tuple[Optional[int], Optional[int]]:
+        return self.limit, self.offset
 
-    def get_pagination_properties(self) -> dict[str, Optional[int]]:
+    def get_pagination_properties(self) -> dict[str, Any]:
         # TODO: Consider adding `links` property/object to follow JSON API references.
         if self.offset is None and self.limit is None:
             return {}
+        if self.count is None and self.has_next is not None:
+            return {"has_next": self.has_next, "limit": self.limit, "offset": self.offset}
         return {"count": self.count, "limit": self.limit, "offset": self.offset}
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor based pagination which seeks past the last seen sort key instead of using `OFFSET`.
+
+    The `ordering` follows the `BaseFilterManager.order_by_queryset` syntax (e.g. `["-date"]`) and the
+    primary key is always appended as tie-breaker so every key is unique. Computed sort keys, such as
+    the relevance of a search (`BaseFilterManager.get_search_keys`), go first as `leading_keys`. The
+    cursor is an opaque token holding the sort key of the first/last row of the page and the direction
+    to seek to.
+
+    Note:
+    -----
+    Sort keys must be non-nullable columns, `NULL` values cannot be compared against the cursor.
+    """
+
+    cursor: Optional[str]
+    limit: Optional[int]
+    ordering: list[str]
+
+    def __init__(
+        self,
+        schema: KeysetSchemaProtocol,
+        ordering: Optional[list[str]] = None,
+        leading_keys: Sequence[tuple[ColumnElement[Any], bool]] = (),
+    ) -> None:
+        self.cursor = schema.cursor
+        self.limit = schema.limit
+        self.ordering = ordering or []
+        self.leading_keys = list(leading_keys)
+        self.next_cursor: Optional[str] = None
+        self.previous_cursor: Optional[str] = None
+        self._keys: list[tuple[Any, bool]] = []
+        self._reverse = False
+
+    def paginate_queryset(self, query: Select[Any]) -> Select[Any]:
+        if self.limit is None:
+            return query
+
+        model = query.column_descriptions[0]["entity"]
+        self._keys = self.get_keys(model)
+
+        values: Optional[list[Any]] = None
+        if self.cursor:
+            values, self._reverse = self.decode_cursor(self.cursor)
+
+        order_expressions = [
+            desc(attr) if descending != self._reverse else asc(attr) for attr, descending in self._keys
+        ]
+        query = query.order_by(None).order_by(*order_expressions)
+        if values is not None:
+            query = query.filter(self.get_seek_condition(values))
+        # NOTE: Sort keys are selected as extra columns so cursors do not depend on the loaded attributes
+        query = query.add_columns(*(attr for attr, _ in self._keys))
+        return query.limit(self.limit + 1)
+
+    def paginate_results(self, results: list[Any]) -> list[Any]:
+        if self.limit is None:
+            return self.get_entities(results)
+
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if self._reverse:
+            results.reverse()
+
+        has_next = has_more if not self._reverse else True
+        has_previous = has_more if self._reverse else bool(self.cursor)
+        if results and has_next:
+            self.next_cursor = self.encode_cursor(list(results[-1][1:]), reverse=False)
+        if results and has_previous:
+            self.previous_cursor = self.encode_cursor(list(results[0][1:]), reverse=True)
+        return self.get_entities(results)
+
+    def get_pagination_properties(self) -> dict[str, Any]:
+        if self.limit is None:
+            return {}
+        return {"limit": self.limit, "next": self.next_cursor, "previous": self.previous_cursor}
+
+    def get_keys(self, model: type[DeclarativeBase]) -> list[tuple[Any, bool]]:
+        """Sort keys as `(attribute, descending)` pairs, with the primary key as tie-breaker."""
+        keys: list[tuple[Any, bool]] = list(self.leading_keys)
+        for field in self.ordering:
+            name = field.lstrip("-+")
+            if name not in model.__mapper__.columns:
+                raise BadRequestException(detail=f"Ordering field `{name}` is not sortable")
+            keys.append((getattr(model, name), field.startswith("-")))
+
+        mapper = inspect(model)
+        for column in mapper.primary_key:
+            name = mapper.get_property_by_column(column).key
+            if name not in {getattr(attr, "key", None) for attr, _ in keys}:
+                keys.append((getattr(model, name), False))
+        return keys
+
+    def get_seek_condition(self, values: list[Any]) -> ColumnElement[bool]:
+        """Rows strictly after `values` following the (possibly reversed) sort keys."""
+        directions = {descending for _, descending in self._keys}
+        if len(directions) == 1:
+            # NOTE: Row value comparison, so a composite index on the sort keys can be seeked directly
+            columns = tuple_(*(attr for attr, _ in self._keys))
+            if directions.pop() != self._reverse:
+                return columns < tuple_(*values)
+            return columns > tuple_(*values)
+
+        conditions: list[ColumnElement[bool]] = []
+        for index, (attr, descending) in enumerate(self._keys):
+            equals = [
+                key == value for (key, _), value in zip(self._keys[:index], values[:index], strict=True)
+            ]
+            seek = attr < values[index] if descending != self._reverse else attr > values[index]
+            conditions.append(and_(*equals, seek))
+        return or_(*conditions)
+
+    def encode_cursor(self, values: list[Any], *, reverse: bool) -> str:
+        payload = json.dumps(
+            {"k": [self._encode_value(value) for value in values], "r": reverse}, separators=(",", ":")
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> tuple[list[Any], bool]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            values = [
+                self._decode_value(attr, value)
+                for (attr, _), value in zip(self._keys, payload["k"], strict=True)
+            ]
+            return values, bool(payload["r"])
+        except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+            raise BadRequestException(detail="Invalid pagination cursor") from exc
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _decode_value(attr: Union[InstrumentedAttribute[Any], ColumnElement[Any]], value: Any) -> Any:
+        python_type = attr.type.python_type
+        if python_type in (date, datetime):
+            return python_type.fromisoformat(value)
+        return python_type(value)
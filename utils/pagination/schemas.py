@@ -36,3 +36,19 @@ class LimitOffsetSchema(BaseModel):
         if (limit is None and offset) or (offset is None and limit):
             raise ValueError("Attributes `limit` and `offset` should be either declared or omitted.")
         return values
+
+
+class KeysetSchema(BaseModel):
+    cursor: Optional[str] = param_functions.Query(
+        None, description="Opaque cursor of the page to fetch", alias="cursor"
+    )
+    limit: Optional[int] = param_functions.Query(
+        None, gt=0, le=MAX_PAGE_SIZE, description="Limit selection", alias="limit"
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def check_limit_set(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if values.get("cursor") and values.get("limit") is None:
+            raise ValueError("Attribute `limit` should be declared along with `cursor`.")
+        return values
@@ -1,8 +1,29 @@
+from .conditional import (
+    ConditionalRequest,
+    NotModifiedResponse,
+    etag_matches,
+    http_date,
+    make_etag,
+    not_modified_since,
+    parse_http_date,
+)
 from .core import BaseErrorResponse, DatabaseErrorResponse, NotFoundErrorResponse, TimeoutErrorResponse
+from .streaming import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, StreamingListResponse, get_streaming_media_type
 
 __all__ = [
+    "CSV_MEDIA_TYPE",
+    "NDJSON_MEDIA_TYPE",
     "BaseErrorResponse",
+    "ConditionalRequest",
     "DatabaseErrorResponse",
     "NotFoundErrorResponse",
+    "NotModifiedResponse",
+    "StreamingListResponse",
     "TimeoutErrorResponse",
+    "etag_matches",
+    "get_streaming_media_type",
+    "http_date",
+    "make_etag",
+    "not_modified_since",
+    "parse_http_date",
 ]
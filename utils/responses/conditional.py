@@ -0,0 +1,109 @@
+"""
+Conditional requests (RFC 9110 section 13).
+
+Helpers to answer `If-None-Match` and `If-Modified-Since` with `304 Not Modified`, so unchanged
+resources are neither serialized nor sent again.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def make_etag(*parts: object) -> str:
+    """Strong entity tag out of `parts`, e.g. a content digest and the query string."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether the `If-None-Match` header matches `etag` (weak comparison, as required for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def http_date(value: datetime) -> str:
+    """`value` formatted as an HTTP date, naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Aware datetime out of an HTTP date header, `None` when missing or malformed."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """Whether `last_modified` is not later than `If-Modified-Since` (HTTP dates have second precision)."""
+    since = parse_http_date(if_modified_since)
+    if since is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+class ConditionalRequest:
+    """
+    Dependency evaluating the conditional headers of a `GET` request.
+
+    Validators are computed by the route out of cheap data (e.g. `id` + `updated_at`, or an aggregate
+    of the listed rows) before loading or serializing the body. The query string is part of the
+    entity tag, so every page, filter or projection is a distinct representation.
+
+    Usage:
+    ------
+    ```
+    not_modified = conditional.evaluate(response, parts=(id, updated_at), last_modified=updated_at)
+    if not_modified:
+        return not_modified
+    ```
+    """
+
+    def __init__(self, request: Request) -> None:
+        self.if_none_match = request.headers.get("if-none-match")
+        self.if_modified_since = request.headers.get("if-modified-since")
+        self.variant = request.url.query
+
+    def evaluate(
+        self, response: Response, *, parts: tuple[object, ...], last_modified: Optional[datetime] = None
+    ) -> Optional["NotModifiedResponse"]:
+        """
+        `NotModifiedResponse` when the client representation is current, otherwise sets the validators
+        on `response` and returns `None`.
+
+        `If-None-Match` takes precedence, `If-Modified-Since` is only evaluated when it is absent.
+        """
+        etag = make_etag(*parts, self.variant)
+        headers = {"Last-Modified": http_date(last_modified)} if last_modified else {}
+        if self.if_none_match is not None:
+            matches = etag_matches(self.if_none_match, etag)
+        else:
+            matches = last_modified is not None and not_modified_since(self.if_modified_since, last_modified)
+        if matches:
+            return NotModifiedResponse(etag, headers=headers)
+        response.headers["ETag"] = etag
+        response.headers.update(headers)
+        return None
+
+
+class NotModifiedResponse(Response):
+    """`304 Not Modified`, without body and carrying the validators of the cached representation."""
+
+    def __init__(self, etag: str, headers: Optional[dict[str, str]] = None) -> None:
+        super().__init__(status_code=304, headers={**(headers or {}), "ETag": etag})
@@ -0,0 +1,111 @@
+"""
+Streaming responses to export large listings chunk by chunk, keeping memory usage constant.
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+from fastapi import Header
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect
+from sqlalchemy.orm import DeclarativeBase
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+STREAMING_MEDIA_TYPES = (NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE)
+
+
+def get_streaming_media_type(accept: Optional[str] = Header(None)) -> Optional[str]:
+    """Streaming media type requested through the `Accept` header, if any."""
+    if not accept:
+        return None
+    media_types = {media_range.split(";")[0].strip().lower() for media_range in accept.split(",")}
+    return next((media_type for media_type in STREAMING_MEDIA_TYPES if media_type in media_types), None)
+
+
+def get_column_values(entity: DeclarativeBase) -> dict[str, Any]:
+    return {attr.key: getattr(entity, attr.key) for attr in inspect(entity).mapper.column_attrs}
+
+
+def encode_entity(entity: Any) -> Any:
+    """
+    JSON compatible version of `entity`, keeping the declaration order of the columns of models. Loaded
+    relationships (e.g. through `include`) are embedded after the columns, as their own columns only.
+    """
+    if isinstance(entity, DeclarativeBase):
+        state = inspect(entity)
+        data: dict[str, Any] = get_column_values(entity)
+        for relationship in state.mapper.relationships:
+            if relationship.key in state.unloaded:
+                continue
+            value = state.dict.get(relationship.key)
+            if isinstance(value, DeclarativeBase):
+                data[relationship.key] = get_column_values(value)
+            elif value is not None:
+                data[relationship.key] = [get_column_values(item) for item in value]
+            else:
+                data[relationship.key] = None
+        entity = data
+    return jsonable_encoder(entity)
+
+
+def flatten(data: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """`data` with nested objects (embedded relationships) spread into `parent.child` keys, for CSV."""
+    flat: dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+class StreamingListResponse(StreamingResponse):
+    """
+    Stream the entities of `content` as NDJSON (one JSON document per line) or CSV.
+
+    Entities are encoded one by one and flushed every `chunk_size` bytes, so the first bytes are sent
+    as soon as the first rows are fetched. CSV columns are taken from the first entity, embedded objects
+    spread into `parent.child` columns.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, content: AsyncIterable[Any], media_type: str, **kwargs: Any) -> None:
+        if media_type not in STREAMING_MEDIA_TYPES:
+            raise ValueError(f"Unsupported streaming media type `{media_type}`.")
+        encode = self.encode_csv if media_type == CSV_MEDIA_TYPE else self.encode_ndjson
+        super().__init__(self.chunk(encode(content)), media_type=media_type, **kwargs)
+
+    async def chunk(self, lines: AsyncIterator[str]) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        async for line in lines:
+            buffer.write(line)
+            if buffer.tell() >= self.chunk_size:
+                yield buffer.getvalue()
+                buffer = io.StringIO()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    async def encode_ndjson(content: AsyncIterable[Any]) -> AsyncIterator[str]:
+        async for entity in content:
+            yield json.dumps(encode_entity(entity), separators=(",", ":")) + "\n"
+
+    @staticmethod
+    async def encode_csv(content: AsyncIterable[Any]) -> AsyncIterator[str]:
+        line = io.StringIO()
+        writer: Optional[csv.DictWriter[str]] = None
+        async for entity in content:
+            data = flatten(encode_entity(entity))
+            if writer is None:
+                writer = csv.DictWriter(line, fieldnames=list(data), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(data)
+            yield line.getvalue()
+            line.seek(0)
+            line.truncate()
@@ -1,15 +1,34 @@
-from typing import Any, Generic, Optional, Protocol, TypeVar
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Generic, Iterator, Optional, Protocol, Sequence, TypeVar
 
 from sqlalchemy.orm import DeclarativeBase
 
-from .database.repository import FilterManagerProtocol, PaginationManagerProtocol
+from .cache.responses import invalidate_responses
+from .database.async_repository import (
+    AsyncFilterManagerProtocol,
+    AsyncPaginationManagerProtocol,
+    AsyncProjectionManagerProtocol,
+)
+from .database.repository import FilterManagerProtocol, PaginationManagerProtocol, ProjectionManagerProtocol
 
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
 RepositoryType = TypeVar("RepositoryType", bound="RepositoryProtocol")
+AsyncRepositoryType = TypeVar("AsyncRepositoryType", bound="AsyncRepositoryProtocol")
 
 
 class RepositoryProtocol(Protocol):  # pragma: no cover
-    def retrieve_by_id(self, *, id: int) -> DeclarativeBase:
+    def get_model(self) -> type[DeclarativeBase]:
+        pass
+
+    def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> DeclarativeBase:
         pass
 
     def retrieve(self, **filters: Any) -> DeclarativeBase:
@@ -20,10 +39,27 @@ class RepositoryProtocol(Protocol):  # pragma: no cover
         *,
         filter_manager: Optional[FilterManagerProtocol] = None,
         pagination_manager: Optional[PaginationManagerProtocol] = None,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
         **filters: Any,
     ) -> list[DeclarativeBase]:
         pass
 
+    def stream(
+        self,
+        *,
+        filter_manager: Optional[FilterManagerProtocol] = None,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> Iterator[DeclarativeBase]:
+        pass
+
+    def list_validators(
+        self, *, filter_manager: Optional[FilterManagerProtocol] = None, **filters: Any
+    ) -> tuple[Optional[datetime], int]:
+        pass
+
     def create(self, *, entity: dict[str, Any]) -> DeclarativeBase:
         pass
 
@@ -33,16 +69,97 @@ class RepositoryProtocol(Protocol):  # pragma: no cover
     def destroy(self, *, id: int) -> None:
         pass
 
+    def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        pass
+
+    def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        pass
+
+    def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        pass
+
     def perform_commit(self) -> None:
         pass
 
 
+class AsyncRepositoryProtocol(Protocol):  # pragma: no cover
+    def get_model(self) -> type[DeclarativeBase]:
+        pass
+
+    async def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> DeclarativeBase:
+        pass
+
+    async def retrieve(self, **filters: Any) -> DeclarativeBase:
+        pass
+
+    async def list(
+        self,
+        *,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        pagination_manager: Optional[AsyncPaginationManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> list[DeclarativeBase]:
+        pass
+
+    def stream(
+        self,
+        *,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> AsyncIterator[DeclarativeBase]:
+        pass
+
+    async def list_validators(
+        self, *, filter_manager: Optional[AsyncFilterManagerProtocol] = None, **filters: Any
+    ) -> tuple[Optional[datetime], int]:
+        pass
+
+    async def create(self, *, entity: dict[str, Any]) -> DeclarativeBase:
+        pass
+
+    async def update(self, *, id: int, entity: dict[str, Any]) -> DeclarativeBase:
+        pass
+
+    async def destroy(self, *, id: int) -> None:
+        pass
+
+    async def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        pass
+
+    async def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        pass
+
+    async def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        pass
+
+    async def perform_commit(self) -> None:
+        pass
+
+
 class BaseService(Generic[ModelType, RepositoryType]):
     def __init__(self, *, repository: RepositoryType):
         self.repository = repository
 
-    def retrieve_by_id(self, *, id: int) -> ModelType:
-        return self.repository.retrieve_by_id(id=id)  # type: ignore
+    def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> ModelType:
+        return self.repository.retrieve_by_id(
+            id=id, projection_manager=projection_manager, include=include
+        )  # type: ignore
 
     def get(self, **filters: Any) -> ModelType:
         return self.repository.retrieve(**filters)  # type: ignore
@@ -51,22 +168,155 @@ class BaseService(Generic[ModelType, RepositoryType]):
         self,
         filter_manager: Optional[FilterManagerProtocol] = None,
         pagination_manager: Optional[PaginationManagerProtocol] = None,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
         **filters: Any,
     ) -> list[ModelType]:
         return self.repository.list(
-            filter_manager=filter_manager, pagination_manager=pagination_manager, **filters
+            filter_manager=filter_manager,
+            pagination_manager=pagination_manager,
+            projection_manager=projection_manager,
+            include=include,
+            **filters,
+        )  # type: ignore
+
+    def stream(
+        self,
+        filter_manager: Optional[FilterManagerProtocol] = None,
+        projection_manager: Optional[ProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> Iterator[ModelType]:
+        return self.repository.stream(
+            filter_manager=filter_manager, projection_manager=projection_manager, include=include, **filters
         )  # type: ignore
 
+    def list_validators(
+        self, filter_manager: Optional[FilterManagerProtocol] = None, **filters: Any
+    ) -> tuple[Optional[datetime], int]:
+        return self.repository.list_validators(filter_manager=filter_manager, **filters)  # type: ignore
+
     def create(self, *, entity: dict[str, Any]) -> ModelType:
         instance = self.repository.create(entity=entity)
-        self.repository.perform_commit()
+        self.perform_commit()
         return instance  # type: ignore
 
     def update(self, *, id: int, entity: dict[str, Any]) -> ModelType:
         instance = self.repository.update(id=id, entity=entity)
-        self.repository.perform_commit()
+        self.perform_commit()
         return instance  # type: ignore
 
     def destroy(self, *, id: int) -> None:
         self.repository.destroy(id=id)
+        self.perform_commit()
+
+    def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = self.repository.bulk_create(entities=entities)
+        self.perform_commit()
+        return rows  # type: ignore
+
+    def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = self.repository.bulk_update(entities=entities)
+        self.perform_commit()
+        return rows  # type: ignore
+
+    def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        deleted = self.repository.bulk_destroy(ids=ids)
+        self.perform_commit()
+        return deleted  # type: ignore
+
+    def perform_commit(self) -> None:
         self.repository.perform_commit()
+        invalidate_responses(*self.get_cache_tags())
+
+    def get_cache_tags(self) -> tuple[str, ...]:
+        """Response cache tags dropped once a write commits, the table of the model by default."""
+        return (self.repository.get_model().__tablename__,)
+
+
+class AsyncBaseService(Generic[ModelType, AsyncRepositoryType]):
+    def __init__(self, *, repository: AsyncRepositoryType):
+        self.repository = repository
+
+    async def retrieve_by_id(
+        self,
+        *,
+        id: int,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+    ) -> ModelType:
+        return await self.repository.retrieve_by_id(
+            id=id, projection_manager=projection_manager, include=include
+        )  # type: ignore
+
+    async def get(self, **filters: Any) -> ModelType:
+        return await self.repository.retrieve(**filters)  # type: ignore
+
+    async def list(
+        self,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        pagination_manager: Optional[AsyncPaginationManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> list[ModelType]:
+        return await self.repository.list(
+            filter_manager=filter_manager,
+            pagination_manager=pagination_manager,
+            projection_manager=projection_manager,
+            include=include,
+            **filters,
+        )  # type: ignore
+
+    def stream(
+        self,
+        filter_manager: Optional[AsyncFilterManagerProtocol] = None,
+        projection_manager: Optional[AsyncProjectionManagerProtocol] = None,
+        include: Optional[Sequence[str]] = None,
+        **filters: Any,
+    ) -> AsyncIterator[ModelType]:
+        return self.repository.stream(
+            filter_manager=filter_manager, projection_manager=projection_manager, include=include, **filters
+        )  # type: ignore
+
+    async def list_validators(
+        self, filter_manager: Optional[AsyncFilterManagerProtocol] = None, **filters: Any
+    ) -> tuple[Optional[datetime], int]:
+        return await self.repository.list_validators(filter_manager=filter_manager, **filters)  # type: ignore
+
+    async def create(self, *, entity: dict[str, Any]) -> ModelType:
+        instance = await self.repository.create(entity=entity)
+        await self.perform_commit()
+        return instance  # type: ignore
+
+    async def update(self, *, id: int, entity: dict[str, Any]) -> ModelType:
+        instance = await self.repository.update(id=id, entity=entity)
+        await self.perform_commit()
+        return instance  # type: ignore
+
+    async def destroy(self, *, id: int) -> None:
+        await self.repository.destroy(id=id)
+        await self.perform_commit()
+
+    async def bulk_create(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = await self.repository.bulk_create(entities=entities)
+        await self.perform_commit()
+        return rows  # type: ignore
+
+    async def bulk_update(self, *, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows = await self.repository.bulk_update(entities=entities)
+        await self.perform_commit()
+        return rows  # type: ignore
+
+    async def bulk_destroy(self, *, ids: list[int]) -> list[int]:
+        deleted = await self.repository.bulk_destroy(ids=ids)
+        await self.perform_commit()
+        return deleted  # type: ignore
+
+    async def perform_commit(self) -> None:
+        await self.repository.perform_commit()
+        invalidate_responses(*self.get_cache_tags())
+
+    def get_cache_tags(self) -> tuple[str, ...]:
+        """Response cache tags dropped once a write commits, the table of the model by default."""
+        return (self.repository.get_model().__tablename__,)